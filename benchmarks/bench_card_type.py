@@ -0,0 +1,54 @@
+"""
+Card brand detection: the IIN range table behind get_card_type() against the regex scan it replaced,
+which tried every brand's pattern in turn, on a mix of card numbers across brands & unknown prefixes.
+
+    PYTHONPATH=. python benchmarks/bench_card_type.py [--number N]
+"""
+import re
+import timeit
+import optparse
+
+from paython.lib.utils import get_card_type
+
+# the patterns get_card_type() used to scan, in the order they were tried
+REGEX_TYPES = {
+    'visa': re.compile(r'4\d{12}(\d{3})?$'),
+    'amex': re.compile(r'37\d{13}$'),
+    'mc': re.compile(r'5[1-5]\d{14}$'),
+    'discover': re.compile(r'6011\d{12}'),
+    'diners': re.compile(r'(30[0-5]\d{11}|(36|38)\d{12})$'),
+}
+
+NUMBERS = [
+    '4111111111111111', '4012888888881881', '4222222222222', '378282246310005', '371449635398431',
+    '5555555555554444', '5105105105105100', '2223000048400011', '6011111111111117', '6011000990139424',
+    '6445644564456445', '30569309025904', '38520000023237', '3530111333300000', '6200000000000005',
+    '6759649826438453', '9111111111111111', '1234567890123456',
+]
+
+
+def regex_card_type(cc):
+    for k, v in REGEX_TYPES.items():
+        if v.match(cc):
+            return k
+
+
+def main():
+    parser = optparse.OptionParser(usage='PYTHONPATH=. python benchmarks/bench_card_type.py [options]')
+    parser.add_option('-n', '--number', type='int', default=20000, help='passes over the numbers per run [default: %default]')
+    options, args = parser.parse_args()
+
+    for number in NUMBERS:
+        print '%-20s regex: %-10s IIN ranges: %s' % (number, regex_card_type(number), get_card_type(number))
+
+    for name, detect in (('regex scan', regex_card_type), ('IIN ranges', get_card_type)):
+        def run():
+            for number in NUMBERS:
+                detect(number)
+        best = min(timeit.repeat(run, number=options.number, repeat=3))
+        calls = options.number * len(NUMBERS)
+        print '%-12s %10.0f numbers/s (%.2f us each)' % (name + ':', calls / best, best / calls * 1e6)
+
+
+if __name__ == '__main__':
+    main()
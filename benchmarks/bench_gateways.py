@@ -0,0 +1,167 @@
+"""
+Client side cost of every gateway, no network needed: building a request (use_credit_card,
+set_billing_info, set_shipping_info & serializing it), parsing a canned response (parse &
+standardize) and a whole auth() answered by a LoopbackTransport.
+
+Besides the rate, `kept B` is the memory a parsed response keeps alive: sys.getsizeof() of the
+response & of everything it references that the gateway doesn't already, & `KB` the peak memory an
+operation allocates, reported when tracemalloc is available.
+
+With --cassette, requests are answered from traffic recorded with lib.cassette.RecordingTransport
+& parse() runs on the recorded responses instead of the canned ones.
+
+    PYTHONPATH=. python benchmarks/bench_gateways.py [--number N] [--gateway NAME] [--cassette PATH]
+"""
+import gc
+import sys
+import types
+import optparse
+import timeit
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+from paython.exceptions import RequestError, GatewayError
+from paython.lib.api import GetGateway, PostGateway, XMLGateway, LoopbackTransport, transaction
+from paython.lib.cassette import ReplayTransport
+from paython.lib.cc import CreditCard
+from paython.gateways import AuthorizeNet, PlugnPay, PaypalWPP, InnovativeGW, FirstDataLegacy
+from paython.gateways.usaepay import USAePay
+
+from bench_parse_delimited import RESPONSE as AUTHORIZE_NET
+from bench_parse_urlencoded import PLUGNPAY, PAYPAL, INNOVATIVE
+from bench_parse_xml import FIRSTDATA
+
+USAEPAY = ('UMversion=2.9&UMstatus=Approved&UMauthCode=021730&UMrefNum=1234567&UMavsResult=Address%3A+Match+%26+5+Digit'
+           '+Zip%3A+Match&UMavsResultCode=YYY&UMcvv2Result=Match&UMcvv2ResultCode=M&UMresult=A&UMvpasResultCode='
+           '&UMerror=Approved&UMerrorcode=00000&UMcustnum=&UMbatch=1&UMisDuplicate=N&UMconvertedAmountCurrency=840'
+           '&UMauthAmount=1.00')
+
+CREDIT_CARD = dict(number='4111111111111111', exp_mo='12', exp_yr='2030', first_name='John', last_name='Doe', cvv='123')
+
+BILLING = dict(address='1 Main St', address2='Apt 1', city='Boca Raton', state='FL', zipcode='33432', country='US',
+               phone='555-555-5555', email='john@example.com', ip='127.0.0.1')
+
+SHIPPING = dict(ship_first_name='John', ship_last_name='Doe', ship_address='1 Main St', ship_city='Boca Raton',
+                ship_state='FL', ship_zipcode='33432', ship_country='US')
+
+# gateway ==> (raw response the gateway sends back, raw response as parse() takes it)
+GATEWAYS = [
+    (AuthorizeNet, AUTHORIZE_NET, lambda api, raw: raw),
+    (PlugnPay, PLUGNPAY, lambda api, raw: raw),
+    (PaypalWPP, PAYPAL, lambda api, raw: raw),
+    (USAePay, USAEPAY, lambda api, raw: raw),
+    (InnovativeGW, INNOVATIVE, lambda api, raw: raw),
+    (FirstDataLegacy, FIRSTDATA, lambda api, raw: api.parse_xml('<?xml version="1.0"?><response>%s</response>' % raw)),
+]
+
+
+def serialize(api):
+    if isinstance(api, XMLGateway):
+        return api.doc.toxml('utf-8')
+    if isinstance(api, GetGateway):
+        return api.query_string()
+    if isinstance(api, PostGateway):
+        return api.params()
+    raise TypeError(api)
+
+
+@transaction
+def build(api):
+    api.use_credit_card(CreditCard(**CREDIT_CARD))
+    api.set_billing_info(**BILLING)
+    api.set_shipping_info(**SHIPPING)
+    return serialize(api)
+
+
+def rate(fn, number):
+    return number / min(timeit.repeat(fn, number=number, repeat=3))
+
+
+SHARED_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType, bool, types.NoneType)
+
+
+def kept_bytes(api, fn):
+    """
+    Bytes the object returned by fn() keeps alive, objects reachable from `api` (its tables, decoders...)
+    are shared by every response & not counted
+    """
+    seen = set()
+    pending = [api]
+    while pending:
+        obj = pending.pop()
+        if id(obj) not in seen and not isinstance(obj, SHARED_TYPES):
+            seen.add(id(obj))
+            pending.extend(gc.get_referents(obj))
+
+    kept = 0
+    result = fn()
+    pending = [result]
+    while pending:
+        obj = pending.pop()
+        if id(obj) not in seen and not isinstance(obj, SHARED_TYPES):
+            seen.add(id(obj))
+            kept += sys.getsizeof(obj)
+            pending.extend(gc.get_referents(obj))
+    return kept
+
+
+def peak_kb(fn):
+    if tracemalloc is None:
+        return None
+    fn()  # warm up caches
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024.0
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = optparse.OptionParser(usage='PYTHONPATH=. python benchmarks/bench_gateways.py [options]')
+    parser.add_option('-n', '--number', type='int', default=5000, help='operations per run [default: %default]')
+    parser.add_option('-g', '--gateway', action='append', help='gateway class to run, all of them by default')
+    parser.add_option('--cassette', help='replay responses recorded in this cassette')
+    options, args = parser.parse_args()
+    number = options.number
+
+    print '%-16s %12s %12s %10s %12s' % ('', 'build/s', 'parse/s', 'kept B', 'auth/s')
+    for gateway, raw, decode in GATEWAYS:
+        if options.gateway and gateway.__name__ not in options.gateway:
+            continue
+
+        api = gateway()
+        api.transport = LoopbackTransport(raw)
+        if options.cassette:
+            api.transport = ReplayTransport(options.cassette)
+            try:
+                api.auth('1.00', CreditCard(**CREDIT_CARD), BILLING, SHIPPING)
+            except (RequestError, GatewayError):
+                print '%-16s no recorded traffic' % gateway.__name__
+                continue
+            raw = api.transport.last_response[1]
+        response = decode(api, raw)
+
+        def build_request(api=api):
+            return build(api)
+
+        def parse(api=api, response=response):
+            return api.parse(response, 0.5)
+
+        def auth(api=api):
+            return api.auth('1.00', CreditCard(**CREDIT_CARD), BILLING, SHIPPING)
+
+        assert options.cassette or parse()['approved'], gateway.__name__
+        line = '%-16s %12.0f %12.0f %10d %12.0f' % (gateway.__name__, rate(build_request, number), rate(parse, number),
+                                                    kept_bytes(api, parse), rate(auth, number))
+        kb = [peak_kb(fn) for fn in (build_request, parse, auth)]
+        if kb[0] is not None:
+            line += '   peak KB build: %.1f parse: %.1f auth: %.1f' % tuple(kb)
+        print line
+
+
+if __name__ == '__main__':
+    main()
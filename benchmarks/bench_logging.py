@@ -0,0 +1,50 @@
+"""
+Cost of debug logging on the transaction path: full settle() calls over a LoopbackTransport with
+the paython loggers at INFO (production) and at DEBUG (records built & dropped by a NullHandler).
+
+    PYTHONPATH=. python benchmarks/bench_logging.py [--number N]
+"""
+import logging
+import optparse
+import functools
+import timeit
+
+from paython.lib.api import LoopbackTransport
+from paython.gateways import AuthorizeNet, FirstDataLegacy
+
+
+class NullHandler(logging.Handler):
+    def emit(self, record):
+        self.format(record)
+
+
+def gateways():
+    authorize_net = AuthorizeNet(username='test', password='testpassword')
+    authorize_net.transport = LoopbackTransport('1;1;1;This transaction has been approved.;IL2UW7;Y;2156729380')
+
+    firstdata = FirstDataLegacy(username='1329411')
+    firstdata.transport = LoopbackTransport('<r_approved>APPROVED</r_approved><r_ordernum>A-1</r_ordernum>')
+
+    return [('AuthorizeNet', authorize_net), ('FirstDataLegacy', firstdata)]
+
+
+def main():
+    parser = optparse.OptionParser(usage='PYTHONPATH=. python benchmarks/bench_logging.py [options]')
+    parser.add_option('-n', '--number', type='int', default=5000, help='settle() calls per run [default: %default]')
+    options, args = parser.parse_args()
+
+    logger = logging.getLogger('paython')
+    logger.addHandler(NullHandler())
+    logger.propagate = False
+
+    for name, api in gateways():
+        timings = []
+        for level in (logging.INFO, logging.DEBUG):
+            logger.setLevel(level)
+            settle = functools.partial(api.settle, '1.00', '2156729380')
+            timings.append(min(timeit.repeat(settle, number=options.number, repeat=3)) / options.number * 1e6)
+        print '%-16s INFO: %6.1f us/settle   DEBUG: %6.1f us/settle' % (name, timings[0], timings[1])
+
+
+if __name__ == '__main__':
+    main()
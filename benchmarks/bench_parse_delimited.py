@@ -0,0 +1,41 @@
+"""
+Parse throughput of delimited responses: AuthorizeNet.parse() on a canned AIM response, reading
+the common fields (approved, trans_id) or every field.
+
+    PYTHONPATH=. python benchmarks/bench_parse_delimited.py [--number N]
+"""
+import optparse
+import timeit
+
+from paython.gateways import AuthorizeNet
+
+# a full 69 column AIM response
+RESPONSE = ';'.join(['1', '1', '1', 'This transaction has been approved.', 'IL2UW7', 'Y', '2156729380', 'INV-1', 'Order 1',
+                     '0.05', 'CC', 'auth_only', 'cust-1', 'John', 'Doe', 'Company', '1 Main St', 'Boca Raton', 'FL', '33432',
+                     'US', '555-555-5555', '', 'john@example.com', 'John', 'Doe', 'Company', '1 Main St', 'Boca Raton', 'FL',
+                     '33432', 'US', '0.00', '0.00', '0.00', 'FALSE', 'PO-1', '8A5E2E5B8D5C9E5E1C3A2B4D6F8E0A1C', 'P', '2',
+                     '', '', '', '', '', '', '', '', '', '', 'XXXX1111', 'Visa', '', '', '', '', '', '', '', '', '', '', '',
+                     '', '', '', '', '', ''])
+
+
+def main():
+    parser = optparse.OptionParser(usage='PYTHONPATH=. python benchmarks/bench_parse_delimited.py [options]')
+    parser.add_option('-n', '--number', type='int', default=20000, help='responses parsed per run [default: %default]')
+    options, args = parser.parse_args()
+
+    api = AuthorizeNet(username='test', password='testpassword')
+
+    def common():
+        response = api.parse(RESPONSE, 0.5)
+        return response.approved, response.trans_id
+
+    def every_field():
+        return dict(api.parse(RESPONSE, 0.5))
+
+    for name, fn in (('approved & trans_id', common), ('every field', every_field)):
+        best = min(timeit.repeat(fn, number=options.number, repeat=3))
+        print 'AuthorizeNet.parse, %-20s %8.0f responses/s (%.1f us each)' % (name + ':', options.number / best, best / options.number * 1e6)
+
+
+if __name__ == '__main__':
+    main()
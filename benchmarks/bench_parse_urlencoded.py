@@ -0,0 +1,75 @@
+"""
+Compares lib.utils.parse_urlencoded with the decoding the urlencoded gateways used to do.
+
+    PYTHONPATH=. python benchmarks/bench_parse_urlencoded.py [--number N]
+"""
+import urllib
+import optparse
+import timeit
+import urlparse
+
+from paython.lib.utils import parse_urlencoded
+from paython.gateways import PlugnPay, PaypalWPP, InnovativeGW
+
+PLUGNPAY = ('FinalStatus=success&IPaddress=127%2e0%2e0%2e1&MStatus=success&auth%2dcode=TSTAUT&auth%2dmsg=%20%2000%3a'
+            'Approved%2e&auth_date=20120111&avs%2dcode=U&card%2damount=1%2e00&card%2dname=cardtest&card%2dtype=VISA'
+            '&currency=usd&cvvresp=M&mode=auth&orderID=2012011112000012345&publisher%2dname=pnpdemo&resp%2dcode=00'
+            '&sresp=A&success=yes&transflags=recurring&merchfraudlev=0&convert=underscores%7c')
+
+PAYPAL = ('TIMESTAMP=2012%2d01%2d11T12%3a00%3a00Z&CORRELATIONID=8b3bd1ba1a1f&ACK=Success&VERSION=65%2e1&BUILD=2230381'
+          '&AMT=1%2e00&CURRENCYCODE=USD&AVSCODE=X&CVV2MATCH=M&TRANSACTIONID=9XY12345AB123456C')
+
+INNOVATIVE = ('approval=123456&anatransid=987654&avs=Y&fulltotal=1.00&messageid=100&ordernumber=1000&trantype=sale'
+              '&result=APPROVED&address=1+Main+St&customer=John+Doe&email=john%40example.com&error=')
+
+
+def plugnpay_before(response):
+    decoded = {}
+    for field in response.split('&'):
+        t = field.split('=')
+        decoded[urllib.unquote(t[0])] = urllib.unquote(t[1]).strip('|').strip()
+    return decoded
+
+
+def paypal_before(response):
+    decoded = {}
+    for kv in response.split('&'):
+        key, value = kv.split('=')
+        decoded[key.lower()] = urllib.unquote(value)
+    return decoded
+
+
+def innovative_before(response):
+    return dict(urlparse.parse_qsl(response))
+
+
+CASES = [
+    ('plugnpay', PLUGNPAY, plugnpay_before,
+     lambda r: parse_urlencoded(r, plus=False, strip='| \t\r\n'),
+     lambda r: parse_urlencoded(r, keys=PlugnPay.PARSE_KEYS, plus=False, strip='| \t\r\n')),
+    ('paypal', PAYPAL, paypal_before,
+     lambda r: parse_urlencoded(r, lower=True, plus=False),
+     lambda r: parse_urlencoded(r, keys=PaypalWPP.RESPONSE_KEYS, lower=True, plus=False)),
+    ('innovative', INNOVATIVE, innovative_before,
+     lambda r: parse_urlencoded(r, blank=False),
+     lambda r: parse_urlencoded(r, keys=InnovativeGW.RESPONSE_KEYS, blank=False)),
+]
+
+
+def main():
+    parser = optparse.OptionParser(usage='PYTHONPATH=. python benchmarks/bench_parse_urlencoded.py [options]')
+    parser.add_option('-n', '--number', type='int', default=20000, help='responses decoded per run [default: %default]')
+    options, args = parser.parse_args()
+    number = options.number
+
+    def best(fn, response):
+        return min(timeit.repeat(lambda: fn(response), number=number, repeat=3)) / number * 1e6
+
+    for name, response, before, full, projected in CASES:
+        assert before(response) == full(response)
+        print '%-12s before: %6.1f us   parse_urlencoded: %6.1f us   with keys: %6.1f us' % (
+            name, best(before, response), best(full, response), best(projected, response))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+Compares lib.utils.parse_xml (expat, streaming) with the minidom based parse_dom, and with
+parse_fields reading only the fields FirstDataLegacy uses.
+
+    PYTHONPATH=. python benchmarks/bench_parse_xml.py [--number N]
+"""
+import optparse
+import timeit
+
+from paython.lib.utils import parse_xml, parse_dom, parse_fields
+from paython.gateways import FirstDataLegacy
+
+FIRSTDATA = ('<r_csp></r_csp><r_time>Wed Jan 11 12:00:00 2012</r_time><r_ref>0001234567</r_ref>'
+             '<r_error></r_error><r_ordernum>A-b1c2d3e4-f5a6-7b8c-9d0e-f1a2b3c4d5e6</r_ordernum>'
+             '<r_message>APPROVED</r_message><r_code>0001234567:NNNM:100000000000:</r_code>'
+             '<r_tdate>1326301200</r_tdate><r_score></r_score><r_authresponse></r_authresponse>'
+             '<r_approved>APPROVED</r_approved><r_avs>NNNM</r_avs>')
+
+SOAP_ITEM = ('<item id="{0}"><sku>SKU-{0}</sku><description><![CDATA[Item number {0} & co]]></description>'
+             '<price currency="USD">{0}.99</price><tags><tag>a</tag><tag>b</tag></tags></item>')
+
+RESPONSES = [
+    ('firstdata', '<?xml version="1.0"?><response>%s</response>' % FIRSTDATA),
+    ('soap (500 items)', '<?xml version="1.0"?><Envelope><Body><items>%s</items></Body></Envelope>' %
+        ''.join(SOAP_ITEM.format(i) for i in range(500))),
+]
+
+
+def main():
+    parser = optparse.OptionParser(usage='PYTHONPATH=. python benchmarks/bench_parse_xml.py [options]')
+    parser.add_option('-n', '--number', type='int', default=2000, help='parses of the small response [default: %default]')
+    options, args = parser.parse_args()
+
+    for name, response in RESPONSES:
+        assert parse_xml(response) == parse_dom(response)
+        number = max(1, options.number * len(RESPONSES[0][1]) // len(response))
+
+        dom = min(timeit.repeat(lambda: parse_dom(response), number=number, repeat=3)) / number
+        streaming = min(timeit.repeat(lambda: parse_xml(response), number=number, repeat=3)) / number
+        print '%-20s parse_dom: %9.1f us   parse_xml: %9.1f us   %.1fx' % (name, dom * 1e6, streaming * 1e6, dom / streaming)
+
+    fields = FirstDataLegacy().projected_fields()
+    number = options.number
+    full = min(timeit.repeat(lambda: parse_xml(RESPONSES[0][1]), number=number, repeat=3)) / number
+    projected = min(timeit.repeat(lambda: parse_fields(FIRSTDATA, fields), number=number, repeat=3)) / number
+    print '%-20s parse_xml: %9.1f us   parse_fields: %6.1f us   %.1fx' % ('firstdata fields', full * 1e6, projected * 1e6, full / projected)
+
+
+if __name__ == '__main__':
+    main()
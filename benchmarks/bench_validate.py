@@ -0,0 +1,84 @@
+"""
+Card validation throughput: CreditCard.validate() one card at a time against bulk validate_cards()
+in pure Python & vectorized with NumPy (when importable), on generated rows of mostly valid cards.
+
+    PYTHONPATH=. python benchmarks/bench_validate.py [--rows N]
+"""
+import time
+import random
+import optparse
+
+from datetime import datetime
+
+from paython.exceptions import DataValidationError
+from paython.lib import bulk
+from paython.lib.bulk import validate_cards
+from paython.lib.cc import CreditCard
+
+PREFIXES = ['4', '4', '4', '51', '55', '37', '6011', '30']
+LENGTHS = {'4': 16, '51': 16, '55': 16, '37': 15, '6011': 16, '30': 14}
+
+
+def luhn_complete(partial):
+    """the number `partial` plus the check digit that makes it pass the Luhn check"""
+    total = 0
+    for i, digit in enumerate(reversed(partial)):
+        digit = int(digit)
+        total += digit if i % 2 else bulk.LUHN_DOUBLED[digit]
+    return partial + str(-total % 10)
+
+
+def generate(rows, seed=1):
+    generator = random.Random(seed)
+    year = datetime.now().year
+    numbers, months, years, cvvs = [], [], [], []
+    for i in xrange(rows):
+        prefix = generator.choice(PREFIXES)
+        partial = prefix + ''.join(generator.choice('0123456789') for n in range(LENGTHS[prefix] - len(prefix) - 1))
+        number = luhn_complete(partial)
+        if generator.random() < 0.05:
+            number = partial + '0'  # a typo, mostly failing the Luhn check
+        numbers.append(number)
+        months.append('%02d' % generator.randint(1, 12))
+        years.append(str(year + generator.randint(-1, 5)))
+        cvvs.append('%04d' % generator.randint(0, 9999) if prefix == '37' else '%03d' % generator.randint(0, 999))
+    return numbers, months, years, cvvs
+
+
+def one_by_one(numbers, months, years, cvvs):
+    valid = 0
+    for number, month, year, cvv in zip(numbers, months, years, cvvs):
+        try:
+            CreditCard(number, month, year, full_name='John Doe', cvv=cvv, strict=True).validate()
+        except DataValidationError:
+            pass
+        else:
+            valid += 1
+    return valid
+
+
+def main():
+    parser = optparse.OptionParser(usage='PYTHONPATH=. python benchmarks/bench_validate.py [options]')
+    parser.add_option('-r', '--rows', type='int', default=200000, help='cards validated per run [default: %default]')
+    options, args = parser.parse_args()
+
+    columns = generate(options.rows)
+    runs = [('CreditCard.validate()', lambda: one_by_one(*columns)),
+            ('validate_cards(), pure Python', lambda: validate_cards(*columns, strict=True, vectorized=False))]
+    if bulk.numpy is not None:
+        runs.append(('validate_cards(), NumPy', lambda: validate_cards(*columns, strict=True, vectorized=True)))
+    else:
+        print 'NumPy is not importable, skipping the vectorized run'
+
+    for name, fn in runs:
+        best = None
+        for repeat in range(3):
+            start = time.time()
+            fn()
+            elapsed = time.time() - start
+            best = elapsed if best is None else min(best, elapsed)
+        print '%-32s %10.0f cards/s (%.2fs for %d)' % (name + ':', options.rows / best, best, options.rows)
+
+
+if __name__ == '__main__':
+    main()
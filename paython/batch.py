@@ -0,0 +1,235 @@
+"""
+Batch runner: streams a CSV or JSONL file of transactions through any paython gateway.
+
+    python -m paython.batch --gateway AuthorizeNet -o username=login -o password=key \\
+        --workers 8 --output results.jsonl --checkpoint run.ckpt settles.csv
+
+Every row names the gateway method in its `operation` column/key, the other keys are passed
+as keyword arguments. `credit_card` and `billing_info`/`shipping_info` can be given as nested
+JSON objects, or in CSV as `card_*`, `billing_*` and `shipping_*` columns (card_number,
+card_exp_mo, card_exp_yr, card_cvv, card_first_name, card_last_name, billing_zipcode, ...).
+
+Results are appended to the output as JSON lines as they complete. The checkpoint records
+each row when it is sent and again when its result is written, so a crashed run started
+again with the same checkpoint skips the finished rows. Rows that were sent but never
+finished are NOT sent again (the gateway may have processed them); they are written out with
+an "unknown" status for reconciliation, unless --retry-unknown is given.
+"""
+from __future__ import absolute_import, unicode_literals
+
+import os
+import csv
+import sys
+import json
+import logging
+import optparse
+import itertools
+
+from . import gateways
+from .lib.cc import CreditCard
+from .lib.transport import RedirectTransport
+
+logger = logging.getLogger(__name__)
+
+NESTED_PREFIXES = {
+    'card_': 'credit_card',
+    'billing_': 'billing_info',
+    'shipping_': 'shipping_info',
+}
+
+
+def read_csv(stream):
+    """
+    Yields rows of a CSV file with a header line as dicts, folding prefixed columns into nested dicts
+    """
+    for row in csv.DictReader(stream):
+        record = {}
+        for key, value in row.items():
+            if not value:
+                continue
+            for prefix, nested in NESTED_PREFIXES.items():
+                if key.startswith(prefix):
+                    record.setdefault(nested, {})[key[len(prefix):]] = value
+                    break
+            else:
+                record[key] = value
+        yield record
+
+
+def read_jsonl(stream):
+    """
+    Yields one dict per non blank line of a JSON lines file
+    """
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+
+def build_operation(record):
+    """
+    Turns an input record into a (method name, kwargs) operation for Gateway.batch()
+    """
+    kwargs = dict((str(key), value) for key, value in record.items())
+    method_name = kwargs.pop('operation')
+    kwargs.pop('id', None)
+
+    card = kwargs.get('credit_card')
+    if isinstance(card, dict):
+        kwargs['credit_card'] = CreditCard(**dict((str(key), value) for key, value in card.items()))
+
+    return method_name, kwargs
+
+
+class Checkpoint(object):
+    """
+    Append-only log of "S <row>" (sent) and "D <row>" (done) records, synced to disk on every write
+    """
+    def __init__(self, path):
+        self.path = path
+        self.started = set()
+        self.done = set()
+
+        if os.path.exists(path):
+            with open(path) as log:
+                for line in log:
+                    try:
+                        state, row = line.split()
+                        row = int(row)
+                    except ValueError:
+                        continue  # torn last line of a crashed run
+                    (self.started if state == 'S' else self.done).add(row)
+
+        self.log = open(path, 'a')
+
+    @property
+    def unfinished(self):
+        return self.started - self.done
+
+    def mark(self, state, row):
+        (self.started if state == 'S' else self.done).add(row)
+        self.log.write('%s %s\n' % (state, row))
+        self.log.flush()
+        os.fsync(self.log.fileno())
+
+    def close(self):
+        self.log.close()
+
+
+def run(gateway, records, output, checkpoint, workers=4, retry_unknown=False):
+    """
+    Sends every record not finished yet according to the checkpoint, returns the number of rows by status
+    """
+    rows = {}  # batch index ==> (row number, record id)
+    sent = itertools.count()  # the batch index of the next operation, as Gateway.batch() numbers them
+    counts = {'approved': 0, 'declined': 0, 'failed': 0, 'unknown': 0}
+
+    def write(record):
+        output.write(json.dumps(record) + '\n')
+        output.flush()
+
+    def pending():
+        for row, record in enumerate(records):
+            if row in checkpoint.done:
+                continue
+
+            if row in checkpoint.unfinished and not retry_unknown:
+                write({'row': row, 'id': record.get('id'), 'operation': record.get('operation'), 'status': 'unknown',
+                       'error': 'Sent by an interrupted run, outcome unknown'})
+                checkpoint.mark('D', row)
+                counts['unknown'] += 1
+                continue
+
+            try:
+                operation = build_operation(record)
+            except Exception, e:
+                write({'row': row, 'id': record.get('id'), 'operation': record.get('operation'), 'status': 'failed',
+                       'error': 'Invalid record: %s' % e})
+                checkpoint.mark('D', row)
+                counts['failed'] += 1
+                continue
+
+            rows[next(sent)] = (row, record.get('id'))
+            checkpoint.mark('S', row)
+            yield operation
+
+    for result in gateway.batch(pending(), workers=workers):
+        row, record_id = rows.pop(result.index)
+        entry = {'row': row, 'id': record_id, 'operation': result.operation[0]}
+
+        error = result.error
+        if result.ok:
+            try:  # fields are decoded here, a response the gateway can't make sense of fails its row
+                entry['response'] = dict(result.response)
+                entry['status'] = 'approved' if result.response['approved'] else 'declined'
+            except Exception, e:
+                entry.pop('response', None)
+                error = e
+        if error is not None:
+            entry['status'] = 'failed'
+            entry['error'] = '%s: %s' % (error.__class__.__name__, error)
+
+        counts[entry['status']] += 1
+        write(entry)
+        checkpoint.mark('D', row)
+
+    return counts
+
+
+def parse_option(value):
+    """
+    Gateway options are strings, except for true/false
+    """
+    return {'true': True, 'false': False}.get(value.lower(), value)
+
+
+def main(argv=None):
+    parser = optparse.OptionParser(usage='python -m paython.batch --gateway NAME [options] INPUT')
+    parser.add_option('-g', '--gateway', help='gateway class in paython.gateways, e.g. AuthorizeNet')
+    parser.add_option('-o', '--option', action='append', default=[], metavar='KEY=VALUE',
+                      help='gateway constructor argument, can be repeated')
+    parser.add_option('--endpoint', metavar='URL', help="send to URL instead of the gateway's servers, e.g. a paython.simulators server")
+    parser.add_option('-w', '--workers', type='int', default=4, help='parallel workers [default: %default]')
+    parser.add_option('-f', '--format', type='choice', choices=['csv', 'jsonl'], help='input format, guessed from the file extension')
+    parser.add_option('--output', help='results file (JSON lines), appended to [default: INPUT.results.jsonl]')
+    parser.add_option('--checkpoint', help='checkpoint file [default: INPUT.checkpoint]')
+    parser.add_option('--retry-unknown', action='store_true', default=False,
+                      help='send again the rows an interrupted run sent without recording a result')
+    options, args = parser.parse_args(argv)
+
+    if len(args) != 1 or not options.gateway:
+        parser.error('a gateway and one input file are required')
+
+    gateway_class = getattr(gateways, options.gateway, None)
+    if gateway_class is None:
+        parser.error("unknown gateway '%s'" % options.gateway)
+
+    gateway_options = {}
+    for option in options.option:
+        key, sep, value = option.partition('=')
+        if not sep:
+            parser.error("gateway options must look like KEY=VALUE, got '%s'" % option)
+        gateway_options[str(key)] = parse_option(value)
+
+    path = args[0]
+    input_format = options.format or ('csv' if path.lower().endswith('.csv') else 'jsonl')
+    reader = read_csv if input_format == 'csv' else read_jsonl
+
+    gateway = gateway_class(**gateway_options)
+    if options.endpoint:
+        gateway.transport = RedirectTransport(options.endpoint)
+    checkpoint = Checkpoint(options.checkpoint or '%s.checkpoint' % path)
+
+    with open(path, 'rb' if input_format == 'csv' else 'r') as stream:
+        with open(options.output or '%s.results.jsonl' % path, 'a') as output:
+            try:
+                counts = run(gateway, reader(stream), output, checkpoint,
+                             workers=options.workers, retry_unknown=options.retry_unknown)
+            finally:
+                checkpoint.close()
+
+    sys.stderr.write('approved: {approved}, declined: {declined}, failed: {failed}, unknown: {unknown}\n'.format(**counts))
+    return 1 if counts['failed'] or counts['unknown'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
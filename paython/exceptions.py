@@ -21,3 +21,13 @@ class RequestError(Exception):
 class MissingTranslationError(Exception):
     """ Errors with trying to find a translation"""
     pass
+
+
+class TimeoutError(Exception):
+    """ Errors when waiting on a gateway call takes too long """
+    pass
+
+
+class CancelledError(Exception):
+    """ Errors when waiting on a gateway call that was cancelled before it ran """
+    pass
@@ -3,8 +3,8 @@ from __future__ import absolute_import, unicode_literals
 import time
 import logging
 
-from ..exceptions import MissingDataError
-from ..lib.api import GetGateway
+from ..exceptions import MissingDataError, GatewayError
+from ..lib.api import GetGateway, ColumnDecoder
 
 logger = logging.getLogger(__name__)
 
@@ -66,6 +66,8 @@ class AuthorizeNet(GetGateway):
     }
 
     # Response Code: 1 = Approved, 2 = Declined, 3 = Error, 4 = Held for Review
+    RESPONSE_CODES = frozenset(['1', '2', '3', '4'])
+
     # AVS Responses: A = Address (Street) matches, ZIP does not,  P = AVS not applicable for this transaction,
     # AVS Responses (cont'd): W = Nine digit ZIP matches, Address (Street) does not, X = Address (Street) and nine digit ZIP match,
     # AVS Responses (cont'd): Y = Address (Street) and five digit ZIP match, Z = Five digit ZIP matches, Address (Street) does not
@@ -155,12 +157,16 @@ class AuthorizeNet(GetGateway):
             else:
                 test_string = 'live'
                 self.set('x_test_request', 'TRUE')
-            debug_string = " %s.%s.__init__() -- You're in %s test mode (& debug, obviously) " % (__name__, 'AuthorizeNet', test_string)
-            logger.debug(debug_string.center(80, '='))
+            if logger.isEnabledFor(logging.DEBUG):
+                debug_string = " %s.%s.__init__() -- You're in %s test mode (& debug, obviously) " % (__name__, 'AuthorizeNet', test_string)
+                logger.debug(debug_string.center(80, '='))
 
         if delim:
             self.DELIMITER = delim
 
+        # responses split out the columns read only
+        self.response_decoder = ColumnDecoder(self.RESPONSE_POSITIONS, self.DELIMITER)
+
     def charge_setup(self):
         """
         standard setup, used for charges
@@ -168,8 +174,9 @@ class AuthorizeNet(GetGateway):
         self.set('x_delim_data', 'TRUE')
         self.set('x_delim_char', self.DELIMITER)
         self.set('x_version', self.VERSION)
-        debug_string = " %s.%s.charge_setup() Just set up for a charge " % (__name__, 'AuthorizeNet')
-        logger.debug(debug_string.center(80, '='))
+        if logger.isEnabledFor(logging.DEBUG):
+            debug_string = " %s.%s.charge_setup() Just set up for a charge " % (__name__, 'AuthorizeNet')
+            logger.debug(debug_string.center(80, '='))
 
     def auth(self, amount, credit_card=None, billing_info=None, shipping_info=None, is_partial=False, split_id=None, invoice_num=None):
         """
@@ -191,8 +198,9 @@ class AuthorizeNet(GetGateway):
 
         # validating or building up request
         if not credit_card:
-            debug_string = "%s.%s.auth()  -- No CreditCard object present. You passed in %s" % (__name__, 'AuthorizeNet', credit_card)
-            logger.debug(debug_string)
+            if logger.isEnabledFor(logging.DEBUG):
+                debug_string = "%s.%s.auth()  -- No CreditCard object present. You passed in %s" % (__name__, 'AuthorizeNet', credit_card)
+                logger.debug(debug_string)
 
             raise MissingDataError("You did not pass a CreditCard object into the auth method")
         else:
@@ -241,8 +249,9 @@ class AuthorizeNet(GetGateway):
 
         # validating or building up request
         if not credit_card:
-            debug_string = "%s.%s.capture()  -- No CreditCard object present. You passed in %s" % (__name__, 'AuthorizeNet', credit_card)
-            logger.debug(debug_string)
+            if logger.isEnabledFor(logging.DEBUG):
+                debug_string = "%s.%s.capture()  -- No CreditCard object present. You passed in %s" % (__name__, 'AuthorizeNet', credit_card)
+                logger.debug(debug_string)
 
             raise MissingDataError("You did not pass a CreditCard object into the auth method")
         else:
@@ -310,20 +319,22 @@ class AuthorizeNet(GetGateway):
         else:
             url = self.API_URI['test']  # here just in case we want to granularly change endpoint
 
-        debug_string = " %s.%s.request() -- Attempting request to: " % (__name__, 'AuthorizeNet')
-        logger.debug(debug_string.center(80, '='))
-        debug_string = "%s with params: %s" % (url, self.query_string())
-        logger.debug(debug_string)
-        logger.debug('as dict: %s' % self.REQUEST_DICT)
+        if logger.isEnabledFor(logging.DEBUG):
+            debug_string = " %s.%s.request() -- Attempting request to: " % (__name__, 'AuthorizeNet')
+            logger.debug(debug_string.center(80, '='))
+            debug_string = "%s with params: %s" % (url, self.query_string())
+            logger.debug(debug_string)
+            logger.debug('as dict: %s' % self.REQUEST_DICT)
 
         # make the request
         start = time.time()  # timing it
         response = self.make_request(url)
         end = time.time()  # done timing it
-        response_time = '%0.2f' % (end - start)
+        response_time = end - start
 
-        debug_string = " %s.%s.request()  -- Request completed in %ss " % (__name__, 'AuthorizeNet', response_time)
-        logger.debug(debug_string.center(80, '='))
+        if logger.isEnabledFor(logging.DEBUG):
+            debug_string = " %s.%s.request()  -- Request completed in %0.2fs " % (__name__, 'AuthorizeNet', response_time)
+            logger.debug(debug_string.center(80, '='))
 
         return response, response_time
 
@@ -331,16 +342,15 @@ class AuthorizeNet(GetGateway):
         """
         On Specific Gateway due differences in response from gateway
         """
-        debug_string = " %s.%s.parse() -- Raw response: " % (__name__, 'AuthorizeNet')
-        logger.debug(debug_string.center(80, '='))
-        logger.debug("\n %s" % response)
-
-        #splitting up response into a list so we can map it to Paython generic response
-        response = response.split(self.DELIMITER)
-        approved = True if response[0] == '1' else False
+        if logger.isEnabledFor(logging.DEBUG):
+            debug_string = " %s.%s.parse() -- Raw response: " % (__name__, 'AuthorizeNet')
+            logger.debug(debug_string.center(80, '='))
+            logger.debug("\n %s" % response)
 
-        debug_string = " %s.%s.parse() -- Response as list: " % (__name__, 'AuthorizeNet')
-        logger.debug(debug_string.center(80, '='))
-        logger.debug('\n%s' % response)
+        # the response code is the first column, the others are split out when read
+        code = response.partition(self.DELIMITER)[0]
+        if code not in self.RESPONSE_CODES:
+            raise GatewayError("Unrecognized response from gateway: %r" % response[:80])
+        approved = True if code == '1' else False
 
-        return self.standardize(response, self.RESPONSE_KEYS, response_time, approved)
+        return self.standardize_lazy(response, self.response_decoder, response_time, approved)
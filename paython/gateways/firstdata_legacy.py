@@ -86,12 +86,14 @@ class FirstDataLegacy(XMLGateway):
 
     debug = False
     test = False
-    cvv_present = False
 
-    def __init__(self, username='Test123', key_file='../keys/yourkey.pem', cert_file='../keys/yourkey.pem', debug=False, test=False):
+    def __init__(self, username='Test123', key_file='../keys/yourkey.pem', cert_file='../keys/yourkey.pem', debug=False, test=False, project_response=False):
         """
         Setting up object so we can run 4 different ways (live, debug, test & debug+test) - no password because gateway does not use it
+        project_response: only read the response elements in RESPONSE_KEYS (& r_approved) instead of parsing it all
         """
+        self.project_response = project_response
+
         # passing fields to bubble up to Base Class
         ssl_config = {'port': '1129', 'key_file': key_file, 'cert_file': cert_file}
         # there is only a live environment, with test credentials & we only need the host for now
@@ -104,14 +106,15 @@ class FirstDataLegacy(XMLGateway):
 
         if test:
             self.test = True
-            debug_string = " %s.%s.__init__() -- You're in test mode (& debug, obviously) " % (__name__, 'FirstDataLegacy')
-            logger.debug(debug_string.center(80, '='))
+            if logger.isEnabledFor(logging.DEBUG):
+                debug_string = " %s.%s.__init__() -- You're in test mode (& debug, obviously) " % (__name__, 'FirstDataLegacy')
+                logger.debug(debug_string.center(80, '='))
 
-    def charge_setup(self):
+    def charge_setup(self, cvv_present=False):
         """
         standard setup, used for charges
         """
-        if self.cvv_present:
+        if cvv_present:
             self.set('order/creditcard/cvmindicator', 'provided')
 
         if self.test:  # will almost always return nice
@@ -119,17 +122,16 @@ class FirstDataLegacy(XMLGateway):
         else:
             self.set('order/orderoptions/result', 'Live')
 
-        debug_string = " %s.%s.charge_setup() Just set up for a charge " % (__name__, 'FirstDataLegacy')
-        logger.debug(debug_string.center(80, '='))
+        if logger.isEnabledFor(logging.DEBUG):
+            debug_string = " %s.%s.charge_setup() Just set up for a charge " % (__name__, 'FirstDataLegacy')
+            logger.debug(debug_string.center(80, '='))
 
     def auth(self, amount, credit_card=None, billing_info=None, shipping_info=None):
         """
         Sends charge for authorization based on amount
         """
-        #check for cvv
-        self.cvv_present = True if credit_card.verification_value else False
-        #set up transaction
-        self.charge_setup()  # considering turning this into a decorator?
+        #set up transaction, checking for cvv
+        self.charge_setup(cvv_present=bool(credit_card.verification_value))
 
         #setting transaction data
         self.set(self.REQUEST_FIELDS['amount'], amount)
@@ -147,8 +149,9 @@ class FirstDataLegacy(XMLGateway):
 
         # validating or building up request
         if not credit_card:
-            debug_string = "%s.%s.auth()  -- No CreditCard object present. You passed in %s" % (__name__, 'FirstDataLegacy', credit_card)
-            logger.debug(debug_string)
+            if logger.isEnabledFor(logging.DEBUG):
+                debug_string = "%s.%s.auth()  -- No CreditCard object present. You passed in %s" % (__name__, 'FirstDataLegacy', credit_card)
+                logger.debug(debug_string)
 
             raise MissingDataError("You did not pass a CreditCard object into the auth method")
         else:
@@ -201,7 +204,8 @@ class FirstDataLegacy(XMLGateway):
 
         # validating or building up request
         if not credit_card:
-            logger.debug("%s.%s.capture()  -- No CreditCard object present. You passed in %s" % (__name__, 'FirstDataLegacy', credit_card, credit_card))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("%s.%s.capture()  -- No CreditCard object present. You passed in %s" % (__name__, 'FirstDataLegacy', credit_card))
 
             raise MissingDataError("You did not pass a CreditCard object into the auth method")
         else:
@@ -260,36 +264,46 @@ class FirstDataLegacy(XMLGateway):
         #getting the uri to POST xml to
         uri = urlparse.urlparse(self.API_URI['live']).path
 
-        debug_string = " %s.%s.request() -- Attempting request to: " % (__name__, 'FirstDataLegacy')
-        logger.debug(debug_string.center(80, '='))
-        logger.debug("\n %s with params: %s" %
-                     (self.API_URI['live'],
-                      self.request_xml()))
+        if logger.isEnabledFor(logging.DEBUG):
+            debug_string = " %s.%s.request() -- Attempting request to: " % (__name__, 'FirstDataLegacy')
+            logger.debug(debug_string.center(80, '='))
+            logger.debug("\n %s with params: %s" %
+                         (self.API_URI['live'],
+                          self.request_xml()))
 
         # make the request
         start = time.time()  # timing it
         response = self.make_request(uri)
         end = time.time()  # done timing it
-        response_time = '%0.2f' % (end - start)
+        response_time = end - start
 
-        debug_string = " %s.%s.request()  -- Request completed in %ss " % (__name__, 'FirstDataLegacy', response_time)
-        logger.debug(debug_string.center(80, '='))
+        if logger.isEnabledFor(logging.DEBUG):
+            debug_string = " %s.%s.request()  -- Request completed in %0.2fs " % (__name__, 'FirstDataLegacy', response_time)
+            logger.debug(debug_string.center(80, '='))
 
         return response, response_time
 
+    def projected_fields(self):
+        """
+        Response elements read when project_response is on, r_approved is needed by parse()
+        """
+        return self.RESPONSE_KEYS.keys() + ['r_approved']
+
     def parse(self, response, response_time):
         """
         On Specific Gateway due differences in response from gateway
         """
-        debug_string = " %s.%s.parse() -- Raw response: " % (__name__, 'FirstDataLegacy')
-        logger.debug(debug_string.center(80, '='))
-        logger.debug("\n %s" % response)
+        if logger.isEnabledFor(logging.DEBUG):
+            debug_string = " %s.%s.parse() -- Raw response: " % (__name__, 'FirstDataLegacy')
+            logger.debug(debug_string.center(80, '='))
+            logger.debug("\n %s" % response)
 
         response = response['response']
         approved = True if response['r_approved'] == 'APPROVED' else False
 
-        debug_string = " %s.%s.parse() -- Response as dict: " % (__name__, 'FirstDataLegacy')
-        logger.debug(debug_string.center(80, '='))
-        logger.debug('\n%s' % response)
+        if logger.isEnabledFor(logging.DEBUG):
+            debug_string = " %s.%s.parse() -- Response as dict: " % (__name__, 'FirstDataLegacy')
+            logger.debug(debug_string.center(80, '='))
+            logger.debug('\n%s' % response)
 
         return self.standardize(response, self.RESPONSE_KEYS, response_time, approved)
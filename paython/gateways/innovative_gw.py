@@ -1,11 +1,11 @@
 from __future__ import absolute_import, unicode_literals
 
 import time
-import urlparse
 import logging
 
-from ..exceptions import MissingDataError
+from ..exceptions import MissingDataError, GatewayError
 from ..lib.api import PostGateway
+from ..lib.utils import parse_urlencoded
 
 logger = logging.getLogger(__name__)
 
@@ -100,8 +100,9 @@ class InnovativeGW(PostGateway):
 
         if test:
             self.test = True
-            debug_string = " %s.%s.__init__() -- You're in test mode (& debug, obviously) " % (__name__, 'InnovativeGW')
-            logger.debug(debug_string.center(80, '='))
+            if logger.isEnabledFor(logging.DEBUG):
+                debug_string = " %s.%s.__init__() -- You're in test mode (& debug, obviously) " % (__name__, 'InnovativeGW')
+                logger.debug(debug_string.center(80, '='))
 
     def charge_setup(self):
         """
@@ -112,8 +113,9 @@ class InnovativeGW(PostGateway):
         self.set('response_fmt', 'url_encoded')
         self.set('upg_auth', 'zxcvlkjh')
 
-        debug_string = " %s.%s.charge_setup() Just set up for a charge " % (__name__, 'InnovativeGW')
-        logger.debug(debug_string.center(80, '='))
+        if logger.isEnabledFor(logging.DEBUG):
+            debug_string = " %s.%s.charge_setup() Just set up for a charge " % (__name__, 'InnovativeGW')
+            logger.debug(debug_string.center(80, '='))
 
     def auth(self, amount, credit_card=None, billing_info=None, shipping_info=None):
         """
@@ -128,7 +130,8 @@ class InnovativeGW(PostGateway):
 
         # validating or building up request
         if not credit_card:
-            logger.debug("%s.%s.auth()  -- No CreditCard object present. You passed in %s " % (__name__, 'InnovativeGW', credit_card))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("%s.%s.auth()  -- No CreditCard object present. You passed in %s " % (__name__, 'InnovativeGW', credit_card))
 
             raise MissingDataError("You did not pass a CreditCard object into the auth method")
         else:
@@ -175,7 +178,8 @@ class InnovativeGW(PostGateway):
 
         # validating or building up request
         if not credit_card:
-            logger.debug("%s.%s.capture()  -- No CreditCard object present. You passed in %s " % (__name__, 'InnovativeGW', credit_card))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("%s.%s.capture()  -- No CreditCard object present. You passed in %s " % (__name__, 'InnovativeGW', credit_card))
 
             raise MissingDataError("You did not pass a CreditCard object into the auth method")
         else:
@@ -235,19 +239,21 @@ class InnovativeGW(PostGateway):
         # there is only a live environment, with test credentials
         url = self.API_URI['live']
 
-        debug_string = " %s.%s.request() -- Attempting request to: " % (__name__, 'InnovativeGW')
-        logger.debug(debug_string.center(80, '='))
-        logger.debug("\n %s with params: %s" %
-                     (url, self.params()))
+        if logger.isEnabledFor(logging.DEBUG):
+            debug_string = " %s.%s.request() -- Attempting request to: " % (__name__, 'InnovativeGW')
+            logger.debug(debug_string.center(80, '='))
+            logger.debug("\n %s with params: %s" %
+                         (url, self.params()))
 
         # make the request
         start = time.time()  # timing it
         response = self.make_request(url)
         end = time.time()  # done timing it
-        response_time = '%0.2f' % (end - start)
+        response_time = end - start
 
-        debug_string = " %s.%s.request()  -- Request completed in %ss " % (__name__, 'InnovativeGW', response_time)
-        logger.debug(debug_string.center(80, '='))
+        if logger.isEnabledFor(logging.DEBUG):
+            debug_string = " %s.%s.request()  -- Request completed in %0.2fs " % (__name__, 'InnovativeGW', response_time)
+            logger.debug(debug_string.center(80, '='))
 
         return response, response_time
 
@@ -255,20 +261,24 @@ class InnovativeGW(PostGateway):
         """
         On Specific Gateway due differences in response from gateway
         """
-        debug_string = " %s.%s.parse() -- Raw response: " % (__name__, 'InnovativeGW')
-        logger.debug(debug_string.center(80, '='))
-        logger.debug("\n %s" % response)
+        if logger.isEnabledFor(logging.DEBUG):
+            debug_string = " %s.%s.parse() -- Raw response: " % (__name__, 'InnovativeGW')
+            logger.debug(debug_string.center(80, '='))
+            logger.debug("\n %s" % response)
 
-        new_response = urlparse.parse_qsl(response)
-        response = dict(new_response)
+        raw_response = response
+        response = parse_urlencoded(response, keys=self.RESPONSE_KEYS, blank=False)
+        if 'approval' not in response and 'error' not in response:
+            raise GatewayError("Unrecognized response from gateway: %r" % raw_response[:80])
         if 'approval' in response:
             approved = True
         else:
             approved = False
             response['approval'] = 'decline'  # there because we have a translation key called "approval" - open to ideas here...
 
-        debug_string = " %s.%s.parse() -- Response as dict: " % (__name__, 'InnovativeGW')
-        logger.debug(debug_string.center(80, '='))
-        logger.debug('\n%s' % response)
+        if logger.isEnabledFor(logging.DEBUG):
+            debug_string = " %s.%s.parse() -- Response as dict: " % (__name__, 'InnovativeGW')
+            logger.debug(debug_string.center(80, '='))
+            logger.debug('\n%s' % response)
 
         return self.standardize(response, self.RESPONSE_KEYS, response_time, approved)
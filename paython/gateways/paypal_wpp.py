@@ -5,6 +5,7 @@ import logging
 
 from ..exceptions import MissingDataError
 from ..lib.api import GetGateway
+from ..lib.utils import parse_urlencoded
 
 logger = logging.getLogger(__name__)
 
@@ -84,6 +85,8 @@ class PaypalWPP(GetGateway):
         'amex': "Amex",
         'mc': "MasterCard",
         'discover': "Discover",
+        'jcb': "JCB",
+        'maestro': "Maestro",
     }
 
     debug = False
@@ -103,7 +106,7 @@ class PaypalWPP(GetGateway):
 
         if test:
             self.test = True
-            if self.debug:
+            if self.debug and logger.isEnabledFor(logging.DEBUG):
                 debug_string = " %s.%s.__init__() -- You're in test mode (& debug, obviously) " % (__name__, 'PaypalWPP')
                 logger.debug(debug_string.center(80, '='))
 
@@ -117,7 +120,7 @@ class PaypalWPP(GetGateway):
         #self.set('x_delim_data', 'TRUE')
         #self.set('x_delim_char', self.DELIMITER)
         #self.set('x_version', self.VERSION)
-        if self.debug:
+        if self.debug and logger.isEnabledFor(logging.DEBUG):
             debug_string = " %s.%s.charge_setup() Just set up for a charge " % (__name__, 'PaypalWPP')
             logger.debug(debug_string.center(80, '='))
 
@@ -154,7 +157,7 @@ class PaypalWPP(GetGateway):
 
         # validating or building up request
         if not credit_card:
-            if self.debug:
+            if self.debug and logger.isEnabledFor(logging.DEBUG):
                 debug_string = "%s.%s.auth()  -- No CreditCard object present. You passed in %s" % (__name__, 'PaypalWPP', credit_card)
                 logger.debug(debug_string)
             raise MissingDataError("You did not pass a CreditCard object into the auth method")
@@ -206,7 +209,7 @@ class PaypalWPP(GetGateway):
 
         # validating or building up request
         if not credit_card:
-            if self.debug:
+            if self.debug and logger.isEnabledFor(logging.DEBUG):
                 debug_string = "%s.%s.capture()  -- No CreditCard object present. You passed in %s" % (__name__, 'PaypalWPP', credit_card)
                 logger.debug(debug_string)
             raise MissingDataError("You did not pass a CreditCard object into the capture method")
@@ -275,7 +278,7 @@ class PaypalWPP(GetGateway):
         else:
             url = self.API_URI['live']
 
-        if self.debug:  # I wish I could hide debugging
+        if self.debug and logger.isEnabledFor(logging.DEBUG):  # I wish I could hide debugging
             debug_string = " %s.%s.request() -- Attempting request to: " % (__name__, 'PaypalWPP')
             logger.debug(debug_string.center(80, '='))
             debug_string = "\n %s with params: %s" % (url, self.query_string())
@@ -285,10 +288,10 @@ class PaypalWPP(GetGateway):
         start = time.time()  # timing it
         response = self.make_request(url)
         end = time.time()  # done timing it
-        response_time = '%0.2f' % (end - start)
+        response_time = end - start
 
-        if self.debug:  # debugging makes code look so nasty
-            debug_string = " %s.%s.request()  -- Request completed in %ss " % (__name__, 'PaypalWPP', response_time)
+        if self.debug and logger.isEnabledFor(logging.DEBUG):  # debugging makes code look so nasty
+            debug_string = " %s.%s.request()  -- Request completed in %0.2fs " % (__name__, 'PaypalWPP', response_time)
             logger.debug(debug_string.center(80, '='))
 
         return response, response_time
@@ -297,25 +300,21 @@ class PaypalWPP(GetGateway):
         """
         On Specific Gateway due differences in response from gateway
         """
-        import urllib
-        if self.debug:  # debugging is so gross
+        if self.debug and logger.isEnabledFor(logging.DEBUG):  # debugging is so gross
             debug_string = " %s.%s.parse() -- Raw response: " % (__name__, 'PaypalWPP')
             logger.debug(debug_string.center(80, '='))
             debug_string = "\n %s" % response
             logger.debug(debug_string)
 
         #splitting up response into a list so we can map it to Paython generic response
-        response_tokens = {}
-        for kv in response.split(self.DELIMITER):
-            key, value = kv.split("=")
-            response_tokens[key.lower()] = urllib.unquote(value)
+        response_tokens = parse_urlencoded(response, keys=self.RESPONSE_KEYS, delimiter=self.DELIMITER, lower=True, plus=False)
         #assert False, response_tokens
         approved = response_tokens['ack'] == 'Success'
 
-        if self.debug:  # :& gonna puke
-            debug_string = " %s.%s.parse() -- Response as list: " % (__name__, 'PaypalWPP')
+        if self.debug and logger.isEnabledFor(logging.DEBUG):  # :& gonna puke
+            debug_string = " %s.%s.parse() -- Response as dict: " % (__name__, 'PaypalWPP')
             logger.debug(debug_string.center(80, '='))
-            debug_string = '\n%s' % response
+            debug_string = '\n%s' % response_tokens
             logger.debug(debug_string)
 
-        return self.standardize(response, self.RESPONSE_KEYS, response_time, approved)
+        return self.standardize(response_tokens, self.RESPONSE_KEYS, response_time, approved)
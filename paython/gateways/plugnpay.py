@@ -1,11 +1,10 @@
 from __future__ import absolute_import, unicode_literals
 
 import time
-import urllib
 import logging
 
 from ..exceptions import MissingDataError
-from ..lib.api import PostGateway
+from ..lib.api import PostGateway, URLEncodedDecoder
 
 logger = logging.getLogger(__name__)
 
@@ -302,6 +301,9 @@ class PlugnPay(PostGateway):
         'alt_trans_id': 'ref_number'  # refnumber
     }
 
+    # response fields the decoder reads, the others are skipped
+    PARSE_KEYS = frozenset(RESPONSE_KEYS) | frozenset(['success', 'card-type'])
+
     debug = False
 
     def __init__(self, username='pnpdemo', password='', email='', dontsndmail=True, debug=True):
@@ -321,8 +323,16 @@ class PlugnPay(PostGateway):
         # passing fields to bubble up to Base Class
         super(PlugnPay, self).__init__(translations=self.REQUEST_FIELDS, debug=debug)
 
-        debug_string = " %s.%s.__init__() -- You're in debug mode " % (__name__, 'PlugnPay')
-        logger.debug(debug_string.center(80, '='))
+        # human-readable messages are worked out when read
+        self.response_decoder = URLEncodedDecoder(self.RESPONSE_KEYS, keys=self.PARSE_KEYS, derived={
+            self.RESPONSE_KEYS['avs-code-msg']: ('avs-code', self.avs_message),
+            self.RESPONSE_KEYS['sresp-msg']: ('sresp', self.status_message),
+            self.RESPONSE_KEYS['resp-code-msg']: ('resp-code', self.processor_message),
+        }, delimiter=self.DELIMITER, plus=False, strip='| \t\r\n')
+
+        if logger.isEnabledFor(logging.DEBUG):
+            debug_string = " %s.%s.__init__() -- You're in debug mode " % (__name__, 'PlugnPay')
+            logger.debug(debug_string.center(80, '='))
 
     def auth(self, amount, credit_card=None, billing_info=None, shipping_info=None):
         """
@@ -335,8 +345,9 @@ class PlugnPay(PostGateway):
 
         # validating or building up request
         if not credit_card:
-            debug_string = "%s.%s.auth()  -- No CreditCard object present. You passed in %s" % (__name__, 'PlugnPay', credit_card)
-            logger.debug(debug_string)
+            if logger.isEnabledFor(logging.DEBUG):
+                debug_string = "%s.%s.auth()  -- No CreditCard object present. You passed in %s" % (__name__, 'PlugnPay', credit_card)
+                logger.debug(debug_string)
 
             raise MissingDataError("You did not pass a CreditCard object into the auth method")
         else:
@@ -374,8 +385,9 @@ class PlugnPay(PostGateway):
 
         # validating or building up request
         if not credit_card:
-            debug_string = "%s.%s.capture()  -- No CreditCard object present. You passed in %s" % (__name__, 'PlugnPay', credit_card)
-            logger.debug(debug_string)
+            if logger.isEnabledFor(logging.DEBUG):
+                debug_string = "%s.%s.capture()  -- No CreditCard object present. You passed in %s" % (__name__, 'PlugnPay', credit_card)
+                logger.debug(debug_string)
 
             raise MissingDataError("You did not pass a CreditCard object into the auth method")
         else:
@@ -489,67 +501,70 @@ class PlugnPay(PostGateway):
         Makes a request using lib.api.GetGateway.make_request() & move some debugging away from other methods.
         """
 
-        debug_string = " %s.%s.request() -- Attempting request to: " % (__name__, 'PlugnPay')
-        logger.debug(debug_string.center(80, '='))
-        debug_string = "\n %s with params: %s" % (self.API_URI, self.params())
-        logger.debug(debug_string)
+        if logger.isEnabledFor(logging.DEBUG):
+            debug_string = " %s.%s.request() -- Attempting request to: " % (__name__, 'PlugnPay')
+            logger.debug(debug_string.center(80, '='))
+            debug_string = "\n %s with params: %s" % (self.API_URI, self.params())
+            logger.debug(debug_string)
 
         # make the request
         start = time.time()  # timing it
         response = self.make_request(self.API_URI)
         end = time.time()  # done timing it
-        response_time = '%0.2f' % (end - start)
+        response_time = end - start
 
-        debug_string = " %s.%s.request()  -- Request completed in %ss " % (__name__, 'PlugnPay', response_time)
-        logger.debug(debug_string.center(80, '='))
+        if logger.isEnabledFor(logging.DEBUG):
+            debug_string = " %s.%s.request()  -- Request completed in %0.2fs " % (__name__, 'PlugnPay', response_time)
+            logger.debug(debug_string.center(80, '='))
 
         return response, response_time
 
+    def is_approved(self, response):
+        """
+        Transaction status of a decoded response
+        """
+        return True if response['success'] == 'yes' else False
+
+    def avs_message(self, response):
+        """
+        AVS code description, based on `card-type`
+        """
+        if response.get('card-type') in self.AVS_RESPONSE_KEYS:
+            return self.AVS_RESPONSE_KEYS[response['card-type']][response['avs-code']]
+        else:  # default to VISA AVS description
+            return self.AVS_RESPONSE_KEYS['VISA'][response['avs-code']]
+
+    def status_message(self, response):
+        """
+        Simple response code description
+        """
+        return self.SIMPLE_STATUS_RESPONSE_KEYS[response['sresp']]
+
+    def processor_message(self, response):
+        """
+        Exact response code description by Merchant Processors
+        """
+        return self.STATUS_RESPONSE_KEYS[response['resp-code']]
+
     def parse(self, raw_response, response_time):
         """
         On Specific Gateway due differences in response from gateway
 
-        Populates the `response` dict with additional human-readable fields:
+        Transaction status is decoded right away, other fields from the raw response when first read,
+        including the human-readable ones:
         `avs-code-msg`  : AVS code description
         `sresp-msg`     : Simplified Response Code Message (Approved, Declined etc)
         `resp-code-msg` : Gateway Response Code Message
         """
 
-        debug_string = " %s.%s.parse() -- Raw response: " % (__name__, 'PlugnPay')
-        logger.debug(debug_string.center(80, '='))
-        debug_string = "\n %s" % raw_response
-        logger.debug(debug_string)
-
-        #splitting up response into a list so we can map it to Paython generic response
-        raw_response = raw_response.split(self.DELIMITER)
-
-        # map key/value keys to `response` dict
-        response = {}
-        for field in raw_response:
-            t = field.split('=')
-            response[urllib.unquote(t[0])] = urllib.unquote(t[1]).strip('|').strip()
-
-        # map AVS code to string based on `card-type`
-        if 'avs-code' in response:
-            if response['card-type'] in self.AVS_RESPONSE_KEYS:
-                response['avs-code-msg'] = self.AVS_RESPONSE_KEYS[response['card-type']][response['avs-code']]
-            else:  # default to VISA AVS description
-                response['avs-code-msg'] = self.AVS_RESPONSE_KEYS['VISA'][response['avs-code']]
-
-        # simple response code description
-        if 'sresp' in response:
-            response['sresp-msg'] = self.SIMPLE_STATUS_RESPONSE_KEYS[response['sresp']]
-
-        # exact response code description by Merchant Processors
-        if 'resp-code' in response:
-            response['resp-code-msg'] = self.STATUS_RESPONSE_KEYS[response['resp-code']]
-
-        # parse Transaction status
-        approved = True if response['success'] == 'yes' else False
+        if logger.isEnabledFor(logging.DEBUG):
+            debug_string = " %s.%s.parse() -- Raw response: " % (__name__, 'PlugnPay')
+            logger.debug(debug_string.center(80, '='))
+            debug_string = "\n %s" % raw_response
+            logger.debug(debug_string)
 
-        debug_string = " %s.%s.parse() -- Response as list: " % (__name__, 'PlugnPay')
-        logger.debug(debug_string.center(80, '='))
-        debug_string = '\n%s' % response
-        logger.debug(debug_string)
+        response = self.standardize_lazy(raw_response, self.response_decoder, response_time)
 
-        return self.standardize(response, self.RESPONSE_KEYS, response_time, approved)
+        # parse Transaction status, a response without one fails here rather than when read
+        response['approved'] = self.is_approved(self.response_decoder.decoded(response))
+        return response
@@ -4,6 +4,7 @@ import time
 import logging
 
 from ..lib.api import Gateway
+from ..lib.timing import lap
 from ..exceptions import GatewayError, DataValidationError
 
 
@@ -54,8 +55,9 @@ class Samurai(Gateway):
 
         if debug:
             self.debug = True
-        debug_string = " %s.%s.__init__() -- You're in debug mode" % (__name__, 'Samurai')
-        logger.debug(debug_string.center(80, '='))
+        if logger.isEnabledFor(logging.DEBUG):
+            debug_string = " %s.%s.__init__() -- You're in debug mode" % (__name__, 'Samurai')
+            logger.debug(debug_string.center(80, '='))
 
     def set(self, key, value):
         """
@@ -90,9 +92,10 @@ class Samurai(Gateway):
             card.verification_value,
             card.exp_month, card.exp_year, **billing_info)
 
-        debug_string = " %s.%s.charge_setup() -- response on setting pm" % (__name__, 'Samurai')
-        logger.debug(debug_string.center(80, '='))
-        logger.debug(dir(pm))
+        if logger.isEnabledFor(logging.DEBUG):
+            debug_string = " %s.%s.charge_setup() -- response on setting pm" % (__name__, 'Samurai')
+            logger.debug(debug_string.center(80, '='))
+            logger.debug(dir(pm))
 
         if pm.errors:
             raise DataValidationError("Invalid Card Data: %s" % pm.errors[pm.error_messages[0]['context']][0])
@@ -103,12 +106,14 @@ class Samurai(Gateway):
         # set up the card for charging, obviously
         card_token = self.charge_setup(credit_card, billing_info)
         # start the timer
+        lap('build')
         start = time.time()
         # send it over for processing
         response = Processor.authorize(card_token, amount)
         # measure time
         end = time.time()  # done timing it
-        response_time = '%0.2f' % (end - start)
+        lap('wait')
+        response_time = end - start
         # return parsed response
         return self.parse(response, response_time)
 
@@ -118,11 +123,13 @@ class Samurai(Gateway):
             raise GatewayError("Problem fetching transaction: %s" % txn.errors[txn.error_messages[0]['context']][0])
         else:
             # start the timer
+            lap('build')
             start = time.time()
             response = txn.capture(amount)
             # measure time
             end = time.time()  # done timing it
-            response_time = '%0.2f' % (end - start)
+            lap('wait')
+            response_time = end - start
             # return parsed response
             return self.parse(response, response_time)
 
@@ -130,12 +137,14 @@ class Samurai(Gateway):
         # set up the card for charging, obviously
         card_token = self.charge_setup(credit_card, billing_info)
         # start the timer
+        lap('build')
         start = time.time()
         # send it over for processing
         response = Processor.purchase(card_token, amount)
         # measure time
         end = time.time()  # done timing it
-        response_time = '%0.2f' % (end - start)
+        lap('wait')
+        response_time = end - start
         # return parsed response
         return self.parse(response, response_time)
 
@@ -145,11 +154,13 @@ class Samurai(Gateway):
             raise GatewayError("Problem fetching transaction: %s" % txn.errors[txn.error_messages[0]['context']][0])
         else:
             # start the timer
+            lap('build')
             start = time.time()
             response = txn.void()
             # measure time
             end = time.time()  # done timing it
-            response_time = '%0.2f' % (end - start)
+            lap('wait')
+            response_time = end - start
             # return parsed response
             return self.parse(response, response_time)
 
@@ -159,11 +170,13 @@ class Samurai(Gateway):
             raise GatewayError("Problem fetching transaction: %s" % txn.errors[txn.error_messages[0]['context']][0])
         else:
             # start the timer
+            lap('build')
             start = time.time()
             response = txn.reverse(amount)
             # measure time
             end = time.time()  # done timing it
-            response_time = '%0.2f' % (end - start)
+            lap('wait')
+            response_time = end - start
             # return parsed response
             return self.parse(response, response_time)
 
@@ -2,8 +2,10 @@ from __future__ import absolute_import, unicode_literals
 
 import time
 import logging
+import threading
 
-from ..lib.api import Gateway
+from ..lib.api import Gateway, GatewayResponse
+from ..exceptions import RequestError
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +14,56 @@ try:
 except ImportError:
     raise ImportError("Stripe library not found, please install requirements.txt")
 
+try:
+    from stripe.http_client import HTTPClient, new_default_http_client
+except ImportError:  # stripe releases without a pluggable http client keep using their own
+    HTTPClient = None
+
+_local = threading.local()  # the Stripe gateway calling the stripe library on each thread
+_install_lock = threading.Lock()
+
+
+if HTTPClient is not None:
+    class TransportHTTPClient(HTTPClient):
+        """
+        Sends the stripe library's requests through the transport of the Stripe gateway calling it on
+        this thread. Calls made outside of a gateway go to the client that was installed before this
+        one, or to a new stripe client like the library would make for them.
+        """
+        name = 'paython'
+
+        def __init__(self, fallback=None):
+            super(TransportHTTPClient, self).__init__()
+            self.fallback = fallback
+
+        def request(self, method, url, headers, post_data=None):
+            gateway = getattr(_local, 'gateway', None)
+            if gateway is None:
+                fallback = self.fallback or new_default_http_client(verify_ssl_certs=stripe.verify_ssl_certs,
+                                                                    proxy=getattr(stripe, 'proxy', None))
+                return fallback.request(method, url, headers, post_data)
+            try:
+                status, body = gateway.send_request(method.upper(), url, post_data, headers)
+            except RequestError, e:
+                raise stripe.APIConnectionError("Unexpected error communicating with Stripe: %s" % e)
+            return body, status, {}
+
+        def close(self):
+            if self.fallback is not None:
+                self.fallback.close()
+
+
+def install_http_client():
+    """
+    The stripe library only takes a module-global http client, ours is put in front of whichever
+    one is set the first time a Stripe gateway calls the library (and again if it's replaced)
+    """
+    if HTTPClient is None or isinstance(stripe.default_http_client, TransportHTTPClient):
+        return
+    with _install_lock:
+        if not isinstance(stripe.default_http_client, TransportHTTPClient):
+            stripe.default_http_client = TransportHTTPClient(stripe.default_http_client)
+
 
 class Stripe(Gateway):
     """TODO needs docstring"""
@@ -39,8 +91,21 @@ class Stripe(Gateway):
         # passing fields to bubble up to Base Class
         super(Stripe, self).__init__(translations={}, debug=debug)
 
-        debug_string = " %s.%s.__init__() -- You're in debug mode" % (__name__, 'Stripe')
-        logger.debug(debug_string.center(80, '='))
+        if logger.isEnabledFor(logging.DEBUG):
+            debug_string = " %s.%s.__init__() -- You're in debug mode" % (__name__, 'Stripe')
+            logger.debug(debug_string.center(80, '='))
+
+    def call_stripe(self, function, *args, **kwargs):
+        """
+        Calls the stripe library with the requests it makes going through this gateway's transport
+        """
+        install_http_client()
+        previous = getattr(_local, 'gateway', None)
+        _local.gateway = self
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _local.gateway = previous
 
     def set(self, key, value):
         """
@@ -64,14 +129,16 @@ class Stripe(Gateway):
         raise NotImplementedError("Stripe does not support auth or settlement. Try capture().")
 
     def capture(self, amount, credit_card=None, billing_info=None, shipping_info=None):
-        debug_string = " %s.%s.parse() -- Sending charge " % (__name__, 'Stripe')
-        logger.debug(debug_string.center(80, '='))
+        if logger.isEnabledFor(logging.DEBUG):
+            debug_string = " %s.%s.parse() -- Sending charge " % (__name__, 'Stripe')
+            logger.debug(debug_string.center(80, '='))
 
         amount = int(float(amount) * 100)  # then change the amount to how stripe likes it
 
         start = time.time()  # timing it
         try:
-            response = self.stripe_api.Charge.create(
+            response = self.call_stripe(
+                self.stripe_api.Charge.create,
                 amount=amount,
                 currency="usd",
                 card={
@@ -89,14 +156,14 @@ class Stripe(Gateway):
         except stripe.InvalidRequestError, e:
             response = {'failure_message': 'Invalid Request: %s' % e}
             end = time.time()  # done timing it
-            response_time = '%0.2f' % (end - start)
+            response_time = end - start
         except stripe.CardError, e:
             response = {'failure_message': 'Card Error: %s' % e}
             end = time.time()  # done timing it
-            response_time = '%0.2f' % (end - start)
+            response_time = end - start
         else:
             end = time.time()  # done timing it
-            response_time = '%0.2f' % (end - start)
+            response_time = end - start
 
         return self.parse(response, response_time)
 
@@ -107,21 +174,22 @@ class Stripe(Gateway):
         raise NotImplementedError("Stripe does not support transaction voiding. Try credit().")
 
     def credit(self, amount, trans_id):
-        debug_string = " %s.%s.parse() -- Sending credit " % (__name__, 'Stripe')
-        logger.debug(debug_string.center(80, '='))
+        if logger.isEnabledFor(logging.DEBUG):
+            debug_string = " %s.%s.parse() -- Sending credit " % (__name__, 'Stripe')
+            logger.debug(debug_string.center(80, '='))
 
         amount = int(float(amount) * 100)
         start = time.time()  # timing it
         try:
-            ch = self.stripe_api.Charge.retrieve(trans_id)
-            response = ch.refund(amount=amount)
+            ch = self.call_stripe(self.stripe_api.Charge.retrieve, trans_id)
+            response = self.call_stripe(ch.refund, amount=amount)
         except Exception, e:
             response = {'failure_message': 'Unable to refund: %s' % e}
             end = time.time()  # done timing it
-            response_time = '%0.2f' % (end - start)
+            response_time = end - start
         else:
             end = time.time()  # done timing it
-            response_time = '%0.2f' % (end - start)
+            response_time = end - start
 
         return self.parse(response, response_time)
 
@@ -140,11 +208,12 @@ class Stripe(Gateway):
         if hasattr(response, 'to_dict'):
             response = response.to_dict()
 
-        debug_string = " %s.%s.parse() -- Dict response: " % (__name__, 'Stripe')
-        logger.debug(debug_string.center(80, '='))
-        logger.debug("\n %s" % response)
+        if logger.isEnabledFor(logging.DEBUG):
+            debug_string = " %s.%s.parse() -- Dict response: " % (__name__, 'Stripe')
+            logger.debug(debug_string.center(80, '='))
+            logger.debug("\n %s" % response)
 
-        new_response = {}
+        new_response = GatewayResponse()
 
         # alright now lets stuff some info in here
         new_response['response_time'] = response_time
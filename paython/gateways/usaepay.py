@@ -1,11 +1,11 @@
 from __future__ import absolute_import, unicode_literals
 
 import time
-import urlparse
 import logging
 
 from ..exceptions import MissingDataError
 from ..lib.api import PostGateway
+from ..lib.utils import parse_urlencoded
 
 logger = logging.getLogger(__name__)
 
@@ -106,8 +106,9 @@ class USAePay(PostGateway):
 
         self.test = test
         if test:
-            debug_string = " %s.%s.__init__() -- You're in test mode (& debug, obviously)" % (__name__, 'USAePay')
-            logger.debug(debug_string.center(80, '='))
+            if logger.isEnabledFor(logging.DEBUG):
+                debug_string = " %s.%s.__init__() -- You're in test mode (& debug, obviously)" % (__name__, 'USAePay')
+                logger.debug(debug_string.center(80, '='))
 
     def charge_setup(self):
         """
@@ -116,8 +117,9 @@ class USAePay(PostGateway):
         #self.set('x_delim_data', 'TRUE')
         #self.set('x_delim_char', self.DELIMITER)
         #self.set('x_version', self.VERSION)
-        debug_string = " %s.%s.charge_setup() Just set up for a charge " % (__name__, 'USAePay')
-        logger.debug(debug_string.center(80, '='))
+        if logger.isEnabledFor(logging.DEBUG):
+            debug_string = " %s.%s.charge_setup() Just set up for a charge " % (__name__, 'USAePay')
+            logger.debug(debug_string.center(80, '='))
 
     def auth(self, amount, credit_card=None, billing_info=None, shipping_info=None):
         """
@@ -132,8 +134,9 @@ class USAePay(PostGateway):
 
         # validating or building up request
         if not credit_card:
-            debug_string = "%s.%s.auth()  -- No CreditCard object present. You passed in %s" % (__name__, 'USAePay', credit_card)
-            logger.debug(debug_string)
+            if logger.isEnabledFor(logging.DEBUG):
+                debug_string = "%s.%s.auth()  -- No CreditCard object present. You passed in %s" % (__name__, 'USAePay', credit_card)
+                logger.debug(debug_string)
 
             raise MissingDataError("You did not pass a CreditCard object into the auth method")
         else:
@@ -194,8 +197,9 @@ class USAePay(PostGateway):
 
         # validating or building up request
         if not credit_card:
-            debug_string = "%s.%s.capture()  -- No CreditCard object present. You passed in %s" % (__name__, 'USAePay', credit_card)
-            logger.debug(debug_string)
+            if logger.isEnabledFor(logging.DEBUG):
+                debug_string = "%s.%s.capture()  -- No CreditCard object present. You passed in %s" % (__name__, 'USAePay', credit_card)
+                logger.debug(debug_string)
 
             raise MissingDataError("You did not pass a CreditCard object into the auth method")
         else:
@@ -270,18 +274,20 @@ class USAePay(PostGateway):
         # decide which url to use (test|live)
         url = self.API_URI[self.test]
 
-        debug_string = " %s.%s.request() -- Attempting request to: " % (__name__, 'USAePay')
-        logger.debug(debug_string.center(80, '='))
-        logger.debug("\n %s with params: %s" % (url, self.params()))
+        if logger.isEnabledFor(logging.DEBUG):
+            debug_string = " %s.%s.request() -- Attempting request to: " % (__name__, 'USAePay')
+            logger.debug(debug_string.center(80, '='))
+            logger.debug("\n %s with params: %s" % (url, self.params()))
 
         # make the request
         start = time.time()  # timing it
         response = self.make_request(url)
         end = time.time()  # done timing it
-        response_time = '%0.2f' % (end - start)
+        response_time = end - start
 
-        debug_string = " %s.%s.request()  -- Request completed in %ss" % (__name__, 'USAePay', response_time)
-        logger.debug(debug_string.center(80, '='))
+        if logger.isEnabledFor(logging.DEBUG):
+            debug_string = " %s.%s.request()  -- Request completed in %0.2fs" % (__name__, 'USAePay', response_time)
+            logger.debug(debug_string.center(80, '='))
 
         return response, response_time
 
@@ -289,17 +295,18 @@ class USAePay(PostGateway):
         """
         On Specific Gateway due differences in response from gateway
         """
-        debug_string = " %s.%s.parse() -- Raw response: " % (__name__, 'USAePay')
-        logger.debug(debug_string.center(80, '='))
-        logger.debug('\n ' + str(response))
+        if logger.isEnabledFor(logging.DEBUG):
+            debug_string = " %s.%s.parse() -- Raw response: " % (__name__, 'USAePay')
+            logger.debug(debug_string.center(80, '='))
+            logger.debug('\n ' + str(response))
 
         #splitting up response into a list so we can map it to Paython generic response
-        new_response = urlparse.parse_qsl(response)
-        response = dict(new_response)
+        response = parse_urlencoded(response, keys=self.RESPONSE_KEYS, blank=False)
         approved = (response['UMresult'] == 'A')
 
-        debug_string = " %s.%s.parse() -- Response as list: " % (__name__, 'USAePay')
-        logger.debug(debug_string.center(80, '='))
-        logger.debug('\n' + str(response))
+        if logger.isEnabledFor(logging.DEBUG):
+            debug_string = " %s.%s.parse() -- Response as list: " % (__name__, 'USAePay')
+            logger.debug(debug_string.center(80, '='))
+            logger.debug('\n' + str(response))
 
         return self.standardize(response, self.RESPONSE_KEYS, response_time, approved)
@@ -1,21 +1,153 @@
 from __future__ import absolute_import, unicode_literals
 
-import httplib
+import Queue
 import urllib
-import xml.dom.minidom
+import sys
+import threading
 import logging
 
-from .utils import parse_xml, is_valid_email
+from functools import wraps
+
+from .futures import WorkerPool, worker_pool
+from .response import GatewayResponse, ColumnDecoder, URLEncodedDecoder  # NOQA
+from .transport import Transport, PooledTransport, LoopbackTransport, RedirectTransport, default_transport  # NOQA
+from .profiling import sample_profiler, collect_profile
+from .timing import lap, start_timings, stop_timings, run_timing_hooks
+from .tracing import traced
+from .utils import parse_xml, parse_fields, is_valid_email
+from .xmlbuilder import XMLBuilder
 from ..exceptions import RequestError, GatewayError, DataValidationError, MissingTranslationError
 
 logger = logging.getLogger(__name__)
 
 
+def transaction(method):
+    """
+    Runs a gateway method as one transaction: the request state it builds with set() lives in
+    the calling thread only, starts from the gateway's configured fields & is dropped afterwards.
+    Calls nested inside a running transaction share its state.
+
+    The time spent in each phase is recorded in a lib.timing.Timings, attached to the response
+    as `response.timings` & handed to the timing hooks. Transactions sampled by lib.profiling run
+    under cProfile.
+    """
+    @wraps(method)
+    def run_transaction(self, *args, **kwargs):
+        local = self._local
+        if getattr(local, 'state', None) is not None:
+            return method(self, *args, **kwargs)
+
+        timings = start_timings()
+        profiler = sample_profiler()
+        response = error = None
+        local.state = self.new_request_state()
+        try:
+            if profiler is None:
+                response = method(self, *args, **kwargs)
+            else:
+                response = profiler.runcall(method, self, *args, **kwargs)
+            return response
+        except Exception:
+            error = sys.exc_info()[1]
+            raise
+        finally:
+            local.state = None
+            timings.lap('parse')
+            stop_timings()
+            if isinstance(response, GatewayResponse):
+                response.timings = timings
+            run_timing_hooks(self, method.__name__, timings, response, error)
+            if profiler is not None:
+                collect_profile(profiler)
+
+    run_transaction.__wrapped__ = method  # the original signature, for introspection
+    return run_transaction
+
+
+def compile_positions(field_mapping):
+    """
+    Turns a positional response mapping ({'0': 'response_code', '6': 'trans_id', ...}) into the index
+    table GatewayResponse.set_columns() takes. Non numeric keys are left out.
+    """
+    positions = [(int(key), field, GatewayResponse.is_slot(field)) for key, field in field_mapping.items() if key.isdigit()]
+    positions.sort()
+    return tuple(positions)
+
+
+class GatewayType(type):
+    """
+    Gateway metaclass, wraps the methods named in TRANSACTIONS with `transaction` & those in TRACED with
+    lib.tracing.traced in every gateway class, and compiles the class' RESPONSE_KEYS into RESPONSE_POSITIONS
+    for delimited responses
+    """
+    def __new__(mcs, name, bases, attrs):
+        cls = super(GatewayType, mcs).__new__(mcs, name, bases, attrs)
+        for method_name in cls.TRANSACTIONS:
+            if callable(attrs.get(method_name)):
+                setattr(cls, method_name, traced('transaction', transaction(attrs[method_name])))
+        for method_name, stage in cls.TRACED.items():
+            if callable(attrs.get(method_name)):
+                setattr(cls, method_name, traced(stage, attrs[method_name]))
+        if 'RESPONSE_KEYS' in attrs:
+            cls.RESPONSE_POSITIONS = compile_positions(attrs['RESPONSE_KEYS'])
+        return cls
+
+
+class BatchResult(object):
+    """
+    Outcome of one operation run by Gateway.batch(): the standardized `response`, or the `error` it raised
+    """
+    def __init__(self, index, operation, response=None, error=None):
+        self.index = index
+        self.operation = operation
+        self.response = response
+        self.error = error
+
+    def __repr__(self):
+        name = self.operation[0] if isinstance(self.operation, (tuple, list)) and self.operation else self.operation
+        return '<BatchResult -- #{0.index} {1}, {2}>'.format(self, name, 'error: %r' % self.error if self.error else 'ok')
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
 class Gateway(object):
     """base gateway class"""
+    __metaclass__ = GatewayType
+
+    # gateway methods sending a transaction, each call gets its own request state
+    TRANSACTIONS = ('auth', 'reauth', 'settle', 'capture', 'void', 'credit', 'adjust',
+                    'return_transaction', 'return_credit', 'open_credit', 'query')
+
+    # gateway methods seen by lib.tracing tracers, method name ==> stage
+    TRACED = {
+        'charge_setup': 'translate',
+        'use_credit_card': 'translate',
+        'set_billing_info': 'translate',
+        'set_shipping_info': 'translate',
+        'request': 'request',
+        'send_request': 'send',
+        'parse': 'parse',
+        'standardize': 'parse',
+        'standardize_lazy': 'parse',
+    }
+
     REQUEST_FIELDS = {}
     RESPONSE_FIELDS = {}
+    RESPONSE_KEYS = {}
     debug = False
+    transport = default_transport  # assign a lib.transport.Transport to change how requests are sent
+    worker_pool = worker_pool  # runs the *_async calls
+
+    def __new__(cls, *args, **kwargs):
+        """
+        Sets up the per-instance request state before any __init__ gets to call set()
+        """
+        gateway = super(Gateway, cls).__new__(cls)
+        gateway._local = threading.local()
+        gateway.request_defaults = gateway.new_request_defaults()
+        return gateway
 
     def __init__(self, translations, debug):
         """
@@ -24,9 +156,114 @@ class Gateway(object):
         self.REQUEST_FIELDS = translations
         self.debug = debug
 
+    def new_request_defaults(self):
+        """
+        Container for the fields set outside of a transaction (credentials & settings), sent with every request
+        """
+        return {}
+
+    def new_request_state(self):
+        """
+        Request state for a new transaction, seeded with the gateway's defaults
+        """
+        return dict(self.request_defaults)
+
+    @property
+    def request_state(self):
+        """
+        Request state of the transaction running in the current thread, None outside of a transaction
+        """
+        return getattr(self._local, 'state', None)
+
     def set(self, key, value):
         raise NotImplementedError
 
+    def send_request(self, method, url, body=None, headers=None, **connection_kwargs):
+        """
+        Sends the request built so far through the gateway's transport, returns (status, response body)
+        """
+        lap('build')
+        try:
+            return self.transport.send(method, url, body, headers, **connection_kwargs)
+        finally:
+            lap('wait')
+
+    def submit(self, method_name, *args, **kwargs):
+        """
+        Runs a gateway method on the worker pool without blocking, returns a lib.futures.Future of its result
+        """
+        return self.worker_pool.submit(getattr(self, method_name), *args, **kwargs)
+
+    def auth_async(self, *args, **kwargs):
+        """
+        auth() in the background, returns a Future of the response
+        """
+        return self.submit('auth', *args, **kwargs)
+
+    def settle_async(self, *args, **kwargs):
+        """
+        settle() in the background, returns a Future of the response
+        """
+        return self.submit('settle', *args, **kwargs)
+
+    def capture_async(self, *args, **kwargs):
+        """
+        capture() in the background, returns a Future of the response
+        """
+        return self.submit('capture', *args, **kwargs)
+
+    def void_async(self, *args, **kwargs):
+        """
+        void() in the background, returns a Future of the response
+        """
+        return self.submit('void', *args, **kwargs)
+
+    def credit_async(self, *args, **kwargs):
+        """
+        credit() in the background, returns a Future of the response
+        """
+        return self.submit('credit', *args, **kwargs)
+
+    def batch(self, operations, workers=10):
+        """
+        Runs many transactions concurrently on a pool of `workers` threads, yielding a BatchResult
+        for each one as it completes. `operations` is any iterable of (method name, kwargs) tuples,
+        e.g. ('settle', {'amount': '1.00', 'trans_id': '2156729380'}); it is consumed as the batch
+        goes, keeping at most twice `workers` operations in flight. An operation that raises, or
+        isn't a (method name, kwargs) tuple, doesn't stop the batch, its BatchResult carries the error
+        instead. Closing the batch early cancels the operations that haven't started, the ones already
+        running (at most `workers`) finish in the background without their results being seen.
+        """
+        pool = WorkerPool(max_workers=workers)
+        finished = Queue.Queue()
+        pending = {}  # index ==> future of the operations in flight
+
+        def run(operation):
+            method_name, kwargs = operation
+            return getattr(self, method_name)(**kwargs)
+
+        def result(index, operation, future):
+            del pending[index]
+            error = future.exception()
+            if error is not None:
+                return BatchResult(index, operation, error=error)
+            return BatchResult(index, operation, response=future.result())
+
+        try:
+            for index, operation in enumerate(operations):
+                future = pending[index] = pool.submit(run, operation)
+                future.add_done_callback(lambda future, index=index, operation=operation: finished.put((index, operation, future)))
+
+                while len(pending) >= workers * 2:
+                    yield result(*finished.get())
+
+            while pending:
+                yield result(*finished.get())
+        finally:
+            for future in pending.values():
+                future.cancel()
+            pool.shutdown(wait=False)
+
     def use_credit_card(self, credit_card):
         """
         Set up credit card info use (if necessary for transaction)
@@ -112,36 +349,55 @@ class Gateway(object):
         Translates gateway specific response into Paython generic response.
         Expects list or dictionary for spec_repsonse & dictionary for field_mapping.
         """
+        # a new response every time, RESPONSE_FIELDS is only the template
+        response_fields = GatewayResponse(self.RESPONSE_FIELDS)
+
         # manual settings
-        self.RESPONSE_FIELDS['response_time'] = response_time
-        self.RESPONSE_FIELDS['approved'] = approved
+        response_fields['response_time'] = response_time
+        response_fields['approved'] = approved
 
         if isinstance(spec_response, list):  # list settings
-            i = 0
-            debug_string = " %s.%s.standardize() -- spec_response: " % (__name__, 'Gateway')
-            logger.debug(debug_string.center(80, '='))
-            logger.debug('\n%s' % spec_response)
-            debug_string = " %s.%s.standardize() -- field_mapping: " % (__name__, 'Gateway')
-            logger.debug(debug_string.center(80, '='))
-            logger.debug('\n%s' % field_mapping)
-
-            for item in spec_response:
-                iteration_key = str(i)  # stringifying because the field_mapping keys are strings
-                if iteration_key in field_mapping:
-                    self.RESPONSE_FIELDS[field_mapping[iteration_key]] = item
-                i += 1
+            if logger.isEnabledFor(logging.DEBUG):
+                debug_string = " %s.%s.standardize() -- spec_response: " % (__name__, 'Gateway')
+                logger.debug(debug_string.center(80, '='))
+                logger.debug('\n%s' % spec_response)
+                debug_string = " %s.%s.standardize() -- field_mapping: " % (__name__, 'Gateway')
+                logger.debug(debug_string.center(80, '='))
+                logger.debug('\n%s' % field_mapping)
+
+            # index tables are compiled with the gateway class, other mappings on the fly
+            if field_mapping is self.RESPONSE_KEYS:
+                positions = self.RESPONSE_POSITIONS
+            else:
+                positions = compile_positions(field_mapping)
+
+            response_fields.set_columns(spec_response, positions)
         else:  # dict settings
             for key, value in spec_response.items():
                 try:
-                    self.RESPONSE_FIELDS[field_mapping[key]] = value
+                    response_fields[field_mapping[key]] = value
                 except KeyError:
                     pass  # its okay to fail if we dont have a translation
 
         #send it back!
-        return self.RESPONSE_FIELDS
+        return response_fields
+
+    def standardize_lazy(self, raw_response, decoder, response_time, approved=None):
+        """
+        Like standardize(), but the response keeps `raw_response` & the `decoder` only decodes a field
+        from it when the field is first read. `approved` can be left to the decoder too.
+        """
+        response_fields = GatewayResponse(self.RESPONSE_FIELDS, source=raw_response, decoder=decoder)
+        response_fields['response_time'] = response_time
+        if approved is not None:
+            response_fields['approved'] = approved
+        return response_fields
 
 
 class XMLGateway(Gateway):
+    # when True, make_request() only reads the elements named by projected_fields() from the response
+    project_response = False
+
     def __init__(self, host, translations, debug=False, special_params={}, headers={}):
         """ initalize API call session
 
@@ -149,7 +405,6 @@ class XMLGateway(Gateway):
         auth: accept a tuple with (username,password)
         debug: True/False
         """
-        self.doc = xml.dom.minidom.Document()
         self.api_host = host
         self.debug = debug
         self.parse_xml = parse_xml
@@ -157,79 +412,67 @@ class XMLGateway(Gateway):
         self.headers = headers
         super(XMLGateway, self).__init__(translations=translations, debug=debug)
 
+    def new_request_defaults(self):
+        """
+        XML defaults are kept as the list of set() calls made outside of a transaction
+        """
+        return []
+
+    def new_request_state(self):
+        """
+        New request document for a transaction, with the default elements already in it
+        """
+        doc = self._local.state = XMLBuilder()
+        for path, child, attribute in self.request_defaults:
+            self.set(path, child, attribute)
+        return doc
+
+    @property
+    def doc(self):
+        """
+        Request document of the transaction in progress (outside of one, a document holding the defaults)
+        """
+        doc = self.request_state
+        if doc is None:
+            try:
+                doc = self.new_request_state()
+            finally:
+                self._local.state = None
+        return doc
+
     @property
     def envelope(self):
         """
-        This method should return the document or element which set() will use to add new elements into.
+        This method should return the element of the request document which set() will use to add new elements into.
         Could be used to envelope XML (as in SOAP requests)
         """
-        if hasattr(self, '_envelope'):
-            return self._envelope
-        self._envelope = self.doc
-        return self._envelope
+        return self.doc.root
 
     def set(self, path, child=False, attribute=False):
         """ Accepts a forward slash separated path of XML elements to traverse and create if non existent.
         Optional child and target node attributes can be set. If the `child` attribute is a tuple
         it will create X child nodes by reading each tuple as (name, text, 'attribute:value') where value
-        and attributes are optional for each tuple.
+        and attributes are optional for each tuple. Existing elements of the path are looked up among the
+        children of the element before them, so "order/billing/name" reuses order and order/billing.
 
         - path: forward slash separated API element path as string (example: "Order/Authentication/Username")
         - child: tuple of child node data or string to create a text node
         - attribute: sets the target XML attributes (string format: "Key:Value")
         """
-        try:
-            xml_path = path.split('/')
-        except AttributeError:
+        if path is None:
             return  # because if it's None, then don't worry
 
-        envelope = self.envelope
-
-        # traverse full XML element path string `path`
-        for element_name in xml_path:
-            # get existing XML element by `element_name`
-            element = envelope.getElementsByTagName(element_name)
-            if element:
-                element = element[0]
-
-            # create element if non existing or target element
-            if not element or element_name == xml_path[-1:][0]:
-                element = self.doc.createElement(element_name)
-                envelope.appendChild(element)
-
-            envelope = element
-
-        if child:
-            # create child elements from an tuple with optional text node or attributes
-            # format: ((name1, text, 'attribute:value'), (name2, text2))
-            if isinstance(child, tuple):
-                for obj in child:
-                    child = self.doc.createElement(obj[0])
-                    if len(obj) >= 2:
-                        element = self.doc.createTextNode(str(obj[1]))
-                        child.appendChild(element)
-                    if len(obj) == 3:
-                        a = obj[2].split(':')
-                        child.setAttribute(a[0], a[1])
-                    envelope.appendChild(child)
-            # create a single text child node
-            else:
-                element = self.doc.createTextNode(str(child))
-                envelope.appendChild(element)
-
-        # target element attributes
-        if attribute:
-            #checking to see if we have a list of attributes
-            if '|' in attribute:
-                attributes = attribute.split('|')
-            else:
-                #if not just put this into a list so we have the same data type no matter what
-                attributes = [attribute]
+        if self.request_state is None:  # configuring the gateway, applies to every transaction
+            self.request_defaults.append((path, child, attribute))
+            return
+
+        self.doc.add(path, child, attribute, parent=self.envelope)
 
-            # adding attributes for each item
-            for attribute in attributes:
-                attribute = attribute.split(':')
-                envelope.setAttribute(attribute[0], attribute[1])
+    def projected_fields(self):
+        """
+        Names of the response elements the gateway reads, used when project_response is on
+        """
+        return self.RESPONSE_KEYS.keys()
 
     def request_xml(self):
         """
@@ -244,9 +487,6 @@ class XMLGateway(Gateway):
         """
         request_body = self.doc.toxml('utf-8')
 
-        api = httplib.HTTPSConnection(self.api_host, **self.special_ssl)
-
-        api.connect()
         headers = {
             'Host': self.api_host,
             'Content-type': 'text/xml; charset="utf-8"',
@@ -254,17 +494,26 @@ class XMLGateway(Gateway):
             'User-Agent': 'yourdomain.net',
         }
         headers.update(self.headers)
-        for header, value in headers.items():
-            api.putheader(header, value)
-        api.endheaders()
-        api.send(request_body)
 
-        resp = api.getresponse()
-        resp_data = resp.read()
+        connection_kwargs = dict(self.special_ssl)
+        port = connection_kwargs.pop('port', None)
+        if port:
+            url = 'https://%s:%s%s' % (self.api_host, port, api_uri)
+        else:
+            url = 'https://%s%s' % (self.api_host, api_uri)
+
+        status, resp_data = self.send_request('POST', url, request_body, headers, **connection_kwargs)
 
         # parse API call response
-        if not resp.status == 200:
-            raise RequestError("Gateway returned %i status" % resp.status)
+        if not status == 200:
+            raise RequestError("Gateway returned %i status" % status)
+
+        # read just the fields the gateway uses, under the same 'response' key as a wrapped response
+        if self.project_response:
+            try:
+                return {'response': parse_fields(resp_data, self.projected_fields())}
+            except GatewayError:
+                raise RequestError("Could not parse XML into JSON")
 
         # parse XML response and return as dict
         try:
@@ -283,7 +532,6 @@ class SOAPGateway(XMLGateway):
 
 
 class GetGateway(Gateway):
-    REQUEST_DICT = {}
     debug = False
 
     def __init__(self, translations, debug):
@@ -293,6 +541,14 @@ class GetGateway(Gateway):
         super(GetGateway, self).__init__(translations=translations, debug=debug)
         self.debug = debug
 
+    @property
+    def REQUEST_DICT(self):
+        """
+        Request fields of the transaction in progress in this thread, the gateway's defaults outside of one
+        """
+        state = self.request_state
+        return self.request_defaults if state is None else state
+
     def set(self, key, value):
         """
         Setups request dict for Get
@@ -317,19 +573,20 @@ class GetGateway(Gateway):
 
     def make_request(self, uri):
         """
-        GETs url with params - simple enough... string uri, string params
+        GETs url with params through the gateway's transport - string uri, string params
         """
         try:
-            params = self.query_string()
-            request = urllib.urlopen('%s%s' % (uri, params))
+            status, data = self.send_request('GET', '%s%s' % (uri, self.query_string()))
+        except RequestError, e:
+            raise GatewayError("Error making request to gateway: %s" % e)
 
-            return request.read()
-        except:
-            raise GatewayError("Error making request to gateway")
+        if status != 200:
+            raise GatewayError("Gateway returned %i status" % status)
+
+        return data
 
 
 class PostGateway(Gateway):
-    REQUEST_DICT = {}
     debug = False
 
     def __init__(self, translations, debug):
@@ -339,6 +596,14 @@ class PostGateway(Gateway):
         super(PostGateway, self).__init__(translations=translations, debug=debug)
         self.debug = debug
 
+    @property
+    def REQUEST_DICT(self):
+        """
+        Request fields of the transaction in progress in this thread, the gateway's defaults outside of one
+        """
+        state = self.request_state
+        return self.request_defaults if state is None else state
+
     def set(self, key, value):
         """
         Setups request dict for Post
@@ -353,10 +618,15 @@ class PostGateway(Gateway):
 
     def make_request(self, uri):
         """
-        POSTs to url with params (self.REQUEST_DICT) - simple enough... string uri, dict params
+        POSTs to url with params (self.REQUEST_DICT) through the gateway's transport - string uri, dict params
         """
+        headers = {'Content-type': 'application/x-www-form-urlencoded'}
         try:
-            request = urllib.urlopen(uri, self.params())
-            return request.read()
-        except:
-            raise GatewayError("Error making request to gateway")
+            status, data = self.send_request('POST', uri, self.params(), headers)
+        except RequestError, e:
+            raise GatewayError("Error making request to gateway: %s" % e)
+
+        if status != 200:
+            raise GatewayError("Gateway returned %i status" % status)
+
+        return data
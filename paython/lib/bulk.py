@@ -0,0 +1,246 @@
+from __future__ import absolute_import, unicode_literals
+
+import calendar
+import itertools
+
+from datetime import datetime
+
+try:
+    import numpy
+except ImportError:  # validated row by row in pure Python instead
+    numpy = None
+
+from .iin import iin_table, PREFIX_DIGITS
+from .utils import LUHN_DOUBLED, get_card_type, is_valid_cc, is_valid_exp, is_valid_cvv
+from .utils import VALID, INVALID_TYPE, INVALID_NUMBER, EXPIRED, INVALID_CVV, INVALID_EXP, MESSAGES  # NOQA
+
+CHUNKSIZE = 1 << 20
+
+WIDTH = 19  # longest card number validated vectorized, longer ones go row by row
+
+
+def card_code(number):
+    """
+    VALID, INVALID_TYPE or INVALID_NUMBER for a card number, as checked by CreditCard.validate()
+    """
+    if not isinstance(number, basestring) or not get_card_type(number):
+        return INVALID_TYPE
+    if not is_valid_cc(number):
+        return INVALID_NUMBER
+    return VALID
+
+
+def expiry_code(month, year):
+    """
+    VALID, EXPIRED or INVALID_EXP for an expiration month & year
+    """
+    try:
+        return VALID if is_valid_exp(month, year) else EXPIRED
+    except (ValueError, TypeError):
+        return INVALID_EXP
+
+
+def cvv_code(cvv, cc_type):
+    try:
+        return VALID if is_valid_cvv(cvv, cc_type) else INVALID_CVV
+    except TypeError:  # no cvv
+        return INVALID_CVV
+
+
+def column_chunks(column, size):
+    """
+    Slices of `size` rows from a sequence (list, array, column...) or lists of them from any other iterable
+    """
+    if hasattr(column, '__len__') and hasattr(column, '__getitem__'):
+        for start in xrange(0, len(column), size):
+            yield column[start:start + size]
+    else:
+        column = iter(column)
+        chunk = list(itertools.islice(column, size))
+        while chunk:
+            yield chunk
+            chunk = list(itertools.islice(column, size))
+
+
+def validate_cards(numbers, months, years, cvvs=None, strict=False, vectorized=None, chunksize=CHUNKSIZE):
+    """
+    Validates columns of card numbers, expiration months & years (and cvvs, checked when `strict`)
+    the way CreditCard.validate() does, returning a result code per row: VALID or the first check
+    the row fails, see MESSAGES. Rows are validated `chunksize` at a time in a NumPy vectorized pass,
+    or in pure Python when NumPy isn't importable or `vectorized` is False. The codes are a NumPy
+    int8 array when vectorized, a list otherwise.
+    """
+    if vectorized is None:
+        vectorized = numpy is not None
+    elif vectorized and numpy is None:
+        raise ImportError("NumPy is needed for vectorized validation")
+    validate = validate_chunk_numpy if vectorized else validate_chunk
+
+    if cvvs is None:
+        cvvs = itertools.repeat(None)
+        columns = itertools.izip(column_chunks(numbers, chunksize), column_chunks(months, chunksize), column_chunks(years, chunksize))
+    else:
+        columns = itertools.izip(column_chunks(numbers, chunksize), column_chunks(months, chunksize), column_chunks(years, chunksize),
+                                 column_chunks(cvvs, chunksize))
+
+    results = []
+    rows = 0
+    for chunk in columns:
+        count = len(chunk[0])
+        if any(len(column) != count for column in chunk[1:]):
+            raise ValueError("numbers, months, years & cvvs should have the same length")
+        if len(chunk) == 3:
+            chunk += ([None] * count,)
+        results.append(validate(*(chunk + (strict,))))
+        rows += count
+    for column in (numbers, months, years, cvvs):
+        if hasattr(column, '__len__') and len(column) != rows:
+            raise ValueError("numbers, months, years & cvvs should have the same length")
+
+    if vectorized:
+        return numpy.concatenate(results) if results else numpy.zeros(0, dtype=numpy.int8)
+    return list(itertools.chain.from_iterable(results))
+
+
+def validate_chunk(numbers, months, years, cvvs, strict):
+    """
+    Pure Python validation, expirations & cvvs are checked once per distinct value
+    """
+    expiries = {}
+    cvv_codes = {}
+    codes = []
+    for number, month, year, cvv in itertools.izip(numbers, months, years, cvvs):
+        cc_type = get_card_type(number) if isinstance(number, basestring) else None
+        if not cc_type:
+            code = INVALID_TYPE
+        elif not is_valid_cc(number):
+            code = INVALID_NUMBER
+        else:
+            code = VALID
+
+        if code == VALID:
+            key = month, year
+            try:
+                code = expiries[key]
+            except KeyError:
+                code = expiries[key] = expiry_code(month, year)
+
+        if code == VALID and strict:
+            key = cvv, cc_type
+            try:
+                code = cvv_codes[key]
+            except KeyError:
+                code = cvv_codes[key] = cvv_code(cvv, cc_type)
+
+        codes.append(code)
+    return codes
+
+
+def unique_values(column):
+    """
+    (distinct values, index of each row's value in them) for a column
+    """
+    values, inverse = numpy.unique(numpy.asarray(column), return_inverse=True)
+    return values, inverse
+
+
+def parse_ints(values, low, high):
+    """
+    `values` as ints, 0 where they aren't ints between `low` & `high`
+    """
+    parsed = numpy.zeros(len(values), dtype=numpy.int32)
+    for i, value in enumerate(values):
+        try:
+            value = int(value)
+        except (ValueError, TypeError):
+            continue
+        if low <= value <= high:
+            parsed[i] = value
+    return parsed
+
+
+def as_bytes(numbers):
+    """
+    Numbers as a NumPy array of WIDTH byte strings, anything but ASCII replaced so it fails the digit checks
+    """
+    try:
+        return numpy.asarray(numbers).astype(numpy.dtype((numpy.bytes_, WIDTH)))
+    except (UnicodeError, TypeError, ValueError):
+        return numpy.array([number.encode('ascii', 'replace') if isinstance(number, unicode) else number if isinstance(number, bytes) else b''
+                            for number in numbers], dtype=numpy.dtype((numpy.bytes_, WIDTH)))
+
+
+def validate_chunk_numpy(numbers, months, years, cvvs, strict):
+    """
+    Vectorized validation: the Luhn check runs over a rows x digits matrix, card types are a searchsorted()
+    in the IIN ranges, expirations & cvvs are checked once per distinct value. Numbers that aren't up to
+    WIDTH ASCII digits are validated row by row.
+    """
+    count = len(numbers)
+    codes = numpy.zeros(count, dtype=numpy.int8)
+    if not count:
+        return codes
+
+    lengths = numpy.fromiter((len(number) if isinstance(number, basestring) else 0 for number in numbers), dtype=numpy.intp, count=count)
+    digits = as_bytes(numbers).view(numpy.uint8).reshape(count, WIDTH) - numpy.uint8(48)  # anything but digits ends up >= 10
+    inside = numpy.arange(WIDTH) < lengths[:, None]
+    simple = ((digits < 10) | ~inside).all(axis=1) & (lengths > 0) & (lengths <= WIDTH)
+
+    # card types, as indexes in `type_names`: the IIN range each number falls in, plus one
+    starts, entries = iin_table.index
+    type_names = [None] + [brand for end, brand, allowed in entries]
+    type_ids = {}
+    types = numpy.zeros(count, dtype=numpy.int16)
+
+    rows = numpy.flatnonzero(simple)
+    if len(rows):
+        values = numpy.where(inside[rows], digits[rows], 0)
+        if len(starts):
+            leading = values[:, :PREFIX_DIGITS].astype(numpy.int64).dot(10 ** numpy.arange(PREFIX_DIGITS - 1, -1, -1, dtype=numpy.int64))
+            found = numpy.searchsorted(numpy.asarray(starts, dtype=numpy.int64), leading, side='right') - 1
+            ends = numpy.array([end for end, brand, allowed in entries], dtype=numpy.int64)
+            masks = numpy.array([sum(1 << length for length in allowed if length < 63) for end, brand, allowed in entries], dtype=numpy.int64)
+            matched = ((found >= 0) & (leading <= ends[found]) &
+                       ((masks[found] >> numpy.minimum(lengths[rows], 63)) & 1).astype(bool))
+            types[rows] = numpy.where(matched, found + 1, 0)
+
+        # Luhn: digits at odd positions from the right are doubled
+        positions = (lengths[rows, None] - 1) - numpy.arange(WIDTH)
+        values = numpy.where(positions % 2 == 1, numpy.take(LUHN_DOUBLED, values), values)
+        luhn = values.sum(axis=1) % 10 == 0
+
+        codes[rows] = numpy.where(types[rows] == 0, INVALID_TYPE, numpy.where(luhn, VALID, INVALID_NUMBER))
+
+    for row in numpy.flatnonzero(~simple):
+        number = numbers[row]
+        codes[row] = card_code(number)
+        if codes[row] != INVALID_TYPE:
+            cc_type = get_card_type(number)
+            if cc_type not in type_ids:
+                type_ids[cc_type] = len(type_names)
+                type_names.append(cc_type)
+            types[row] = type_ids[cc_type]
+
+    # expirations
+    now = datetime.now()
+    month_values, month_index = unique_values(months)
+    year_values, year_index = unique_values(years)
+    month = parse_ints(month_values, 1, 12)[month_index]
+    year = parse_ints(year_values, 1, 9999)[year_index]
+    expires = year.astype(numpy.int64) * 12 + month
+    current = now.year * 12 + now.month
+    this_month = now < datetime(now.year, now.month, calendar.monthrange(now.year, now.month)[1], 23, 59, 59, 59)
+    expiry = numpy.where((month == 0) | (year == 0), INVALID_EXP,
+                         numpy.where((expires > current) | ((expires == current) & this_month), VALID, EXPIRED))
+    codes = numpy.where(codes == VALID, expiry, codes).astype(numpy.int8)
+
+    # cvvs, checked once per distinct cvv & card type
+    rows = numpy.flatnonzero(codes == VALID)
+    if strict and len(rows):
+        cvv_values, cvv_index = unique_values(numpy.asarray(cvvs)[rows])
+        keys, inverse = numpy.unique(cvv_index.astype(numpy.int64) * len(type_names) + types[rows], return_inverse=True)
+        key_codes = numpy.array([cvv_code(cvv_values[key // len(type_names)], type_names[key % len(type_names)]) for key in keys],
+                                dtype=numpy.int8)
+        codes[rows] = key_codes[inverse]
+
+    return codes
@@ -0,0 +1,169 @@
+from __future__ import absolute_import, unicode_literals
+
+import re
+import json
+import urllib
+import urlparse
+import itertools
+import threading
+import logging
+
+from .transport import Transport, default_transport
+from .utils import is_valid_cc
+from ..exceptions import RequestError
+
+logger = logging.getLogger(__name__)
+
+# request fields carrying card data or merchant credentials, for every gateway (lower case)
+SENSITIVE_FIELDS = frozenset([
+    'x_card_num', 'x_exp_date', 'x_card_code', 'x_login', 'x_tran_key',  # AuthorizeNet
+    'card-number', 'card-exp', 'card-cvv', 'publisher-password',  # PlugnPay
+    'acct', 'expdate', 'cvv2', 'user', 'pwd', 'signature',  # PaypalWPP
+    'umcard', 'umexpir', 'umcvv2', 'umkey',  # USAePay
+    'ccnumber', 'month', 'year', 'ccidentifier1', 'username', 'pw',  # InnovativeGW
+    'cardnumber', 'cardexpmonth', 'cardexpyear', 'cvmvalue', 'configfile',  # FirstDataLegacy
+    'card[number]', 'card[exp_month]', 'card[exp_year]', 'card[cvc]',  # Stripe
+])
+
+SENSITIVE_HEADERS = frozenset(['authorization'])
+
+FORM_FIELD_RE = re.compile(r'(^|[?&])([^=&?]+)=([^&]*)')
+XML_ELEMENT_RE = re.compile(r'<([\w:-]+)>([^<]*)</\1>')
+DIGITS_RE = re.compile(r'(?<!\d)\d{13,19}(?!\d)')
+
+
+def mask(value):
+    return 'X' * len(value)
+
+
+def sanitize(text, fields=SENSITIVE_FIELDS):
+    """
+    Masks card data & credentials in a request or response: the values of `fields` in
+    form-encoded pairs & XML elements, and any number that passes the Luhn check (all
+    but its last 4 digits). Lengths are kept so recorded traffic keeps its shape.
+    """
+    if not text:
+        return text
+
+    def form_field(match):
+        if urllib.unquote_plus(match.group(2)).lower() in fields:
+            return '%s%s=%s' % (match.group(1), match.group(2), mask(match.group(3)))
+        return match.group(0)
+
+    def xml_element(match):
+        if match.group(1).lower() in fields:
+            return '<{0}>{1}</{0}>'.format(match.group(1), mask(match.group(2)))
+        return match.group(0)
+
+    def card_number(match):
+        number = match.group(0)
+        if is_valid_cc(number):
+            return mask(number[:-4]) + number[-4:]
+        return number
+
+    if '=' in text:
+        text = FORM_FIELD_RE.sub(form_field, text)
+    if '<' in text:
+        text = XML_ELEMENT_RE.sub(xml_element, text)
+    return DIGITS_RE.sub(card_number, text)
+
+
+def sanitize_headers(headers):
+    return dict((key, mask(value) if key.lower() in SENSITIVE_HEADERS else value) for key, value in (headers or {}).items())
+
+
+def endpoint(url):
+    """
+    The url without its query, what replayed requests are matched on by default
+    """
+    parts = urlparse.urlsplit(url)
+    return urlparse.urlunsplit((parts.scheme, parts.netloc, parts.path, '', ''))
+
+
+class RecordingTransport(Transport):
+    """
+    Sends through `transport` (the default one when not given) & appends every request with its
+    response to the cassette at `path`, one JSON object per line, run through `sanitize` first.
+    Requests that fail are recorded with their error, so replaying them fails the same way.
+    """
+    def __init__(self, path, transport=None, sanitize=sanitize):
+        self.path = path
+        self.transport = transport
+        self.sanitize = sanitize
+        self._lock = threading.Lock()
+
+    def send(self, method, url, body=None, headers=None, **connection_kwargs):
+        interaction = {
+            'method': method,
+            'url': self.sanitize(url),
+            'body': self.sanitize(body),
+            'headers': sanitize_headers(headers),
+        }
+        transport = self.transport or default_transport
+        try:
+            status, response = transport.send(method, url, body, headers, **connection_kwargs)
+        except RequestError, e:
+            interaction['error'] = '%s' % e
+            self.record(interaction)
+            raise
+
+        interaction['status'] = status
+        interaction['response'] = self.sanitize(response)
+        self.record(interaction)
+        return status, response
+
+    def record(self, interaction):
+        line = json.dumps(interaction, sort_keys=True)
+        with self._lock:
+            with open(self.path, 'a') as cassette:
+                cassette.write(line + '\n')
+
+
+def load_cassette(path):
+    """
+    The interactions recorded in the cassette at `path`, as dicts
+    """
+    with open(path) as cassette:
+        return [json.loads(line) for line in cassette if line.strip()]
+
+
+class ReplayTransport(Transport):
+    """
+    Answers requests from a cassette loaded in memory, never touching the network. Requests are
+    matched by method & url without its query, cycling through the responses recorded for it, or
+    with match='request' by their sanitized url & body as well. A request without a recording
+    raises RequestError.
+    """
+    def __init__(self, path, match='endpoint', sanitize=sanitize):
+        if match not in ('endpoint', 'request'):
+            raise ValueError("match should be 'endpoint' or 'request', not %r" % match)
+        self.match = match
+        self.sanitize = sanitize
+        self.interactions = load_cassette(path)
+        self.last_request = None
+        self.last_response = None
+
+        recorded = {}
+        for interaction in self.interactions:
+            recorded.setdefault(self.key(interaction['method'], interaction['url'], interaction['body']), []).append(interaction)
+        self.index = dict((key, itertools.cycle(interactions)) for key, interactions in recorded.items())
+
+    def key(self, method, url, body):
+        if self.match == 'endpoint':
+            return method, endpoint(url)
+        return method, url, body
+
+    def send(self, method, url, body=None, headers=None, **connection_kwargs):
+        self.last_request = (method, url, body, headers, connection_kwargs)
+        if self.match == 'request':
+            url, body = self.sanitize(url), self.sanitize(body)
+
+        try:
+            interaction = next(self.index[self.key(method, url, body)])
+        except KeyError:
+            raise RequestError("No recorded response for %s %s" % (method, endpoint(url)))
+
+        if 'error' in interaction:
+            raise RequestError(interaction['error'])
+        self.last_response = (interaction['status'], interaction['response'])
+        return self.last_response
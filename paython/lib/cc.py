@@ -2,6 +2,7 @@ from __future__ import absolute_import, unicode_literals
 
 from ..exceptions import DataValidationError
 from ..lib.utils import get_card_type, get_card_exp, is_valid_exp, is_valid_cc, is_valid_cvv
+from ..lib.utils import MESSAGES, INVALID_TYPE, INVALID_NUMBER, EXPIRED, INVALID_CVV
 
 
 class CreditCard(object):
@@ -65,16 +66,16 @@ class CreditCard(object):
         """
         cc_type = get_card_type(self.number)
         if not cc_type:
-            raise DataValidationError("The credit card number provided is not a valid card type")
+            raise DataValidationError(MESSAGES[INVALID_TYPE])
 
         if not is_valid_cc(self.number):
-            raise DataValidationError("The credit card number provided does not pass luhn validation")
+            raise DataValidationError(MESSAGES[INVALID_NUMBER])
 
         if not is_valid_exp(self.exp_month, self.exp_year):
-            raise DataValidationError("The credit card expiration provided is not in the future")
+            raise DataValidationError(MESSAGES[EXPIRED])
 
         if self.strict:
-            if not is_valid_cvv(self.verification_value, cc_type):
-                raise DataValidationError("The credit card cvv is not valid")
+            if self.verification_value is None or not is_valid_cvv(self.verification_value, cc_type):
+                raise DataValidationError(MESSAGES[INVALID_CVV])
 
         return True
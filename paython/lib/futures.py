@@ -0,0 +1,200 @@
+from __future__ import absolute_import, unicode_literals
+
+import sys
+import Queue
+import threading
+import logging
+
+from ..exceptions import TimeoutError, CancelledError
+
+logger = logging.getLogger(__name__)
+
+
+class Future(object):
+    """
+    Result of a gateway call running in the background. Mirrors the concurrent.futures API
+    (result, exception, done, cancel, add_done_callback) so it can be handed to code expecting one.
+    """
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._done = False
+        self._running = False
+        self._cancelled = False
+        self._result = None
+        self._exc_info = None
+        self._callbacks = []
+
+    def __repr__(self):
+        if not self._done:
+            return '<Future -- running>' if self._running else '<Future -- pending>'
+        if self._cancelled:
+            return '<Future -- cancelled>'
+        if self._exc_info:
+            return '<Future -- raised {0}>'.format(self._exc_info[0].__name__)
+        return '<Future -- finished>'
+
+    def done(self):
+        return self._done
+
+    def cancelled(self):
+        return self._cancelled
+
+    def cancel(self):
+        """
+        Cancels the call if it hasn't started running, returns whether it is cancelled
+        """
+        with self._condition:
+            if self._running or (self._done and not self._cancelled):
+                return False
+            if self._cancelled:
+                return True
+            self._cancelled = True
+        self._finish(exc_info=(CancelledError, CancelledError("Gateway call was cancelled"), None))
+        return True
+
+    def set_running(self):
+        """
+        Marks the call as started, False if it was cancelled & shouldn't run
+        """
+        with self._condition:
+            if self._cancelled:
+                return False
+            self._running = True
+            return True
+
+    def _wait(self, timeout):
+        with self._condition:
+            if not self._done:
+                self._condition.wait(timeout)
+            if not self._done:
+                raise TimeoutError("Gateway call did not finish in %s seconds" % timeout)
+
+    def result(self, timeout=None):
+        """
+        Waits for the call and returns its result, re-raising its exception if it failed
+        """
+        self._wait(timeout)
+        if self._exc_info:
+            raise self._exc_info[0], self._exc_info[1], self._exc_info[2]
+        return self._result
+
+    def exception(self, timeout=None):
+        """
+        Waits for the call and returns the exception it raised, None if it succeeded
+        """
+        self._wait(timeout)
+        if self._exc_info:
+            return self._exc_info[1]
+        return None
+
+    def add_done_callback(self, callback):
+        """
+        Calls callback(future) once the call is finished, right away if it already is
+        """
+        with self._condition:
+            if not self._done:
+                self._callbacks.append(callback)
+                return
+        callback(self)
+
+    def _finish(self, result=None, exc_info=None):
+        with self._condition:
+            self._result = result
+            self._exc_info = exc_info
+            self._done = True
+            self._condition.notify_all()
+            callbacks, self._callbacks = self._callbacks, []
+
+        for callback in callbacks:
+            try:
+                callback(self)
+            except Exception:
+                logger.exception("%s.%s._finish() -- Future callback raised", __name__, 'Future')
+
+    def set_result(self, result):
+        self._finish(result=result)
+
+    def set_exception(self, exc_info):
+        """
+        Finishes the future with the (type, value, traceback) tuple of sys.exc_info()
+        """
+        self._finish(exc_info=exc_info)
+
+
+class WorkerPool(object):
+    """
+    Bounded pool of worker threads running gateway calls. Threads are started as work
+    comes in, up to `max_workers`; further calls wait in the queue for a free worker.
+    The default matches the connection pool size so every worker keeps a warm connection.
+    """
+    def __init__(self, max_workers=10):
+        self.max_workers = max_workers
+        self._queue = Queue.Queue()
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Schedules fn(*args, **kwargs) and returns a Future of its result
+        """
+        future = Future()
+        self._queue.put((future, fn, args, kwargs))
+
+        with self._lock:
+            if len(self._threads) < self.max_workers:
+                thread = threading.Thread(target=self._work, name='paython-worker-%s' % len(self._threads))
+                thread.daemon = True
+                thread.start()
+                self._threads.append(thread)
+
+        return future
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            future, fn, args, kwargs = item
+            if not future.set_running():
+                continue
+            try:
+                result = fn(*args, **kwargs)
+            except Exception:
+                future.set_exception(sys.exc_info())
+            else:
+                future.set_result(result)
+
+    def shutdown(self, wait=True):
+        """
+        Stops the workers once the queued calls are done
+        """
+        with self._lock:
+            threads, self._threads = self._threads, []
+
+        for thread in threads:
+            self._queue.put(None)
+
+        if wait:
+            for thread in threads:
+                thread.join()
+
+
+def as_completed(futures, timeout=None):
+    """
+    Yields the futures as they finish, whatever order they were submitted in
+    """
+    finished = Queue.Queue()
+    futures = list(futures)
+    for future in futures:
+        future.add_done_callback(finished.put)
+
+    for i in range(len(futures)):
+        try:
+            yield finished.get(timeout=timeout)
+        except Queue.Empty:
+            raise TimeoutError("%s gateway calls did not finish in %s seconds" % (len(futures) - i, timeout))
+
+
+# runs the gateways' *_async calls
+worker_pool = WorkerPool()
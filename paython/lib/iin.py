@@ -0,0 +1,144 @@
+from __future__ import absolute_import, unicode_literals
+
+import io
+import os
+import re
+import threading
+
+from bisect import bisect_right
+
+PREFIX_DIGITS = 8  # IINs are up to 8 digits long, ranges are compared on that many leading digits
+
+DEFAULT_RANGES = os.path.join(os.path.dirname(__file__), 'iin_ranges.txt')
+
+BLOCK_DIGITS = 4  # leading digits of the direct lookup, blocks split between ranges fall back to the bisect
+BLOCK_SIZE = 10 ** (PREFIX_DIGITS - BLOCK_DIGITS)
+
+# what a number with that many digits is multiplied by to compare its prefix with the ranges
+SCALES = [10 ** (PREFIX_DIGITS - digits) for digits in range(PREFIX_DIGITS + 1)]
+
+DIGITS_RE = re.compile(r'[0-9]+\Z')
+
+
+def parse_lengths(spec):
+    """
+    frozenset of card number lengths from '13,16,19' or '16-19'
+    """
+    lengths = set()
+    for item in spec.split(','):
+        low, sep, high = item.partition('-')
+        lengths.update(range(int(low), int(high if sep else low) + 1))
+    return frozenset(lengths)
+
+
+def parse_range(brand, start, end, lengths):
+    end = end or start
+    if not (DIGITS_RE.match(start) and DIGITS_RE.match(end)) or len(start) != len(end) or len(start) > PREFIX_DIGITS or start > end:
+        raise ValueError("invalid IIN range %s-%s" % (start, end))
+    scale = 10 ** (PREFIX_DIGITS - len(start))
+    return len(start), int(start) * scale, (int(end) + 1) * scale - 1, brand, frozenset(lengths)
+
+
+class IINTable(object):
+    """
+    Card brands by IIN (the leading digits of a card number). Ranges of prefixes are flattened into
+    sorted disjoint intervals of PREFIX_DIGITS digit numbers, where ranges overlap the longest prefix
+    (or the last one added) wins. A brand is found with a single dict lookup on the BLOCK_DIGITS leading
+    digits, or a bisect of the intervals when those are split between ranges. A number only gets a
+    brand when its length is one of the brand's.
+    """
+    def __init__(self, path=None):
+        self.ranges = []
+        self.index = ((), ())
+        self.blocks = {}
+        self._lock = threading.Lock()
+        if path:
+            self.load(path)
+
+    def add(self, brand, start, end=None, lengths=()):
+        """
+        Adds the prefixes from `start` to `end` (same number of digits, e.g. '2221' & '2720') to `brand`
+        """
+        with self._lock:
+            self.ranges.append(parse_range(brand, start, end, lengths))
+            self.build()
+
+    def load(self, path):
+        """
+        Adds the ranges in the data file at `path`, lines of: brand, lengths & prefixes, see iin_ranges.txt
+        """
+        ranges = []
+        with io.open(path, encoding='utf-8') as data:
+            for number, line in enumerate(data, 1):
+                line = line.partition('#')[0].split()
+                if not line:
+                    continue
+                if len(line) < 3:
+                    raise ValueError("%s:%d: expected a brand, its lengths & prefixes" % (path, number))
+                brand, lengths = line[0], parse_lengths(line[1])
+                for prefix in line[2:]:
+                    start, sep, end = prefix.partition('-')
+                    ranges.append(parse_range(brand, start, end, lengths))
+        with self._lock:
+            self.ranges.extend(ranges)
+            self.build()
+
+    def build(self):
+        # splits the number line wherever a range starts or ends & keeps the most specific range in each piece
+        points = sorted(set([low for digits, low, high, brand, lengths in self.ranges] +
+                            [high + 1 for digits, low, high, brand, lengths in self.ranges]))
+        starts, entries = [], []  # entries are (last prefix, brand, lengths)
+        for low, high in zip(points, points[1:]):
+            covering = None
+            for i, entry in enumerate(self.ranges):
+                if entry[1] <= low <= entry[2] and (covering is None or (entry[0], i) >= covering[0]):
+                    covering = ((entry[0], i), entry)
+            if covering is None:
+                continue
+            entry = covering[1]
+            if entries and entries[-1][0] == low - 1 and entries[-1][1:] == entry[3:]:
+                entries[-1] = (high - 1,) + entries[-1][1:]
+            else:
+                starts.append(low)
+                entries.append((high - 1, entry[3], entry[4]))
+        # entries for the BLOCK_DIGITS leading digits, None for blocks with more than one entry (or gaps)
+        blocks = {}
+        for start, entry in zip(starts, entries):
+            first, last = start // BLOCK_SIZE, entry[0] // BLOCK_SIZE
+            for block in xrange(first, last + 1):
+                whole = block * BLOCK_SIZE >= start and (block + 1) * BLOCK_SIZE - 1 <= entry[0]
+                key = '%0*d' % (BLOCK_DIGITS, block)
+                blocks[key] = entry[1:] if whole and key not in blocks else None
+
+        self.index = (starts, entries)
+        self.blocks = blocks
+
+    def brand(self, number):
+        """
+        Brand of a card number, None when it isn't all digits or no range with its length has its prefix
+        """
+        if not DIGITS_RE.match(number):
+            return None
+        length = len(number)
+        try:
+            brand, lengths = self.blocks[number[:BLOCK_DIGITS]]
+        except KeyError:
+            return None
+        except TypeError:  # a block split between ranges, or a number shorter than a block
+            starts, entries = self.index
+            key = int(number[:PREFIX_DIGITS]) if length >= PREFIX_DIGITS else int(number) * SCALES[length]
+            i = bisect_right(starts, key) - 1
+            if i < 0:
+                return None
+            end, brand, lengths = entries[i]
+            if key > end:
+                return None
+        if length in lengths:
+            return brand
+
+    @property
+    def brands(self):
+        return sorted(set(brand for digits, low, high, brand, lengths in self.ranges))
+
+
+iin_table = IINTable(DEFAULT_RANGES)
@@ -0,0 +1,225 @@
+from __future__ import absolute_import, unicode_literals
+
+import math
+import threading
+import logging
+
+from .timing import add_timing_hook, remove_timing_hook
+
+logger = logging.getLogger(__name__)
+
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+
+class LatencyHistogram(object):
+    """
+    HDR style latency histogram: values are counted in microsecond buckets whose width grows with
+    the value, so any latency from 1us to hours is kept within 1/`precision` of its value in a
+    few hundred counters at most. Values are recorded & reported in float seconds.
+    """
+    def __init__(self, precision=64):
+        self.precision = precision  # buckets per power of two, a power of two itself
+        self.bits = math.frexp(precision)[1]
+        self.buckets = {}  # bucket index ==> count
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def _index(self, micros):
+        magnitude = max(0, math.frexp(micros)[1] - self.bits)
+        return magnitude * self.precision + (micros >> magnitude)
+
+    def _value(self, index):
+        """
+        Highest value in seconds counted in bucket `index`
+        """
+        magnitude = max(0, index // self.precision - 1)
+        lowest = (index - magnitude * self.precision) << magnitude
+        return (lowest + (1 << magnitude) - 1) / 1e6
+
+    def record(self, seconds):
+        micros = max(0, int(seconds * 1e6))
+        index = self._index(micros)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.sum += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other):
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.sum += other.sum
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, quantile):
+        """
+        Latency under which `quantile` (0.99 for p99) of the values fall, None when empty
+        """
+        if not self.count:
+            return None
+        rank = max(1, int(math.ceil(quantile * self.count)))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(max(self._value(index), self.min), self.max)
+        return self.max
+
+    def __repr__(self):
+        return '<LatencyHistogram -- {0} values, p50: {1}, p99: {2}>'.format(self.count, self.percentile(0.5), self.percentile(0.99))
+
+
+def outcome(response, error):
+    """
+    'error' for a transaction that raised or whose response has no approval status, 'approved' or 'declined' otherwise
+    """
+    if error is not None:
+        return 'error'
+    approved = response.get('approved') if hasattr(response, 'get') else None
+    if approved is None:
+        return 'error'
+    return 'approved' if approved else 'declined'
+
+
+def escape_label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class GatewayMetrics(object):
+    """
+    Latency histograms & transaction counts per (gateway class, operation, outcome), fed by the
+    timings of every transaction once install()ed:
+
+        gateway_metrics.install()
+        ...
+        print gateway_metrics.prometheus()
+    """
+    def __init__(self, precision=64):
+        self.precision = precision
+        self.histograms = {}  # (gateway, operation, outcome) ==> LatencyHistogram
+        self._lock = threading.Lock()
+
+    def install(self):
+        add_timing_hook(self.timing_hook)
+
+    def uninstall(self):
+        remove_timing_hook(self.timing_hook)
+
+    def timing_hook(self, gateway, operation, timings, response, error):
+        self.record(type(gateway).__name__, operation, outcome(response, error), timings.total)
+
+    def record(self, gateway, operation, outcome, seconds):
+        key = (gateway, operation, outcome)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = LatencyHistogram(self.precision)
+            histogram.record(seconds)
+
+    def histogram(self, gateway=None, operation=None, outcome=None):
+        """
+        Histogram of the transactions matching the arguments given, all of them merged
+        """
+        merged = LatencyHistogram(self.precision)
+        with self._lock:
+            for key, histogram in self.histograms.items():
+                if all(wanted is None or wanted == value for wanted, value in zip((gateway, operation, outcome), key)):
+                    merged.merge(histogram)
+        return merged
+
+    def reset(self):
+        with self._lock:
+            self.histograms = {}
+
+    def snapshot(self):
+        """
+        List of dicts, one per (gateway, operation, outcome), with the count, sum, min, max & quantiles
+        """
+        with self._lock:
+            items = [(key, histogram.count, histogram.sum, histogram.min, histogram.max,
+                      [histogram.percentile(quantile) for quantile in QUANTILES])
+                     for key, histogram in sorted(self.histograms.items())]
+
+        snapshot = []
+        for (gateway, operation, outcome), count, total, low, high, percentiles in items:
+            series = dict(gateway=gateway, operation=operation, outcome=outcome, count=count, sum=total, min=low, max=high)
+            for quantile, value in zip(QUANTILES, percentiles):
+                series['p%s' % ('%g' % (quantile * 100)).replace('.', '')] = value
+            snapshot.append(series)
+        return snapshot
+
+    def export(self, callback):
+        """
+        Hands the snapshot() to `callback`
+        """
+        callback(self.snapshot())
+
+    def prometheus(self, prefix='paython_gateway'):
+        """
+        Metrics in the Prometheus text exposition format: a latency summary & a transaction counter
+        """
+        with self._lock:
+            items = [(key, histogram.count, histogram.sum, [(quantile, histogram.percentile(quantile)) for quantile in QUANTILES])
+                     for key, histogram in sorted(self.histograms.items())]
+
+        lines = [
+            '# HELP {0}_latency_seconds Gateway transaction latency.'.format(prefix),
+            '# TYPE {0}_latency_seconds summary'.format(prefix),
+        ]
+        counters = [
+            '# HELP {0}_transactions_total Gateway transactions sent.'.format(prefix),
+            '# TYPE {0}_transactions_total counter'.format(prefix),
+        ]
+        for key, count, total, percentiles in items:
+            labels = 'gateway="{0}",operation="{1}",outcome="{2}"'.format(*[escape_label(value) for value in key])
+            for quantile, value in percentiles:
+                lines.append('{0}_latency_seconds{{{1},quantile="{2}"}} {3!r}'.format(prefix, labels, quantile, value))
+            lines.append('{0}_latency_seconds_sum{{{1}}} {2!r}'.format(prefix, labels, total))
+            lines.append('{0}_latency_seconds_count{{{1}}} {2}'.format(prefix, labels, count))
+            counters.append('{0}_transactions_total{{{1}}} {2}'.format(prefix, labels, count))
+
+        return '\n'.join(lines + counters) + '\n'
+
+
+class PeriodicExporter(object):
+    """
+    Calls `metrics.export(callback)` every `interval` seconds from a daemon thread until stop()ped
+    """
+    def __init__(self, metrics, callback, interval=60):
+        self.metrics = metrics
+        self.callback = callback
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self.run, name='paython-metrics-exporter')
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def run(self):
+        while not self._stopped.wait(self.interval) and not self._stopped.is_set():
+            try:
+                self.metrics.export(self.callback)
+            except Exception:
+                logger.exception("%s.%s.run() -- Metrics export failed", __name__, 'PeriodicExporter')
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+# metrics kept for every gateway once installed
+gateway_metrics = GatewayMetrics()
@@ -0,0 +1,277 @@
+from __future__ import absolute_import, unicode_literals
+
+import time
+import select
+import urlparse
+import socket
+import httplib
+import threading
+import logging
+
+from .timing import lap
+from ..exceptions import RequestError
+
+logger = logging.getLogger(__name__)
+
+
+def is_connection_dropped(connection):
+    """
+    Health check for an idle keep-alive connection. An idle socket should have nothing to
+    read; if it is readable the server either closed it or sent something we didn't ask for.
+    """
+    sock = getattr(connection, 'sock', None)
+    if sock is None:
+        return True
+
+    try:
+        readable = select.select([sock], [], [], 0.0)[0]
+    except (select.error, socket.error, ValueError):
+        return True
+
+    return bool(readable)
+
+
+def is_closed_without_status(error):
+    """
+    Whether a BadStatusLine is the server closing the connection before sending anything, older
+    httplib releases report the empty line, newer ones a message in its place
+    """
+    return error.line in ('', "''") or error.line.startswith('No status line received')
+
+
+class ConnectionPool(object):
+    """
+    Pool of keep-alive HTTP/1.1 connections to a single gateway host.
+
+    Connections are checked out for one request/response cycle and put back once the
+    response has been read in full. Idle connections older than `idle_timeout` seconds,
+    or failing the health check, are closed instead of being reused. At most `maxsize`
+    idle connections are kept around; when they are all busy a new one is opened and
+    discarded afterwards if the pool is already full.
+    """
+    SCHEMES = {
+        'http': httplib.HTTPConnection,
+        'https': httplib.HTTPSConnection,
+    }
+
+    def __init__(self, host, port=None, scheme='https', maxsize=10, idle_timeout=30, connect_timeout=None, read_timeout=None, **connection_kwargs):
+        """
+        - host: gateway hostname
+        - port: gateway port, defaults to the scheme's default port
+        - scheme: 'http' or 'https'
+        - maxsize: maximum number of idle connections kept open
+        - idle_timeout: seconds an idle connection may be reused after its last request
+        - connect_timeout: seconds allowed to open the connection (including the TLS handshake)
+        - read_timeout: seconds allowed for each socket read/write once connected
+        - connection_kwargs: passed on to the httplib connection (key_file, cert_file, ...)
+        """
+        if scheme not in self.SCHEMES:
+            raise RequestError("Unsupported scheme '%s' for connection pool" % scheme)
+
+        self.host = host
+        self.port = int(port) if port else None
+        self.scheme = scheme
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.connection_kwargs = connection_kwargs
+
+        self._idle = []  # stack of (connection, last used time), warmest on top
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return '<ConnectionPool -- {0.scheme}://{0.host}:{0.port}, idle: {1}>'.format(self, len(self._idle))
+
+    def new_connection(self):
+        """
+        Opens a new connection to the pool's host
+        """
+        logger.debug("%s.%s.new_connection() -- Opening connection to %s://%s", __name__, 'ConnectionPool', self.scheme, self.host)
+        connection = self.SCHEMES[self.scheme](self.host, self.port, timeout=self.connect_timeout, **self.connection_kwargs)
+        try:
+            connection.connect()
+        except socket.error, e:
+            raise RequestError("Unable to connect to %s: %s" % (self.host, e))
+
+        connection.sock.settimeout(self.read_timeout)
+        return connection
+
+    def get_connection(self):
+        """
+        Returns a (connection, reused) tuple, reusing the warmest healthy idle connection if any
+        """
+        now = time.time()
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                connection, last_used = self._idle.pop()
+
+            if now - last_used > self.idle_timeout or is_connection_dropped(connection):
+                connection.close()
+                continue
+
+            return connection, True
+
+        return self.new_connection(), False
+
+    def put_connection(self, connection):
+        """
+        Returns a connection to the pool, closing it if the pool is already full
+        """
+        with self._lock:
+            if len(self._idle) < self.maxsize:
+                self._idle.append((connection, time.time()))
+                return
+
+        connection.close()
+
+    def clear(self):
+        """
+        Closes every idle connection
+        """
+        with self._lock:
+            idle, self._idle = self._idle, []
+
+        for connection, last_used in idle:
+            connection.close()
+
+    def resend(self, connection, method, url, body, headers):
+        """
+        Sends a request again on a fresh connection, after a reused one turned out to be stale
+        """
+        connection.close()
+        logger.debug("%s.%s.urlopen() -- Stale connection to %s, reconnecting", __name__, 'ConnectionPool', self.host)
+        lap('wait')
+        connection = self.new_connection()
+        lap('connect')
+        connection.request(method, url, body, headers)
+        lap('send')
+        return connection
+
+    def urlopen(self, method, url, body=None, headers=None):
+        """
+        Sends a request over a pooled connection and returns (status, response body).
+
+        A reused connection the server closed while idle either fails sending the request or
+        is closed with no status line at all; only then is the request retried, once, on a fresh
+        connection. Anything else, timeouts & errors once the request was sent included, is
+        raised as RequestError so a transaction is never sent twice.
+        """
+        headers = headers or {}
+        connection, reused = self.get_connection()
+        lap('connect')
+
+        try:
+            try:
+                connection.request(method, url, body, headers)
+                lap('send')
+            except socket.timeout:
+                raise
+            except socket.error:
+                if not reused:
+                    raise
+                connection = self.resend(connection, method, url, body, headers)
+                reused = False
+
+            try:
+                response = connection.getresponse()
+            except httplib.BadStatusLine, e:
+                if not reused or not is_closed_without_status(e):
+                    raise
+                connection = self.resend(connection, method, url, body, headers)
+                response = connection.getresponse()
+            lap('wait')
+
+            data = response.read()
+            lap('read')
+        except (httplib.HTTPException, socket.error), e:
+            connection.close()
+            raise RequestError("Error making request to %s: %s" % (self.host, e))
+
+        if response.will_close:
+            connection.close()
+        else:
+            self.put_connection(connection)
+
+        return response.status, data
+
+
+class PoolManager(object):
+    """
+    Keeps one ConnectionPool per gateway host, shared by every gateway instance.
+    `host_maxsize` overrides `maxsize` for specific hosts, e.g. {'secure.authorize.net': 50}
+    """
+    def __init__(self, maxsize=10, idle_timeout=30, connect_timeout=10, read_timeout=60, host_maxsize=None):
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.host_maxsize = host_maxsize or {}
+        self.pools = {}
+        self._lock = threading.Lock()
+
+    def configure(self, **settings):
+        """
+        Changes pool settings (maxsize, idle_timeout, connect_timeout, read_timeout, host_maxsize),
+        applying them to the pools already created as well
+        """
+        for key, value in settings.items():
+            if not hasattr(self, key) or key == 'pools':
+                raise AttributeError("PoolManager has no '%s' setting" % key)
+            setattr(self, key, value)
+
+        with self._lock:
+            pools = self.pools.values()
+
+        for pool in pools:
+            pool.maxsize = self.host_maxsize.get(pool.host, self.maxsize)
+            pool.idle_timeout = self.idle_timeout
+            pool.connect_timeout = self.connect_timeout
+            pool.read_timeout = self.read_timeout
+
+    def connection_pool(self, host, port=None, scheme='https', **connection_kwargs):
+        """
+        Returns the pool for the given host, creating it on first use
+        """
+        key = (scheme, host, int(port) if port else None, tuple(sorted(connection_kwargs.items())))
+        with self._lock:
+            pool = self.pools.get(key)
+            if pool is None:
+                pool = ConnectionPool(host, port, scheme,
+                                      maxsize=self.host_maxsize.get(host, self.maxsize),
+                                      idle_timeout=self.idle_timeout,
+                                      connect_timeout=self.connect_timeout,
+                                      read_timeout=self.read_timeout,
+                                      **connection_kwargs)
+                self.pools[key] = pool
+
+        return pool
+
+    def urlopen(self, method, url, body=None, headers=None, **connection_kwargs):
+        """
+        Sends a request to an absolute url through the pool of its host, returns (status, response body)
+        """
+        parts = urlparse.urlsplit(url)
+        pool = self.connection_pool(parts.hostname, parts.port, parts.scheme, **connection_kwargs)
+
+        path = parts.path or '/'
+        if parts.query:
+            path = '%s?%s' % (path, parts.query)
+
+        return pool.urlopen(method, path, body, headers)
+
+    def clear(self):
+        """
+        Closes the idle connections of every pool
+        """
+        with self._lock:
+            pools = self.pools.values()
+
+        for pool in pools:
+            pool.clear()
+
+
+# pools shared across all gateways
+pool_manager = PoolManager()
@@ -0,0 +1,106 @@
+from __future__ import absolute_import, unicode_literals
+
+import os
+import sys
+import atexit
+import random
+import pstats
+import cProfile
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+_settings = {'fraction': 0.0}
+_stats = {'stats': None, 'transactions': 0}
+_lock = threading.Lock()
+
+
+def enable_profiling(fraction=1.0):
+    """
+    Runs `fraction` of the transactions (0.01 for 1 in 100) under cProfile, adding their stats to
+    the aggregated profile_stats(). Also switched on by the PAYTHON_PROFILE environment variable
+    holding the fraction, PAYTHON_PROFILE_OUTPUT naming a file the stats are dumped to at exit.
+    Only the thread running a sampled transaction is profiled.
+    """
+    _settings['fraction'] = max(0.0, min(1.0, float(fraction)))
+
+
+def disable_profiling():
+    _settings['fraction'] = 0.0
+
+
+def sample_profiler():
+    """
+    A cProfile.Profile to run the transaction starting with, None when it isn't sampled
+    """
+    fraction = _settings['fraction']
+    if fraction and (fraction >= 1.0 or random.random() < fraction):
+        return cProfile.Profile()
+    return None
+
+
+def collect_profile(profiler):
+    """
+    Adds the stats of a profiled transaction to the aggregated ones
+    """
+    with _lock:
+        if _stats['stats'] is None:
+            _stats['stats'] = pstats.Stats(profiler)
+        else:
+            _stats['stats'].add(profiler)
+        _stats['transactions'] += 1
+
+
+def profile_stats():
+    """
+    (pstats.Stats of the profiled transactions, how many there were), the stats are None before the first one
+    """
+    return _stats['stats'], _stats['transactions']
+
+
+def reset_profile():
+    with _lock:
+        _stats['stats'] = None
+        _stats['transactions'] = 0
+
+
+def dump_profile(output=None, sort='cumulative', limit=40, restrict='paython'):
+    """
+    Writes the aggregated stats: to a file pstats/snakeviz/gprof2dot can load when `output` is a path,
+    as a report of the `limit` top functions by `sort`, filtered by the `restrict` regular expression,
+    to the stream `output` (stderr by default) otherwise
+    """
+    with _lock:
+        stats = _stats['stats']
+        transactions = _stats['transactions']
+        if stats is None:
+            return
+        if isinstance(output, basestring):
+            stats.dump_stats(output)
+            return
+
+        stream = output or sys.stderr
+        stream.write('Paython profile of %d transactions\n' % transactions)
+        stats.stream = stream
+        stats.sort_stats(sort)
+        restrictions = [restrict] if restrict else []
+        stats.print_stats(*(restrictions + [limit]))
+
+
+def configure_from_environment(environ=os.environ):
+    fraction = environ.get('PAYTHON_PROFILE')
+    if not fraction:
+        return
+    try:
+        enable_profiling(fraction)
+    except ValueError:
+        logger.warning("%s.configure_from_environment() -- PAYTHON_PROFILE should be a fraction, not %r", __name__, fraction)
+        return
+
+    output = environ.get('PAYTHON_PROFILE_OUTPUT')
+    if output:
+        atexit.register(dump_profile, output)
+
+
+configure_from_environment()
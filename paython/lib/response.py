@@ -0,0 +1,304 @@
+from __future__ import absolute_import, unicode_literals
+
+from .utils import parse_urlencoded
+from ..exceptions import GatewayError
+
+
+class GatewayResponse(object):
+    """
+    Standardized gateway response. The fields every gateway maps are kept in slots, anything
+    else a gateway returns goes to a dict created only when needed, so responses are small &
+    each one is a separate object that can be kept around.
+
+    Fields read as attributes (None when the gateway didn't send them) or through a dict view
+    kept for compatibility: response['trans_id'], response.get('avs_response'), dict(response).
+    `response_time` is a float number of seconds, the dict view formats it as the '0.00' string
+    responses used to carry.
+
+    A response can also keep the raw gateway response & a decoder (ColumnDecoder, URLEncodedDecoder)
+    decoding each field from it the first time the field is read, the decoded value is then stored
+    like any other. Listing the fields (keys(), dict(), ==, pickling) decodes them all & drops the raw
+    response, repr() shows only the fields decoded so far.
+
+    `timings` holds the lib.timing.Timings of the transaction that returned the response, it isn't
+    a field & isn't pickled.
+    """
+    FIELDS = ('approved', 'response_text', 'response_code', 'response_reason_code', 'trans_type', 'trans_id',
+              'alt_trans_id', 'auth_code', 'amount', 'avs_response', 'cvv_response', 'response_time')
+    FIELD_SET = frozenset(FIELDS)
+
+    __slots__ = FIELDS + ('timings', '_extra', '_source', '_decoder')
+
+    def __init__(self, fields=None, source=None, decoder=None, **kwargs):
+        self.timings = None
+        self._extra = None
+        self._source = source  # raw response, or whatever the decoder turned it into
+        self._decoder = decoder
+        if fields:
+            self.update(fields)
+        if kwargs:
+            self.update(kwargs)
+
+    def _stored(self, key):
+        """
+        Value stored for `key`, KeyError if there is none
+        """
+        if key in self.FIELD_SET:
+            try:
+                return object.__getattribute__(self, key)
+            except AttributeError:
+                raise KeyError(key)
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def _value(self, key):
+        """
+        Value of `key`, decoded from the raw response the first time it's read
+        """
+        try:
+            return self._stored(key)
+        except KeyError:
+            decoder = self._decoder
+            if decoder is None or key not in decoder.fields:
+                raise
+            value = decoder.decode(self, key)  # KeyError when the response doesn't have it
+            self[key] = value
+            return self._stored(key)
+
+    def __getattr__(self, name):
+        # only called for unset slots & names that aren't slots
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self._value(name)
+        except KeyError:
+            if name in GatewayResponse.FIELD_SET:
+                return None
+            raise AttributeError(name)
+
+    def __getitem__(self, key):
+        extra = self._extra
+        if extra is not None and key in extra:
+            return extra[key]
+        value = self._value(key)
+        if key == 'response_time' and value is not None:
+            return '%0.2f' % value
+        return value
+
+    def __setitem__(self, key, value):
+        if key in self.FIELD_SET:
+            if key == 'response_time' and value is not None:
+                value = float(value)
+            object.__setattr__(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        self.decode_all()  # or the decoder would bring it back
+        if key in self.FIELD_SET:
+            try:
+                object.__delattr__(self, key)
+            except AttributeError:
+                raise KeyError(key)
+        else:
+            if self._extra is None:
+                raise KeyError(key)
+            del self._extra[key]
+
+    def __contains__(self, key):
+        try:
+            self._value(key)
+        except KeyError:
+            return False
+        return True
+
+    def decode_all(self):
+        """
+        Decodes every field still in the raw response
+        """
+        decoder = self._decoder
+        if decoder is None:
+            return
+
+        decoded = decoder.decode_all(self)
+        self._decoder = self._source = None  # nothing left to decode, the raw response can go
+        extra = self._extra
+        for key, value in decoded.items():
+            # fields set or decoded already stay as they are
+            if key in self.FIELD_SET:
+                if not self._has_slot(key):
+                    object.__setattr__(self, key, value)
+            else:
+                if extra is None:
+                    extra = self._extra = {}
+                extra.setdefault(key, value)
+
+    def _has_slot(self, key):
+        try:
+            object.__getattribute__(self, key)
+        except AttributeError:
+            return False
+        return True
+
+    def keys(self):
+        self.decode_all()
+        keys = [key for key in self.FIELDS if self._has_slot(key)]
+        if self._extra:
+            keys.extend(self._extra)
+        return keys
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def values(self):
+        return [self[key] for key in self.keys()]
+
+    @classmethod
+    def is_slot(cls, field):
+        """
+        Whether set_columns() stores `field` straight in its slot
+        """
+        return field in cls.FIELD_SET and field != 'response_time'
+
+    def set_columns(self, columns, positions):
+        """
+        Sets fields from the columns of a delimited response. `positions` is a tuple of (index, field, is_slot)
+        sorted by index, a later column mapped to the same field overrides an earlier one.
+        """
+        count = len(columns)
+        extra = self._extra
+        for index, field, slot in positions:
+            if index >= count:
+                break
+            if slot:
+                setattr(self, field, columns[index])
+            else:
+                if extra is None:
+                    extra = self._extra = {}
+                extra[field] = columns[index]
+
+    def update(self, fields):
+        for key, value in fields.items():
+            self[key] = value
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __eq__(self, other):
+        if isinstance(other, (GatewayResponse, dict)):
+            return self.to_dict() == dict(other.items())
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __getstate__(self):
+        self.decode_all()
+        state = dict((key, getattr(self, key)) for key in self.FIELDS if key in self)
+        if self._extra:
+            state.update(self._extra)
+        return state
+
+    def __setstate__(self, state):
+        self.timings = self._extra = self._source = self._decoder = None
+        self.update(state)
+
+    def __repr__(self):
+        # only the fields decoded so far, decoding the others could raise
+        fields = dict((key, self[key]) for key in self.FIELDS if self._has_slot(key))
+        if self._extra:
+            fields.update(self._extra)
+        if self._decoder is None:
+            return '<GatewayResponse -- {0}>'.format(fields)
+        undecoded = len([field for field in self._decoder.fields if field not in fields])
+        return '<GatewayResponse -- {0} <{1} undecoded>>'.format(fields, undecoded)
+
+
+class ColumnDecoder(object):
+    """
+    Decodes the fields of a delimited response (AuthorizeNet), splitting the raw response only as far
+    as the column read. `positions` is an index table from lib.api.compile_positions().
+    """
+    def __init__(self, positions, delimiter):
+        self.positions = positions
+        self.delimiter = delimiter
+        self.indexes = {}  # field ==> its columns, last first as later columns win
+        for index, field, slot in positions:
+            self.indexes.setdefault(field, []).insert(0, index)
+        self.fields = frozenset(self.indexes)
+
+    def decode(self, response, field):
+        raw = response._source
+        for index in self.indexes[field]:
+            columns = raw.split(self.delimiter, index + 1)
+            if index < len(columns):
+                return columns[index]
+        raise KeyError(field)
+
+    def decode_all(self, response):
+        columns = response._source.split(self.delimiter)
+        count = len(columns)
+        return dict((field, columns[index]) for index, field, slot in self.positions if index < count)
+
+
+class URLEncodedDecoder(object):
+    """
+    Decodes the fields of a form-urlencoded response. The first field read decodes the keys of
+    `field_mapping` (gateway key ==> paython field) & `keys` in one pass, `derived` fields (paython
+    field ==> (gateway key, callable(decoded dict))) are computed from those when read, & are absent
+    when their gateway key is. A callable failing on a value it doesn't know raises GatewayError.
+    Other keyword arguments go to lib.utils.parse_urlencoded().
+    """
+    def __init__(self, field_mapping, derived=None, keys=(), **options):
+        self.sources = dict((field, key) for key, field in field_mapping.items())
+        self.derived = derived or {}
+        self.keys = frozenset(field_mapping) | frozenset(keys)
+        self.options = options
+        self.fields = frozenset(self.sources) | frozenset(self.derived)
+
+    def decoded(self, response):
+        values = response._source
+        if not isinstance(values, dict):
+            values = response._source = parse_urlencoded(values, keys=self.keys, **self.options)
+        return values
+
+    def source(self, field):
+        return self.derived[field][0] if field in self.derived else self.sources[field]
+
+    def decode(self, response, field):
+        values = self.decoded(response)
+        if field not in self.derived:
+            return values[self.sources[field]]
+        key, derive = self.derived[field]
+        if key not in values:
+            raise KeyError(field)
+        try:
+            return derive(values)
+        except KeyError, e:
+            raise GatewayError("Unknown value decoding '%s' from the response: %s" % (field, e))
+
+    def decode_all(self, response):
+        values = self.decoded(response)
+        decoded = {}
+        for field in self.fields:
+            if self.source(field) in values:
+                decoded[field] = self.decode(response, field)
+        return decoded
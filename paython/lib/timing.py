@@ -0,0 +1,143 @@
+from __future__ import absolute_import, unicode_literals
+
+import os
+import sys
+import time
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+# clock_gettime() clock ids for CLOCK_MONOTONIC
+MONOTONIC_CLOCKS = {'linux': 1, 'freebsd': 4, 'darwin': 6}
+
+
+def monotonic_clock():
+    """
+    A monotonic clock in float seconds, so the system clock being set (NTP steps...) doesn't show
+    up as latency or negative phases: time.monotonic() on Python 3, clock_gettime(CLOCK_MONOTONIC) through ctypes on
+    Python 2. Platforms without either get time.time(), which is wall clock time.
+    """
+    if hasattr(time, 'monotonic'):
+        return time.monotonic
+
+    platform = sys.platform.rstrip('0123456789')
+    try:
+        clock_id = MONOTONIC_CLOCKS[platform]
+        import ctypes
+        import ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or ctypes.util.find_library('rt'), use_errno=True)
+        clock_gettime = libc.clock_gettime
+    except (KeyError, ImportError, OSError, AttributeError):
+        logger.debug("%s.monotonic_clock() -- No monotonic clock on %s, timing with time.time()", __name__, sys.platform)
+        return time.time
+
+    class timespec(ctypes.Structure):
+        _fields_ = [('tv_sec', ctypes.c_long), ('tv_nsec', ctypes.c_long)]
+
+    clock_gettime.argtypes = [ctypes.c_int, ctypes.POINTER(timespec)]
+
+    def monotonic():
+        spec = timespec()
+        if clock_gettime(clock_id, ctypes.byref(spec)):
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        return spec.tv_sec + spec.tv_nsec * 1e-9
+
+    try:
+        monotonic()
+    except OSError:
+        return time.time
+    return monotonic
+
+
+clock = monotonic_clock()
+
+_local = threading.local()
+_hooks = []
+
+
+class Timings(object):
+    """
+    Time a transaction spent in each phase, in float seconds:
+
+        build    translating the call & building the request body
+        connect  getting a connection, connecting when none was idle: DNS lookup, TCP
+                 & TLS handshakes are all in here, httplib does them in one connect()
+        send     writing the request
+        wait     waiting for the gateway to answer (all of the transport time when
+                 the transport doesn't report its own phases)
+        read     reading the response body
+        parse    parsing & standardizing the response
+
+    Each lap() charges the time since the previous one to a phase.
+    """
+    PHASES = ('build', 'connect', 'send', 'wait', 'read', 'parse')
+
+    __slots__ = PHASES + ('started', '_last')
+
+    def __init__(self):
+        self.build = self.connect = self.send = self.wait = self.read = self.parse = 0.0
+        self.started = self._last = clock()
+
+    def lap(self, phase):
+        now = clock()
+        setattr(self, phase, getattr(self, phase) + now - self._last)
+        self._last = now
+
+    @property
+    def total(self):
+        return self._last - self.started
+
+    def as_dict(self):
+        return dict((phase, getattr(self, phase)) for phase in self.PHASES)
+
+    def __repr__(self):
+        return '<Timings -- {0}>'.format(', '.join('%s: %0.4fs' % (phase, getattr(self, phase)) for phase in self.PHASES))
+
+
+def current_timings():
+    """
+    Timings of the transaction running in the current thread, None outside of one
+    """
+    return getattr(_local, 'timings', None)
+
+
+def lap(phase):
+    """
+    Charges the time since the last lap to `phase` of the current transaction, if there is one
+    """
+    timings = getattr(_local, 'timings', None)
+    if timings is not None:
+        timings.lap(phase)
+
+
+def start_timings():
+    timings = _local.timings = Timings()
+    return timings
+
+
+def stop_timings():
+    _local.timings = None
+
+
+def add_timing_hook(hook):
+    """
+    Registers `hook(gateway, operation, timings, response, error)`, called after every transaction
+    with its Timings & either the response or the exception it raised
+    """
+    if hook not in _hooks:
+        _hooks.append(hook)
+
+
+def remove_timing_hook(hook):
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+def run_timing_hooks(gateway, operation, timings, response, error):
+    for hook in list(_hooks):
+        try:
+            hook(gateway, operation, timings, response, error)
+        except Exception:
+            logger.exception("%s.run_timing_hooks() -- Timing hook %r failed", __name__, hook)
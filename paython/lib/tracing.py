@@ -0,0 +1,73 @@
+from __future__ import absolute_import, unicode_literals
+
+import sys
+import logging
+
+from functools import wraps
+
+logger = logging.getLogger(__name__)
+
+_tracers = []
+
+
+def add_tracer(start, finish=None):
+    """
+    Registers a tracer: `start(gateway, stage, name)` is called when a traced gateway method begins
+    & returns a span (anything), `finish(span, error)` gets it back when the method is done, with the
+    exception it raised if any. Stages are 'transaction' (auth, settle...), 'translate' (use_credit_card,
+    set_billing_info...), 'request', 'send' (the transport call inside request) & 'parse'.
+    """
+    tracer = (start, finish)
+    if tracer not in _tracers:
+        _tracers.append(tracer)
+
+
+def remove_tracer(start, finish=None):
+    tracer = (start, finish)
+    if tracer in _tracers:
+        _tracers.remove(tracer)
+
+
+def start_spans(gateway, stage, name):
+    spans = []
+    for start, finish in list(_tracers):
+        try:
+            spans.append((finish, start(gateway, stage, name)))
+        except Exception:
+            logger.exception("%s.start_spans() -- Tracer %r failed", __name__, start)
+    return spans
+
+
+def finish_spans(spans, error):
+    for finish, span in reversed(spans):
+        if finish is None:
+            continue
+        try:
+            finish(span, error)
+        except Exception:
+            logger.exception("%s.finish_spans() -- Tracer %r failed", __name__, finish)
+
+
+def traced(stage, method):
+    """
+    Wraps a gateway method so registered tracers see it as a span of `stage`
+    """
+    name = method.__name__
+
+    @wraps(method)
+    def run_traced(self, *args, **kwargs):
+        if not _tracers:
+            return method(self, *args, **kwargs)
+
+        spans = start_spans(self, stage, name)
+        error = None
+        try:
+            return method(self, *args, **kwargs)
+        except Exception:
+            error = sys.exc_info()[1]
+            raise
+        finally:
+            finish_spans(spans, error)
+
+    run_traced.__wrapped__ = method
+    return run_traced
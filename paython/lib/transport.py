@@ -0,0 +1,85 @@
+from __future__ import absolute_import, unicode_literals
+
+import urlparse
+import logging
+
+from .pool import pool_manager
+
+logger = logging.getLogger(__name__)
+
+
+class Transport(object):
+    """
+    Sends the raw gateway request and hands back the raw response. Every gateway base class
+    in lib.api talks to the wire through one, so swapping it changes how all gateways send.
+    """
+    def send(self, method, url, body=None, headers=None, **connection_kwargs):
+        """
+        Sends `body` to the absolute `url` and returns (status, response body).
+        `connection_kwargs` carries per-connection settings such as key_file and cert_file.
+        Should raise RequestError when the gateway can't be reached.
+        """
+        raise NotImplementedError
+
+
+class PooledTransport(Transport):
+    """
+    Default transport, keeps warm keep-alive connections per gateway host (see lib.pool)
+    """
+    def __init__(self, manager=None):
+        self.manager = manager or pool_manager
+
+    def send(self, method, url, body=None, headers=None, **connection_kwargs):
+        return self.manager.urlopen(method, url, body, headers, **connection_kwargs)
+
+
+class LoopbackTransport(Transport):
+    """
+    In-process transport that never touches the network, for tests and for measuring the
+    client side cost of a transaction. `responder` is either the response body to return
+    for every request or a callable(method, url, body, headers) returning the body or a
+    (status, body) tuple.
+    """
+    def __init__(self, responder='', status=200):
+        self.responder = responder
+        self.status = status
+        self.last_request = None
+
+    def send(self, method, url, body=None, headers=None, **connection_kwargs):
+        self.last_request = (method, url, body, headers, connection_kwargs)
+
+        if not callable(self.responder):
+            return self.status, self.responder
+
+        response = self.responder(method, url, body, headers)
+        if isinstance(response, tuple):
+            return response
+        return self.status, response
+
+
+class RedirectTransport(Transport):
+    """
+    Sends every request to `endpoint` (scheme://host:port) instead of the gateway's own servers,
+    keeping the path & query, e.g. to point a gateway at a paython.simulators server:
+
+        api.transport = RedirectTransport('http://127.0.0.1:8080')
+
+    Requests go through `transport`, the default one when not given.
+    """
+    def __init__(self, endpoint, transport=None):
+        parts = urlparse.urlsplit(endpoint)
+        self.scheme = parts.scheme
+        self.netloc = parts.netloc
+        self.transport = transport
+
+    def send(self, method, url, body=None, headers=None, **connection_kwargs):
+        parts = urlparse.urlsplit(url)
+        url = urlparse.urlunsplit((self.scheme, self.netloc, parts.path, parts.query, ''))
+        if self.scheme != 'https':
+            connection_kwargs = {}  # client certificates only go over https
+        transport = self.transport or default_transport
+        return transport.send(method, url, body, headers, **connection_kwargs)
+
+
+# transport used by gateways unless they are given another one
+default_transport = PooledTransport()
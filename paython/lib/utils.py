@@ -1,24 +1,53 @@
 from __future__ import absolute_import, unicode_literals
 
 import re
+import urllib
 import calendar
-import xml
+import xml.dom.minidom
+import xml.parsers.expat
 
 from datetime import datetime
 
+from .iin import iin_table
 from ..exceptions import GatewayError
 
 
+# cvv formats by card brand, brands themselves come from the IIN ranges in iin.py
 CARD_TYPES = {
-    'visa': {'cc': re.compile(r'4\d{12}(\d{3})?$'), 'cvv': re.compile(r'^[\d+]{3}$')},
-    'amex': {'cc': re.compile(r'37\d{13}$'), 'cvv': re.compile(r'^[\d+]{4}$')},
-    'mc': {'cc': re.compile(r'5[1-5]\d{14}$'), 'cvv': re.compile(r'^[\d+]{3}$')},
-    'discover': {'cc': re.compile(r'6011\d{12}'), 'cvv': re.compile(r'^[\d+]{3}$')},
-    'diners': {'cc': re.compile(r'(30[0-5]\d{11}|(36|38)\d{12})$'), 'cvv': re.compile(r'^[\d+]{3}$')},
+    'visa': {'cvv': re.compile(r'^[\d+]{3}$')},
+    'amex': {'cvv': re.compile(r'^[\d+]{4}$')},
+    'mc': {'cvv': re.compile(r'^[\d+]{3}$')},
+    'discover': {'cvv': re.compile(r'^[\d+]{3}$')},
+    'diners': {'cvv': re.compile(r'^[\d+]{3}$')},
+    'jcb': {'cvv': re.compile(r'^[\d+]{3}$')},
+    'unionpay': {'cvv': re.compile(r'^[\d+]{3}$')},
+    'maestro': {'cvv': re.compile(r'^[\d+]{3}$')},
 }
 
+# cvv format of brands added to the IIN ranges without a CARD_TYPES entry
+DEFAULT_CVV = re.compile(r'^\d{3,4}$')
+
+# digit sum of each digit doubled, for the Luhn check
+LUHN_DOUBLED = (0, 2, 4, 6, 8, 1, 3, 5, 7, 9)
+
+# card validation result codes (lib.bulk), a card gets the first check it fails in CreditCard.validate() order
+VALID = 0
+INVALID_TYPE = 1
+INVALID_NUMBER = 2
+EXPIRED = 3
+INVALID_CVV = 4
+INVALID_EXP = 5  # month or year that isn't a date, CreditCard.validate() raises ValueError for these
+
+MESSAGES = {
+    INVALID_TYPE: "The credit card number provided is not a valid card type",
+    INVALID_NUMBER: "The credit card number provided does not pass luhn validation",
+    EXPIRED: "The credit card expiration provided is not in the future",
+    INVALID_CVV: "The credit card cvv is not valid",
+    INVALID_EXP: "The credit card expiration provided is not a valid date",
+}
 
-def parse_xml(element):
+
+def parse_dom(element):
     """
     Parse an XML API Response xml.dom.minidom.Document. Returns the result as dict or string
     depending on amount of child elements. Returns None in case of empty elements
@@ -52,23 +81,23 @@ def parse_xml(element):
 
         if e.childNodes:
             if 'attribute' in t:
-                t['meta'] = parse_xml(e)
+                t['meta'] = parse_dom(e)
             else:
                 if len(e.childNodes) == 1:
                     if e.firstChild.nodeType == xml.dom.Node.CDATA_SECTION_NODE:
                         t = e.firstChild.wholeText
                     else:
-                        t = parse_xml(e)
+                        t = parse_dom(e)
                 else:
-                    t = parse_xml(e)
+                    t = parse_dom(e)
 
         if not t:
             t = e.nodeValue
 
         if e.nodeName in root:
-            if not isinstance(root[e.nodeName], list):
-                tmp = []
-                tmp.append(root[e.nodeName])
+            tmp = root[e.nodeName]
+            if not isinstance(tmp, list):
+                tmp = [tmp]
             tmp.append(t)
             t = tmp
 
@@ -77,6 +106,239 @@ def parse_xml(element):
     return root
 
 
+# kinds of the nodes XMLDictParser keeps for the element being parsed
+TEXT, CDATA, ELEMENT, OTHER = range(4)
+
+
+def reduce_nodes(nodes):
+    """
+    Value of an element with the given (kind, name, value) child nodes, as parse_dom() returns it
+    """
+    if len(nodes) == 1 and nodes[0][0] == TEXT:
+        return nodes[0][2].strip()
+
+    root = {}
+    for kind, name, value in nodes:
+        if kind == TEXT and not value.strip():
+            continue
+
+        if name in root:
+            tmp = root[name]
+            if isinstance(tmp, list):
+                tmp.append(value)
+                continue
+            value = [tmp, value]
+
+        root[name] = value
+
+    return root
+
+
+class XMLDictParser(object):
+    """
+    Builds the dicts of parse_dom() straight from expat events, in a single pass & without a DOM.
+
+    Only the child nodes of the elements still open are kept, each element is reduced to its
+    value as soon as it ends.
+    """
+    def __init__(self):
+        self.stack = [(None, None, [])]  # (name, attributes, child nodes), the document first
+        self.in_cdata = False
+        self.cdata_continue = False
+
+        parser = self.parser = xml.parsers.expat.ParserCreate()
+        parser.buffer_text = True
+        parser.StartElementHandler = self.start_element
+        parser.EndElementHandler = self.end_element
+        parser.CharacterDataHandler = self.character_data
+        parser.StartCdataSectionHandler = self.start_cdata
+        parser.EndCdataSectionHandler = self.end_cdata
+        parser.CommentHandler = self.comment
+        parser.ProcessingInstructionHandler = self.processing_instruction
+
+    def parse(self, data):
+        self.parser.Parse(data, True)
+        return reduce_nodes(self.stack[0][2])
+
+    def start_element(self, name, attributes):
+        self.stack.append((name, attributes, []))
+
+    def end_element(self, name):
+        name, attributes, nodes = self.stack.pop()
+
+        if attributes:
+            value = {'attribute': attributes}
+            if nodes:
+                value['meta'] = reduce_nodes(nodes)
+        elif len(nodes) == 1 and nodes[0][0] == CDATA:
+            value = nodes[0][2]
+        elif nodes:
+            value = reduce_nodes(nodes)
+        else:
+            value = None
+
+        self.stack[-1][2].append((ELEMENT, name, value or None))
+
+    def character_data(self, data):
+        nodes = self.stack[-1][2]
+        if self.in_cdata:
+            if self.cdata_continue and nodes[-1][0] == CDATA:
+                nodes[-1] = (CDATA, '#cdata-section', nodes[-1][2] + data)
+            else:
+                nodes.append((CDATA, '#cdata-section', data))
+                self.cdata_continue = True
+        elif nodes and nodes[-1][0] == TEXT:
+            nodes[-1] = (TEXT, '#text', nodes[-1][2] + data)
+        else:
+            nodes.append((TEXT, '#text', data))
+
+    def start_cdata(self):
+        self.in_cdata = True
+        self.cdata_continue = False
+
+    def end_cdata(self):
+        self.in_cdata = False
+        self.cdata_continue = False
+
+    def comment(self, data):
+        self.stack[-1][2].append((OTHER, '#comment', data))
+
+    def processing_instruction(self, target, data):
+        self.stack[-1][2].append((OTHER, target, data))
+
+
+def parse_xml(element):
+    """
+    Parse an XML API Response string (or xml.dom.minidom.Node). Returns the result as dict or string
+    depending on amount of child elements. Returns None in case of empty elements
+    """
+    if isinstance(element, xml.dom.minidom.Node):
+        return parse_dom(element)
+
+    try:
+        return XMLDictParser().parse(element)
+    except xml.parsers.expat.ExpatError as e:
+        raise GatewayError("Error parsing XML: {0}".format(e))
+
+
+class FieldsFound(Exception):
+    """
+    Stops XMLFieldParser once every field was read
+    """
+
+
+class XMLFieldParser(object):
+    """
+    Reads the text of the first element named after each of `fields` from expat events, ignoring
+    everything else. Parsing stops as soon as all the fields have been found.
+    """
+    def __init__(self, fields):
+        self.fields = frozenset(fields)
+        self.values = {}
+        self.depth = 0
+        self.capture = None  # (name, depth, text chunks) of the element being read
+
+        parser = self.parser = xml.parsers.expat.ParserCreate()
+        parser.buffer_text = True
+        parser.StartElementHandler = self.start_element
+        parser.EndElementHandler = self.end_element
+        parser.CharacterDataHandler = self.character_data
+
+    def parse(self, data):
+        if not self.fields:
+            return self.values
+
+        try:
+            self.parser.Parse(data, True)
+        except FieldsFound:
+            pass
+        return self.values
+
+    def start_element(self, name, attributes):
+        self.depth += 1
+        if self.capture is None and name in self.fields and name not in self.values:
+            self.capture = (name, self.depth, [])
+
+    def end_element(self, name):
+        capture = self.capture
+        if capture is not None and capture[1] == self.depth:
+            self.values[name] = ''.join(capture[2]).strip() or None
+            self.capture = None
+            if len(self.values) == len(self.fields):
+                raise FieldsFound
+        self.depth -= 1
+
+    def character_data(self, data):
+        capture = self.capture
+        if capture is not None and capture[1] == self.depth:
+            capture[2].append(data)
+
+
+def parse_fields(response, fields):
+    """
+    Parse only the elements named in `fields` out of an XML API Response string (a document or
+    a fragment of sibling elements). Returns a dict of element name ==> stripped text (None when
+    empty) for the fields found, the first occurrence wins.
+    """
+    response = response.lstrip()
+    if response.startswith('<?xml'):
+        response = response[response.index('?>') + 2:]
+
+    try:
+        return XMLFieldParser(fields).parse('<response>%s</response>' % response)
+    except xml.parsers.expat.ExpatError as e:
+        raise GatewayError("Error parsing XML: {0}".format(e))
+
+
+def parse_urlencoded(response, keys=None, delimiter='&', lower=False, plus=True, strip=None, blank=True):
+    """
+    Decodes a form-urlencoded (key=value&...) API Response into a dict in a single pass.
+    Values are split on their first '=' only & only unquoted when they hold escapes.
+
+    - keys: only these (decoded, lowered if asked) keys are kept, the rest is skipped undecoded
+    - delimiter: pair separator
+    - lower: lowercases the keys
+    - plus: '+' stands for a space, as in urlparse.parse_qsl (PlugnPay & Paypal send it literally)
+    - strip: characters stripped from both ends of the values (True for whitespace)
+    - blank: keep keys with empty values (parse_qsl drops them)
+
+    Pairs without an '=' are ignored, the last of repeated keys wins.
+    """
+    strip_chars = None if strip is True else strip  # None strips whitespace
+    if isinstance(response, bytes):
+        delimiter, equals, percent, plus_sign = delimiter.encode('ascii'), b'=', b'%', b'+'
+        if strip_chars:
+            strip_chars = strip_chars.encode('ascii')
+    else:
+        equals, percent, plus_sign = '=', '%', '+'
+
+    unquote = urllib.unquote_plus if plus else urllib.unquote
+    result = {}
+
+    for pair in response.split(delimiter):
+        key, sep, value = pair.partition(equals)
+        if not sep:
+            continue
+
+        if percent in key or plus and plus_sign in key:
+            key = unquote(key)
+        if lower:
+            key = key.lower()
+        if keys is not None and key not in keys:
+            continue
+
+        if percent in value or plus and plus_sign in value:
+            value = unquote(value)
+        if strip:
+            value = value.strip(strip_chars)
+        if not value and not blank:
+            continue
+
+        result[key] = value
+
+    return result
+
+
 def is_valid_cc(cc):
     """
     Uses Luhn Algorithm for credit card number validation. http://en.wikipedia.org/wiki/Luhn_algorithm
@@ -86,7 +348,7 @@ def is_valid_cc(cc):
     except ValueError:
         return False
     else:
-        return not sum(num[::-2] + map(lambda d: sum(divmod(d * 2, 10)), num[-2::-2])) % 10
+        return not (sum(num[::-2]) + sum([LUHN_DOUBLED[d] for d in num[-2::-2]])) % 10
 
 
 def is_valid_exp(month, year):
@@ -104,17 +366,15 @@ def is_valid_cvv(cc_cvv, cc_type):
     """
     Simple regex for card validator length & type.
     """
-    cvv_re = CARD_TYPES[cc_type]['cvv']
+    cvv_re = CARD_TYPES[cc_type]['cvv'] if cc_type in CARD_TYPES else DEFAULT_CVV
     return cvv_re.match(cc_cvv)
 
 
 def get_card_type(cc):
     """
-    Gets card type by using card number
+    Gets card type by using card number, looking its leading digits up in the IIN ranges
     """
-    for k, v in CARD_TYPES.items():
-        if v['cc'].match(cc):
-            return k
+    return iin_table.brand(cc)
 
 
 def get_card_exp(month, year):
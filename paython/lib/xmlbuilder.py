@@ -0,0 +1,161 @@
+from __future__ import absolute_import, unicode_literals
+
+
+def escape(data):
+    """
+    Same escaping minidom applies to text & attribute values
+    """
+    if '&' in data:
+        data = data.replace('&', '&amp;')
+    if '<' in data:
+        data = data.replace('<', '&lt;')
+    if '"' in data:
+        data = data.replace('"', '&quot;')
+    if '>' in data:
+        data = data.replace('>', '&gt;')
+    return data
+
+
+def text(value):
+    """
+    Text node value, byte strings are expected to be utf-8
+    """
+    if isinstance(value, bytes):
+        return value.decode('utf-8')
+    return unicode(value)
+
+
+class Element(object):
+    """
+    XML element, `children` holds Elements and text (unicode) in document order
+    """
+    __slots__ = ('name', 'attributes', 'children')
+
+    def __init__(self, name):
+        self.name = name
+        self.attributes = None
+        self.children = []
+
+    def __repr__(self):
+        return '<Element -- {0}>'.format(self.name)
+
+    def set_attribute(self, key, value):
+        if self.attributes is None:
+            self.attributes = {}
+        self.attributes[key] = value
+
+    def write(self, out):
+        out.append('<')
+        out.append(self.name)
+        if self.attributes:
+            for key in sorted(self.attributes):
+                out.append(' %s="%s"' % (key, escape(self.attributes[key])))
+
+        if not self.children:
+            out.append('/>')
+            return
+
+        out.append('>')
+        for child in self.children:
+            if isinstance(child, Element):
+                child.write(out)
+            else:
+                out.append(escape(child))
+        out.append('</%s>' % self.name)
+
+    def write_pretty(self, out, indent, level):
+        out.append('%s<%s' % (indent * level, self.name))
+        if self.attributes:
+            for key in sorted(self.attributes):
+                out.append(' %s="%s"' % (key, escape(self.attributes[key])))
+
+        if not self.children:
+            out.append('/>\n')
+            return
+
+        out.append('>\n')
+        for child in self.children:
+            if isinstance(child, Element):
+                child.write_pretty(out, indent, level + 1)
+            else:
+                out.append('%s%s\n' % (indent * (level + 1), escape(child)))
+        out.append('%s</%s>\n' % (indent * level, self.name))
+
+
+class XMLBuilder(object):
+    """
+    Lightweight request document for XMLGateway, a drop-in for the minidom Document it used.
+
+    Elements are looked up by name among the children of their parent through an index kept
+    as the document grows, so adding a field costs one dict lookup per path segment instead of
+    a walk of the whole tree, and the body is serialized in a single pass.
+    """
+    def __init__(self):
+        self.root = Element(None)
+        self.index = {}  # (id(parent), name) ==> first child element with that name
+
+    def _append(self, parent, name):
+        element = Element(name)
+        parent.children.append(element)
+        self.index.setdefault((id(parent), name), element)
+        return element
+
+    def add(self, path, child=False, attribute=False, parent=None):
+        """
+        Adds the element at the end of the forward slash separated `path`, creating the missing
+        elements on the way, see XMLGateway.set() for `child` & `attribute`. Returns the element.
+        """
+        element = self.root if parent is None else parent
+        xml_path = path.split('/')
+        last = len(xml_path) - 1
+
+        for i, element_name in enumerate(xml_path):
+            existing = self.index.get((id(element), element_name))
+            # the target element is always a new one
+            if existing is None or i == last:
+                existing = self._append(element, element_name)
+            element = existing
+
+        if child:
+            # format: ((name1, text, 'attribute:value'), (name2, text2))
+            if isinstance(child, tuple):
+                for obj in child:
+                    node = self._append(element, obj[0])
+                    if len(obj) >= 2:
+                        node.children.append(text(obj[1]))
+                    if len(obj) == 3:
+                        a = obj[2].split(':')
+                        node.set_attribute(a[0], a[1])
+            else:
+                element.children.append(text(child))
+
+        if attribute:
+            for attribute in attribute.split('|'):
+                attribute = attribute.split(':')
+                element.set_attribute(attribute[0], attribute[1])
+
+        return element
+
+    def toxml(self, encoding=None):
+        """
+        Serializes the document, as bytes when an `encoding` is given
+        """
+        if encoding:
+            out = ['<?xml version="1.0" encoding="%s"?>' % encoding]
+        else:
+            out = ['<?xml version="1.0" ?>']
+
+        for element in self.root.children:
+            element.write(out)
+
+        body = ''.join(out)
+        return body.encode(encoding) if encoding else body
+
+    def toprettyxml(self, indent='\t'):
+        """
+        Indented serialization, for debugging
+        """
+        out = ['<?xml version="1.0" ?>\n']
+        for element in self.root.children:
+            element.write_pretty(out, indent, 0)
+        return ''.join(out)
@@ -0,0 +1,285 @@
+"""
+Closed-loop load generator: N virtual clients each run transactions back to back against a
+gateway, picking scenarios from a weighted mix, and the achieved TPS, latency percentiles,
+decline & error rates are reported per operation.
+
+    python -m paython.loadgen --gateway AuthorizeNet --simulate --latency lognormal:0.08,0.5 \\
+        --clients 32 --duration 60 --mix auth_settle:60,capture:25,void:10,credit:5
+
+Scenarios: `auth_settle` (auth, then settle what was authorized), `capture`, `void` & `credit`
+(a capture, then voiding or crediting it). --simulate runs the gateway's paython.simulators
+server in process; --endpoint sends to a server running elsewhere. Latencies are measured per
+operation, from the start of the gateway call to its response.
+"""
+from __future__ import absolute_import, unicode_literals
+
+import sys
+import json
+import time
+import random
+import inspect
+import optparse
+import threading
+import logging
+
+from . import gateways
+from .batch import parse_option
+from .lib.cc import CreditCard
+from .lib.metrics import GatewayMetrics, outcome
+from .lib.pool import pool_manager
+from .lib.timing import clock, add_timing_hook, remove_timing_hook
+from .lib.transport import RedirectTransport
+
+logger = logging.getLogger(__name__)
+
+SCENARIOS = {
+    'auth_settle': ('auth', 'settle'),
+    'capture': ('capture',),
+    'void': ('capture', 'void'),
+    'credit': ('capture', 'credit'),
+}
+
+DEFAULT_MIX = 'auth_settle:60,capture:25,void:10,credit:5'
+
+QUANTILES = (0.5, 0.95, 0.99, 0.999)
+
+CREDIT_CARD = dict(number='4111111111111111', exp_mo='12', exp_yr='2030', first_name='John', last_name='Doe', cvv='123')
+
+BILLING = dict(address='1 Main St', city='Boca Raton', state='FL', zipcode='33432', country='US',
+               phone='555-555-5555', email='john@example.com', ip='127.0.0.1')
+
+
+def parse_mix(spec):
+    """
+    [(scenario, weight)] from 'auth_settle:60,capture:25,...', a scenario without a weight weighs 1
+    """
+    mix = []
+    for item in spec.split(','):
+        name, sep, weight = item.strip().partition(':')
+        if name not in SCENARIOS:
+            raise ValueError("unknown scenario '%s', use some of %s" % (name, ', '.join(sorted(SCENARIOS))))
+        mix.append((name, float(weight) if sep else 1.0))
+    if not mix or sum(weight for name, weight in mix) <= 0:
+        raise ValueError('the mix needs a scenario with a positive weight')
+    return mix
+
+
+def arguments(method):
+    """
+    Names of the arguments a (wrapped) gateway method takes
+    """
+    while hasattr(method, '__wrapped__'):
+        method = method.__wrapped__
+    return inspect.getargspec(method).args[1:]
+
+
+class LoadGenerator(object):
+    """
+    Runs `clients` virtual clients against `gateway` for `duration` seconds or until `transactions`
+    scenarios ran, waiting `think_time` seconds between scenarios. Results of the first `warmup`
+    seconds are left out.
+    """
+    def __init__(self, gateway, clients=8, mix=DEFAULT_MIX, duration=None, transactions=None, think_time=0.0,
+                 warmup=0.0, amount='1.00', seed=None):
+        self.gateway = gateway
+        self.clients = clients
+        self.mix = parse_mix(mix) if isinstance(mix, basestring) else list(mix)
+        self.duration = duration
+        self.transactions = transactions
+        self.think_time = think_time
+        self.warmup = warmup
+        self.amount = amount
+        self.random = random.Random(seed)
+        self.metrics = GatewayMetrics()
+        self.signatures = {}
+        self._lock = threading.Lock()
+        self._started = 0
+        self._deadline = None
+        self._measure_from = None
+
+    def pick_scenario(self):
+        """
+        Next scenario to run, None once the run is over
+        """
+        with self._lock:
+            if self._deadline is not None and clock() >= self._deadline:
+                return None
+            if self.transactions is not None and self._started >= self.transactions:
+                return None
+            self._started += 1
+            point = self.random.uniform(0, sum(weight for name, weight in self.mix))
+            for name, weight in self.mix:
+                point -= weight
+                if point <= 0:
+                    return name
+            return self.mix[-1][0]
+
+    def call(self, operation, previous):
+        """
+        Runs one gateway operation, passing the arguments its signature asks for, the ids from the `previous` response
+        """
+        context = {
+            'amount': self.amount,
+            'credit_card': CreditCard(**CREDIT_CARD),
+            'billing_info': BILLING,
+            'trans_id': '',
+            'ref': '',
+            'ordernumber': '',
+        }
+        if previous is not None:
+            context.update(trans_id=previous.trans_id or '', ref=previous.alt_trans_id or '',
+                           ordernumber=previous.get('alt_trans_id2') or '')
+
+        method = getattr(self.gateway, operation)
+        if operation not in self.signatures:
+            self.signatures[operation] = arguments(method)
+        kwargs = dict((name, context[name]) for name in self.signatures[operation] if name in context)
+        return method(**kwargs)
+
+    def record(self, gateway, operation, timings, response, error):
+        if clock() >= self._measure_from:
+            self.metrics.timing_hook(gateway, operation, timings, response, error)
+
+    def client(self):
+        while True:
+            scenario = self.pick_scenario()
+            if scenario is None:
+                return
+            previous = None
+            for operation in SCENARIOS[scenario]:
+                try:
+                    previous = self.call(operation, previous)
+                except Exception:
+                    break  # recorded as an error by the timing hook
+                if outcome(previous, None) != 'approved':
+                    break
+            if self.think_time:
+                time.sleep(self.think_time)
+
+    def run(self):
+        """
+        Runs the load & returns the report(), see format_report()
+        """
+        started = clock()
+        self._measure_from = started + self.warmup
+        if self.duration is not None:
+            self._deadline = started + self.warmup + self.duration
+        elif self.transactions is None:
+            raise ValueError('a duration or a number of transactions is needed')
+
+        add_timing_hook(self.record)
+        try:
+            threads = [threading.Thread(target=self.client, name='paython-loadgen-%d' % i) for i in range(self.clients)]
+            for thread in threads:
+                thread.daemon = True
+                thread.start()
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(0.5)
+        finally:
+            remove_timing_hook(self.record)
+
+        return self.report(max(0.0, clock() - self._measure_from))
+
+    def report(self, elapsed):
+        operations = {}
+        for series in self.metrics.snapshot():
+            counts = operations.setdefault(series['operation'], {'approved': 0, 'declined': 0, 'error': 0})
+            counts[series['outcome']] += series['count']
+
+        report = {'gateway': type(self.gateway).__name__, 'clients': self.clients, 'elapsed': elapsed, 'operations': {}}
+        total = 0
+        for operation, counts in sorted(operations.items()):
+            histogram = self.metrics.histogram(operation=operation)
+            total += histogram.count
+            stats = {
+                'count': histogram.count,
+                'tps': histogram.count / elapsed if elapsed else 0.0,
+                'decline_rate': float(counts['declined']) / histogram.count,
+                'error_rate': float(counts['error']) / histogram.count,
+            }
+            for quantile in QUANTILES:
+                stats['p%s' % ('%g' % (quantile * 100)).replace('.', '')] = histogram.percentile(quantile)
+            report['operations'][operation] = stats
+        report['count'] = total
+        report['tps'] = total / elapsed if elapsed else 0.0
+        return report
+
+
+def format_report(report):
+    lines = ['%s, %d clients, %.1fs: %d operations, %.1f TPS' % (report['gateway'], report['clients'], report['elapsed'],
+                                                                 report['count'], report['tps']),
+             '%-10s %8s %9s %7s %7s %9s %9s %9s %9s' % ('operation', 'count', 'TPS', 'err%', 'decl%', 'p50 ms', 'p95 ms', 'p99 ms', 'p999 ms')]
+    for operation, stats in sorted(report['operations'].items()):
+        lines.append('%-10s %8d %9.1f %7.2f %7.2f %9.1f %9.1f %9.1f %9.1f' % (
+            operation, stats['count'], stats['tps'], stats['error_rate'] * 100, stats['decline_rate'] * 100,
+            stats['p50'] * 1e3, stats['p95'] * 1e3, stats['p99'] * 1e3, stats['p999'] * 1e3))
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = optparse.OptionParser(usage='python -m paython.loadgen --gateway NAME (--simulate | --endpoint URL) [options]')
+    parser.add_option('-g', '--gateway', help='gateway class in paython.gateways, e.g. AuthorizeNet')
+    parser.add_option('-o', '--option', action='append', default=[], metavar='KEY=VALUE',
+                      help='gateway constructor argument, can be repeated')
+    parser.add_option('--endpoint', metavar='URL', help='send to URL, e.g. a paython.simulators server')
+    parser.add_option('--simulate', action='store_true', default=False, help="run the gateway's simulator in process")
+    parser.add_option('--latency', default='0', help='simulated latency, see python -m paython.simulators --help')
+    parser.add_option('--decline-rate', type='float', default=0.0, help='simulated decline rate')
+    parser.add_option('--error-rate', type='float', default=0.0, help='simulated error rate')
+    parser.add_option('-c', '--clients', type='int', default=8, help='concurrent virtual clients [default: %default]')
+    parser.add_option('-d', '--duration', type='float', help='seconds to run for [default: 10 when -n is not given]')
+    parser.add_option('-n', '--transactions', type='int', help='scenarios to run')
+    parser.add_option('--warmup', type='float', default=0.0, help='seconds left out of the results [default: %default]')
+    parser.add_option('--think-time', type='float', default=0.0, help='seconds each client waits between scenarios')
+    parser.add_option('--mix', default=DEFAULT_MIX, help='weighted scenarios [default: %default]')
+    parser.add_option('--seed', type='int', help='random seed for the scenario mix')
+    parser.add_option('--json', action='store_true', default=False, help='print the report as JSON')
+    options, args = parser.parse_args(argv)
+
+    if not options.gateway:
+        parser.error('a gateway is required')
+    gateway_class = getattr(gateways, options.gateway, None)
+    if gateway_class is None:
+        parser.error("unknown gateway '%s'" % options.gateway)
+    if not options.simulate and not options.endpoint:
+        parser.error('--simulate or --endpoint is required, the load generator never sends to real gateways')
+    try:
+        mix = parse_mix(options.mix)
+    except ValueError, e:
+        parser.error(str(e))
+
+    gateway_options = {}
+    for option in options.option:
+        key, sep, value = option.partition('=')
+        if not sep:
+            parser.error("gateway options must look like KEY=VALUE, got '%s'" % option)
+        gateway_options[str(key)] = parse_option(value)
+
+    server = None
+    if options.simulate:
+        from .simulators import start_simulator, parse_latency
+        server = start_simulator(gateway_class, latency=parse_latency(options.latency), decline_rate=options.decline_rate,
+                                 error_rate=options.error_rate, errors=['status', 'garbage', 'disconnect'])
+
+    try:
+        gateway = gateway_class(**gateway_options)
+        gateway.transport = RedirectTransport(server.url if server else options.endpoint)
+        pool_manager.configure(maxsize=max(pool_manager.maxsize, options.clients))
+
+        duration = options.duration
+        if duration is None and options.transactions is None:
+            duration = 10.0
+        generator = LoadGenerator(gateway, clients=options.clients, mix=mix, duration=duration, transactions=options.transactions,
+                                  think_time=options.think_time, warmup=options.warmup, seed=options.seed)
+        report = generator.run()
+    finally:
+        if server is not None:
+            server.stop()
+
+    print json.dumps(report, indent=2, sort_keys=True) if options.json else format_report(report)
+    return 1 if not report['count'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
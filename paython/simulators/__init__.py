@@ -0,0 +1,36 @@
+"""
+Local stand-ins for the payment gateways, for load testing without network access:
+
+    server = start_simulator('AuthorizeNet', latency=lognormal(0.08), decline_rate=0.1, error_rate=0.01)
+    api = AuthorizeNet(username='test', password='testpassword')
+    api.transport = RedirectTransport(server.url)
+    ...
+    server.stop()
+
+or from the command line, see `python -m paython.simulators --help`
+"""
+from __future__ import absolute_import, unicode_literals
+
+from .base import (GatewaySimulator, SimulatorServer, ERRORS,  # NOQA
+                   constant, uniform, exponential, lognormal, parse_latency)
+from .gateways import SIMULATORS  # NOQA
+from ..lib.transport import RedirectTransport  # NOQA
+
+
+def simulator_for(gateway, **options):
+    """
+    Simulator of a gateway, given as a class, an instance or a class name. `options` go to GatewaySimulator
+    """
+    if not isinstance(gateway, basestring):
+        gateway = gateway.__name__ if isinstance(gateway, type) else type(gateway).__name__
+    try:
+        return SIMULATORS[gateway](**options)
+    except KeyError:
+        raise ValueError("no simulator for '%s', there are simulators for %s" % (gateway, ', '.join(sorted(SIMULATORS))))
+
+
+def start_simulator(gateway, host='127.0.0.1', port=0, certfile=None, **options):
+    """
+    Starts serving the simulator of `gateway` (see simulator_for) in the background, returns the SimulatorServer
+    """
+    return SimulatorServer(simulator_for(gateway, **options), host, port, certfile).start()
@@ -0,0 +1,69 @@
+"""
+Runs gateway simulators until interrupted:
+
+    python -m paython.simulators --gateway AuthorizeNet --gateway PlugnPay --port 8080 \\
+        --latency lognormal:0.08,0.5 --decline-rate 0.1 --error-rate 0.01
+
+Each gateway gets its own port, counting up from --port. Point gateways at them with
+paython.lib.transport.RedirectTransport('http://127.0.0.1:8080').
+"""
+from __future__ import absolute_import, unicode_literals
+
+import sys
+import time
+import optparse
+
+from . import SIMULATORS, ERRORS, start_simulator, parse_latency
+
+
+def main(argv=None):
+    parser = optparse.OptionParser(usage='python -m paython.simulators --gateway NAME [options]')
+    parser.add_option('-g', '--gateway', action='append', default=[],
+                      help='gateway to simulate, can be repeated: %s' % ', '.join(sorted(SIMULATORS)))
+    parser.add_option('--host', default='127.0.0.1', help='address to listen on [default: %default]')
+    parser.add_option('-p', '--port', type='int', default=8080, help='port of the first simulator [default: %default]')
+    parser.add_option('--latency', default='0', help="seconds, or 'uniform:LOW,HIGH', 'exponential:MEAN', 'lognormal:MEDIAN,SIGMA'")
+    parser.add_option('--decline-rate', type='float', default=0.0, help='fraction of declined transactions')
+    parser.add_option('--error-rate', type='float', default=0.0, help='fraction of failed requests')
+    parser.add_option('--errors', default=','.join(ERRORS), help='ways requests fail [default: %default]')
+    parser.add_option('--stall', type='float', default=5.0, help='seconds a stalled answer takes [default: %default]')
+    parser.add_option('--certfile', help='PEM certificate & key, serves HTTPS')
+    parser.add_option('--seed', type='int', help='random seed for the outcomes')
+    options, args = parser.parse_args(argv)
+
+    if not options.gateway:
+        parser.error('at least one gateway is required')
+    try:
+        latency = parse_latency(options.latency)
+    except ValueError, e:
+        parser.error(str(e))
+    errors = [error for error in options.errors.split(',') if error]
+    if set(errors) - set(ERRORS):
+        parser.error('errors must be some of %s' % ', '.join(ERRORS))
+
+    servers = []
+    try:
+        for offset, gateway in enumerate(options.gateway):
+            port = options.port + offset if options.port else 0
+            try:
+                server = start_simulator(gateway, options.host, port, options.certfile, latency=latency,
+                                         decline_rate=options.decline_rate, error_rate=options.error_rate,
+                                         errors=errors, stall=options.stall, seed=options.seed)
+            except ValueError, e:
+                parser.error(str(e))
+            servers.append(server)
+            sys.stderr.write('%s simulator at %s\n' % (gateway, server.url))
+
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for server in servers:
+            sys.stderr.write('%s: %r\n' % (type(server.simulator).__name__, server.simulator.counts))
+            server.stop()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
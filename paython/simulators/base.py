@@ -0,0 +1,217 @@
+from __future__ import absolute_import, unicode_literals
+
+import ssl
+import math
+import time
+import random
+import urllib
+import urlparse
+import itertools
+import threading
+import logging
+import BaseHTTPServer
+import SocketServer
+
+logger = logging.getLogger(__name__)
+
+# ways a simulator can fail a request: a 500 answer, a body the gateway can't parse,
+# dropping the connection halfway through the answer & answering only after `stall` seconds
+ERRORS = ('status', 'garbage', 'disconnect', 'stall')
+
+
+def constant(seconds):
+    return lambda: seconds
+
+
+def uniform(low, high):
+    return lambda: random.uniform(low, high)
+
+
+def exponential(mean):
+    return lambda: random.expovariate(1.0 / mean) if mean > 0 else 0.0
+
+
+def lognormal(median, sigma=0.5):
+    """
+    Latencies around `median` with a long tail, closest to what real gateways do
+    """
+    mu = 0.0 if median <= 0 else math.log(median)
+    return lambda: random.lognormvariate(mu, sigma) if median > 0 else 0.0
+
+
+LATENCIES = {
+    'constant': constant,
+    'uniform': uniform,
+    'exponential': exponential,
+    'lognormal': lognormal,
+}
+
+
+def parse_latency(spec):
+    """
+    Latency distribution from a string: '0.05' (constant), 'uniform:0.02,0.2', 'exponential:0.05' or 'lognormal:0.08,0.5'
+    """
+    name, sep, args = spec.partition(':')
+    if not sep:
+        return constant(float(spec))
+    if name not in LATENCIES:
+        raise ValueError("unknown latency distribution '%s', use one of %s" % (name, ', '.join(sorted(LATENCIES))))
+    return LATENCIES[name](*[float(arg) for arg in args.split(',')])
+
+
+def form_encode(pairs, plus=True):
+    """
+    Form-urlencodes (key, value) pairs in order, spaces as '+' or, for gateways that don't use them, '%20'
+    """
+    quote = urllib.quote_plus if plus else urllib.quote
+    return '&'.join('%s=%s' % (quote(key, safe=''), quote(value, safe='')) for key, value in pairs)
+
+
+class GatewaySimulator(object):
+    """
+    Stand-in for a payment gateway: answers requests in the gateway's wire format, approving them
+    except for a `decline_rate` fraction, after a delay drawn from `latency` (seconds or a callable
+    from parse_latency()), failing an `error_rate` fraction of them in one of the `errors` ways.
+    Subclasses decode the request & render the answer.
+    """
+    content_type = 'text/plain'
+
+    def __init__(self, latency=0, decline_rate=0.0, error_rate=0.0, errors=ERRORS, stall=5.0, seed=None):
+        self.latency = latency if callable(latency) else constant(float(latency))
+        self.decline_rate = decline_rate
+        self.error_rate = error_rate
+        self.errors = tuple(errors)
+        self.stall = stall
+        self.random = random.Random(seed)
+        self.counts = {'approved': 0, 'declined': 0, 'error': 0}
+        self._ids = itertools.count(100000)
+        self._lock = threading.Lock()
+
+    def next_id(self):
+        with self._lock:
+            return str(next(self._ids))
+
+    def roll(self):
+        """
+        Outcome of the next request: 'approved', 'declined' or one of the errors
+        """
+        with self._lock:
+            value = self.random.random()
+            if value < self.error_rate:
+                outcome = self.random.choice(self.errors)
+                self.counts['error'] += 1
+            elif value < self.error_rate + (1 - self.error_rate) * self.decline_rate:
+                outcome = 'declined'
+                self.counts['declined'] += 1
+            else:
+                outcome = 'approved'
+                self.counts['approved'] += 1
+        return outcome
+
+    def respond(self, method, path, query, body):
+        """
+        (status, content type, body) answering a request, None to drop the connection
+        """
+        delay = self.latency()
+        if delay > 0:
+            time.sleep(delay)
+
+        outcome = self.roll()
+        if outcome == 'status':
+            return 500, 'text/plain', 'Internal Server Error'
+        if outcome == 'garbage':
+            return 200, 'text/html', '<html><body>Service Temporarily Unavailable</body></html>'
+        if outcome == 'disconnect':
+            return None
+        if outcome == 'stall':
+            time.sleep(self.stall)
+            outcome = 'approved'
+
+        params = self.decode_request(method, query, body)
+        return 200, self.content_type, self.render(params, outcome == 'approved', self.next_id())
+
+    def decode_request(self, method, query, body):
+        return dict(urlparse.parse_qsl(query if method == 'GET' else body, keep_blank_values=True))
+
+    def render(self, params, approved, trans_id):
+        raise NotImplementedError
+
+
+class SimulatorHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # answer in one segment, or Nagle & delayed ACKs add 40ms to every request
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.answer('')
+
+    def do_POST(self):
+        self.answer(self.rfile.read(int(self.headers.getheader('content-length', 0))))
+
+    def answer(self, body):
+        path, sep, query = self.path.partition('?')
+        response = self.server.simulator.respond(self.command, path, query, body)
+        if response is None:
+            # dropped halfway through the answer: dropped before it, a reused connection looks like one
+            # the server closed while idle & the pool sends the request again, hiding the error
+            self.send_response(200)
+            self.send_header('Content-Length', '1024')
+            self.end_headers()
+            self.close_connection = 1
+            return
+
+        status, content_type, data = response
+        if isinstance(data, unicode):
+            data = data.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%s.%s -- %s", __name__, 'SimulatorHandler', format % args)
+
+
+class SimulatorServer(SocketServer.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    """
+    Threaded HTTP server answering every request with `simulator`, over HTTPS when given a `certfile`
+    (PEM with the certificate & its key). Port 0 picks a free port, see `url`.
+    """
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, simulator, host='127.0.0.1', port=0, certfile=None):
+        BaseHTTPServer.HTTPServer.__init__(self, (host, port), SimulatorHandler)
+        self.simulator = simulator
+        self.scheme = 'http'
+        if certfile:
+            self.socket = ssl.wrap_socket(self.socket, certfile=certfile, server_side=True)
+            self.scheme = 'https'
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return '%s://%s:%s' % (self.scheme, host, port)
+
+    def handle_error(self, request, client_address):
+        pass  # clients hanging up on stalled answers
+
+    def start(self):
+        """
+        Serves from a daemon thread, returns the server
+        """
+        self._thread = threading.Thread(target=self.serve_forever, args=(0.05,), name='paython-simulator')
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
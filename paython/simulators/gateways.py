@@ -0,0 +1,157 @@
+from __future__ import absolute_import, unicode_literals
+
+import time
+
+from .base import GatewaySimulator, form_encode
+from ..lib.utils import parse_xml
+
+
+class AuthorizeNetSimulator(GatewaySimulator):
+    """
+    Authorize.net AIM: delimited columns, split by the request's x_delim_char (';' as AuthorizeNet sends)
+    """
+    def render(self, params, approved, trans_id):
+        get = params.get
+        if approved:
+            code, reason, text, auth_code = '1', '1', 'This transaction has been approved.', 'SIM%03d' % (int(trans_id) % 1000)
+        else:
+            code, reason, text, auth_code = '2', '2', 'This transaction has been declined.', '000000'
+
+        columns = [code, '1', reason, text, auth_code, 'Y', trans_id, get('x_invoice_num', ''), get('x_description', ''),
+                   get('x_amount', ''), 'CC', get('x_type', '').lower(), get('x_cust_id', '')]
+        columns.extend(get(field, '') for field in (
+            'x_first_name', 'x_last_name', 'x_company', 'x_address', 'x_city', 'x_state', 'x_zip', 'x_country',
+            'x_phone', 'x_fax', 'x_email', 'x_ship_to_first_name', 'x_ship_to_last_name', 'x_ship_to_company',
+            'x_ship_to_address', 'x_ship_to_city', 'x_ship_to_state', 'x_ship_to_zip', 'x_ship_to_country',
+            'x_tax', 'x_duty', 'x_freight', 'x_tax_exempt', 'x_po_num'))
+        columns.extend(['', 'M', '', 'XXXX%s' % get('x_card_num', '')[-4:], 'Visa'])
+        return params.get('x_delim_char', ';').join(columns)
+
+
+class PlugnPaySimulator(GatewaySimulator):
+    """
+    PlugnPay remote client: form-encoded answer ending in '|'
+    """
+    def render(self, params, approved, trans_id):
+        if approved:
+            status = [('FinalStatus', 'success'), ('success', 'yes'), ('sresp', 'A'), ('resp-code', '00'), ('auth-code', 'TSTAUT')]
+        else:
+            status = [('FinalStatus', 'badcard'), ('success', 'no'), ('sresp', 'D'), ('resp-code', '05'),
+                      ('MErrMsg', 'Card declined by issuer')]
+        pairs = status + [
+            ('MStatus', status[0][1]),
+            ('avs-code', 'Y'),
+            ('cvvresp', 'M'),
+            ('card-type', 'VISA'),
+            ('card-amount', params.get('card-amount', '')),
+            ('mode', params.get('mode', 'auth')),
+            ('orderID', params.get('orderID') or trans_id),
+            ('publisher-name', params.get('publisher-name', '')),
+            ('auth_date', time.strftime('%Y%m%d')),
+        ]
+        return form_encode(pairs, plus=False) + '|'
+
+
+class PaypalWPPSimulator(GatewaySimulator):
+    """
+    PayPal Website Payments Pro NVP API
+    """
+    def decode_request(self, method, query, body):
+        params = super(PaypalWPPSimulator, self).decode_request(method, query, body)
+        return dict((key.lower(), value) for key, value in params.items())
+
+    def render(self, params, approved, trans_id):
+        pairs = [
+            ('TIMESTAMP', time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())),
+            ('CORRELATIONID', 'sim%s' % trans_id),
+            ('ACK', 'Success' if approved else 'Failure'),
+            ('VERSION', params.get('version', '65.1')),
+            ('BUILD', '2230381'),
+        ]
+        if approved:
+            pairs.extend([('AMT', params.get('amt', '')), ('CURRENCYCODE', 'USD'), ('AVSCODE', 'X'), ('CVV2MATCH', 'M'),
+                          ('TRANSACTIONID', params.get('transactionid') or 'SIM%s' % trans_id)])
+        else:
+            pairs.extend([('L_ERRORCODE0', '10417'), ('L_SHORTMESSAGE0', 'Transaction cannot complete.'),
+                          ('L_LONGMESSAGE0', 'The transaction could not be loaded.'), ('L_SEVERITYCODE0', 'Error')])
+        return form_encode(pairs, plus=False)
+
+
+class USAePaySimulator(GatewaySimulator):
+    """
+    USAePay transaction API
+    """
+    def render(self, params, approved, trans_id):
+        pairs = [
+            ('UMversion', '2.9'),
+            ('UMstatus', 'Approved' if approved else 'Declined'),
+            ('UMauthCode', '021730' if approved else ''),
+            ('UMrefNum', trans_id),
+            ('UMavsResult', 'Address: Match & 5 Digit Zip: Match'),
+            ('UMavsResultCode', 'YYY'),
+            ('UMcvv2Result', 'Match'),
+            ('UMcvv2ResultCode', 'M'),
+            ('UMresult', 'A' if approved else 'D'),
+            ('UMerror', 'Approved' if approved else 'Card Declined'),
+            ('UMerrorcode', '00000' if approved else '10127'),
+            ('UMbatch', '1'),
+            ('UMauthAmount', params.get('UMamount', '') if approved else '0'),
+        ]
+        return form_encode(pairs)
+
+
+class InnovativeGWSimulator(GatewaySimulator):
+    """
+    Innovative Gateway Solutions, `approval` is only sent for approved transactions
+    """
+    def render(self, params, approved, trans_id):
+        pairs = [('approval', '%06d' % (int(trans_id) % 1000000))] if approved else [('error', 'DECLINED:1000500001:Card declined')]
+        pairs.extend([
+            ('anatransid', trans_id),
+            ('avs', 'Y'),
+            ('fulltotal', params.get('fulltotal', '')),
+            ('messageid', '100' if approved else '500'),
+            ('ordernumber', params.get('ordernumber') or trans_id),
+            ('trantype', params.get('trantype', '')),
+            ('result', 'APPROVED' if approved else 'DECLINED'),
+        ])
+        return form_encode(pairs)
+
+
+class FirstDataLegacySimulator(GatewaySimulator):
+    """
+    First Data Global Gateway (LinkPoint) XML API, answered as an unwrapped list of r_* elements
+    """
+    content_type = 'text/xml'
+
+    def decode_request(self, method, query, body):
+        order = parse_xml(body).get('order') or {}
+        return dict((name, value) for group in order.values() if isinstance(group, dict) for name, value in group.items())
+
+    def render(self, params, approved, trans_id):
+        fields = [
+            ('r_csp', ''),
+            ('r_time', time.strftime('%a %b %d %H:%M:%S %Y')),
+            ('r_ref', trans_id),
+            ('r_error', '' if approved else 'SGS-005005: Card declined.'),
+            ('r_ordernum', params.get('oid') or 'A-%s' % trans_id),
+            ('r_message', 'APPROVED' if approved else 'DECLINED'),
+            ('r_code', '%s:NNNM:100000000000:' % trans_id if approved else ''),
+            ('r_tdate', str(int(time.time()))),
+            ('r_score', ''),
+            ('r_authresponse', ''),
+            ('r_approved', 'APPROVED' if approved else 'DECLINED'),
+            ('r_avs', 'NNNM'),
+        ]
+        return ''.join('<{0}>{1}</{0}>'.format(name, value) for name, value in fields)
+
+
+# gateway class name ==> its simulator
+SIMULATORS = {
+    'AuthorizeNet': AuthorizeNetSimulator,
+    'PlugnPay': PlugnPaySimulator,
+    'PaypalWPP': PaypalWPPSimulator,
+    'USAePay': USAePaySimulator,
+    'InnovativeGW': InnovativeGWSimulator,
+    'FirstDataLegacy': FirstDataLegacySimulator,
+}
@@ -0,0 +1,142 @@
+"""test_api.py: testing the gateway base classes"""
+import threading
+import urlparse
+
+from paython.exceptions import RequestError
+from paython.lib.api import LoopbackTransport, compile_positions
+from paython.gateways import AuthorizeNet, FirstDataLegacy, PlugnPay, PaypalWPP
+
+from nose.tools import assert_equals, assert_true, assert_false, assert_raises
+
+
+def echo_trans_id(method, url, body, headers):
+    """answers AuthorizeNet requests with the trans id they were sent with"""
+    params = dict(urlparse.parse_qsl(urlparse.urlsplit(url).query))
+    return '1;1;1;Approved;AUTH;Y;%s' % params['x_trans_id']
+
+
+def test_request_state_per_transaction():
+    """testing fields set by one transaction don't leak into the next one"""
+    api = AuthorizeNet(username='test', password='testpassword')
+    api.transport = LoopbackTransport('1;1;1;Approved')
+
+    api.void('1234', split_id='99')
+    first = api.transport.last_request[1]
+    api.void('5678')
+    second = api.transport.last_request[1]
+
+    assert_true('x_split_tender_id=99' in first)
+    assert_false('x_split_tender_id' in second)
+    assert_true('x_login=test' in second)
+    assert_equals(api.REQUEST_DICT.get('x_trans_id'), None)
+
+
+def test_gateways_dont_share_defaults():
+    """testing gateway instances keep their own credentials"""
+    first = AuthorizeNet(username='first')
+    second = AuthorizeNet(username='second')
+
+    assert_equals(first.REQUEST_DICT['x_login'], 'first')
+    assert_equals(second.REQUEST_DICT['x_login'], 'second')
+
+
+def test_xml_document_per_transaction():
+    """testing XML requests don't accumulate elements across transactions"""
+    api = FirstDataLegacy(username='1329411')
+    api.transport = LoopbackTransport('<r_approved>APPROVED</r_approved><r_ordernum>1</r_ordernum>')
+
+    api.void('1')
+    api.void('2')
+    body = api.transport.last_request[2]
+
+    assert_equals(body.count('<oid>'), 1)
+    assert_true('<oid>2</oid>' in body)
+    assert_equals(body.count('<configfile>1329411</configfile>'), 1)
+
+
+def test_projected_xml_response():
+    """testing an XML gateway reading only its response fields gives the same response"""
+    response = ('<r_csp></r_csp><r_time>Wed Jan 11 12:00:00 2012</r_time><r_ref>0001234567</r_ref><r_error></r_error>'
+                '<r_ordernum>A-1</r_ordernum><r_message>APPROVED</r_message><r_authresponse></r_authresponse>'
+                '<r_approved>APPROVED</r_approved><r_avs>NNNM</r_avs>')
+    full = FirstDataLegacy(username='1329411')
+    full.transport = LoopbackTransport(response)
+    projected = FirstDataLegacy(username='1329411', project_response=True)
+    projected.transport = LoopbackTransport(response)
+
+    expected = full.void('A-1')
+    result = projected.void('A-1')
+    del expected['response_time'], result['response_time']
+
+    assert_equals(result, expected)
+    assert_equals(result['trans_id'], 'A-1')
+    assert_true(result['approved'])
+
+
+def test_malformed_xml_response():
+    """testing a malformed XML response raises the same error whether it's projected or not"""
+    for project_response in (False, True):
+        api = FirstDataLegacy(username='1329411', project_response=project_response)
+        api.transport = LoopbackTransport('<r_approved>APPROVED</r_avs>')
+        assert_raises(RequestError, api.void, 'A-1')
+
+
+def test_positional_response_mapping():
+    """testing delimited responses are mapped through the compiled index table"""
+    assert_equals(AuthorizeNet.RESPONSE_POSITIONS[:2], ((0, 'response_code', True), (1, 'response_sub_code', False)))
+
+    api = AuthorizeNet(username='test', password='testpassword')
+    mapping = {'0': 'response_code', '2': 'trans_id', '1': 'trans_id', 'x': 'ignored', '9': 'past_the_end'}
+    response = api.standardize(['1', 'first', 'second'], mapping, 0.1, True)
+
+    assert_equals(compile_positions(mapping), ((0, 'response_code', True), (1, 'trans_id', True), (2, 'trans_id', True), (9, 'past_the_end', False)))
+    assert_equals(dict(response), {'response_code': '1', 'trans_id': 'second', 'approved': True, 'response_time': '0.10'})
+
+
+def test_paypal_response():
+    """testing Paypal responses, values with '=' included, are standardized"""
+    api = PaypalWPP()
+    api.transport = LoopbackTransport('TIMESTAMP=2012%2d01%2d11T12%3a00%3a00Z&CORRELATIONID=abc%3d%3d&ACK=Success'
+                                      '&AMT=1%2e00&TRANSACTIONID=9XY&AVSCODE=X&CVV2MATCH=M')
+
+    response = api.void('9XY')
+
+    assert_true(response['approved'])
+    assert_equals(response['trans_id'], '9XY')
+    assert_equals(response['auth_code'], 'abc==')
+    assert_equals(response['amount'], '1.00')
+
+
+def test_responses_are_not_shared():
+    """testing every transaction gets its own response"""
+    api = PlugnPay(username='pnpdemo')
+    api.transport = LoopbackTransport(lambda method, url, body, headers: 'success=yes&orderID=%s' % body.split('orderID=')[1].split('&')[0])
+
+    first = api.settle('1.00', '1')
+    second = api.settle('1.00', '2')
+
+    assert_false(first is second)
+    assert_equals(first['trans_id'], '1')
+    assert_equals(second['trans_id'], '2')
+
+
+def test_concurrent_transactions():
+    """testing one gateway instance shared by many threads"""
+    api = AuthorizeNet(username='test', password='testpassword')
+    api.transport = LoopbackTransport(echo_trans_id)
+    mismatches = []
+
+    def worker(offset):
+        for i in range(50):
+            trans_id = str(offset * 1000 + i)
+            response = api.settle('1.00', trans_id)
+            if response['trans_id'] != trans_id:
+                mismatches.append((trans_id, response['trans_id']))
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert_equals(mismatches, [])
@@ -0,0 +1,111 @@
+"""test_batch.py: testing the resumable batch runner"""
+import os
+import json
+import shutil
+import tempfile
+import StringIO
+
+from paython import batch
+from paython.lib.api import LoopbackTransport
+from paython.gateways import AuthorizeNet
+
+from nose.tools import assert_equals, assert_true, with_setup
+
+TMP_DIR = None
+SETTLES = """id,operation,amount,trans_id
+a,settle,1.00,100
+b,settle,2.00,101
+c,settle,3.00,102
+d,refund,4.00,103
+"""
+
+
+def make_tmp_dir():
+    """creating a work directory"""
+    global TMP_DIR
+    TMP_DIR = tempfile.mkdtemp()
+
+
+def remove_tmp_dir():
+    """removing the work directory"""
+    shutil.rmtree(TMP_DIR)
+
+
+def gateway():
+    api = AuthorizeNet(username='test', password='testpassword')
+    api.transport = LoopbackTransport(lambda method, url, body, headers: '1;1;1;Approved;AUTH;Y;%s' % url.split('x_trans_id=')[1].split('&')[0])
+    return api
+
+
+@with_setup(make_tmp_dir, remove_tmp_dir)
+def test_run():
+    """testing every row gets a result"""
+    output = StringIO.StringIO()
+    checkpoint = batch.Checkpoint(os.path.join(TMP_DIR, 'run.checkpoint'))
+
+    counts = batch.run(gateway(), batch.read_csv(StringIO.StringIO(SETTLES)), output, checkpoint, workers=2)
+    results = dict((result['id'], result) for result in map(json.loads, output.getvalue().splitlines()))
+
+    assert_equals(counts, {'approved': 3, 'declined': 0, 'failed': 1, 'unknown': 0})
+    assert_equals(results['b']['response']['trans_id'], '101')
+    assert_equals(results['d']['status'], 'failed')
+    assert_equals(checkpoint.done, set([0, 1, 2, 3]))
+
+
+@with_setup(make_tmp_dir, remove_tmp_dir)
+def test_run_many_rows():
+    """testing results stay with their rows when many more rows than workers are in flight"""
+    settles = 'id,operation,amount,trans_id\n' + ''.join('r%d,settle,1.00,%d\n' % (i, 100 + i) for i in range(50))
+    output = StringIO.StringIO()
+    checkpoint = batch.Checkpoint(os.path.join(TMP_DIR, 'run.checkpoint'))
+
+    counts = batch.run(gateway(), batch.read_csv(StringIO.StringIO(settles)), output, checkpoint, workers=1)
+    results = map(json.loads, output.getvalue().splitlines())
+
+    assert_equals(counts['approved'], 50)
+    assert_equals(sorted(result['row'] for result in results), range(50))
+    for result in results:
+        assert_equals(result['id'], 'r%d' % result['row'])
+        assert_equals(result['response']['trans_id'], str(100 + result['row']))
+    assert_equals(checkpoint.done, set(range(50)))
+
+
+@with_setup(make_tmp_dir, remove_tmp_dir)
+def test_resume():
+    """testing a resumed run skips finished rows and doesn't resend interrupted ones"""
+    path = os.path.join(TMP_DIR, 'run.checkpoint')
+    with open(path, 'w') as log:
+        log.write('S 0\nD 0\nS 1\nD')  # crashed while row 1 was in flight
+
+    output = StringIO.StringIO()
+    checkpoint = batch.Checkpoint(path)
+    counts = batch.run(gateway(), batch.read_csv(StringIO.StringIO(SETTLES)), output, checkpoint, workers=2)
+    results = dict((result['row'], result) for result in map(json.loads, output.getvalue().splitlines()))
+
+    assert_equals(sorted(results), [1, 2, 3])
+    assert_equals(results[1]['status'], 'unknown')
+    assert_equals(results[2]['status'], 'approved')
+    assert_equals(counts['unknown'], 1)
+
+
+@with_setup(make_tmp_dir, remove_tmp_dir)
+def test_main_jsonl():
+    """testing the command line with nested JSON records"""
+    path = os.path.join(TMP_DIR, 'captures.jsonl')
+    with open(path, 'w') as stream:
+        stream.write(json.dumps({'operation': 'void', 'trans_id': '7'}) + '\n\n')
+        stream.write(json.dumps({'operation': 'capture', 'amount': '1.00', 'credit_card': {
+            'number': '4111111111111111', 'exp_mo': '12', 'exp_yr': '2030', 'full_name': 'John Doe'}}) + '\n')
+
+    AuthorizeNet.transport = LoopbackTransport('1;1;1;Approved;AUTH;Y;7')
+    try:
+        status = batch.main(['-g', 'AuthorizeNet', '-o', 'username=test', '-o', 'test=true', path])
+    finally:
+        del AuthorizeNet.transport
+
+    with open(path + '.results.jsonl') as output:
+        results = map(json.loads, output)
+
+    assert_equals(status, 0)
+    assert_equals(sorted(result['operation'] for result in results), ['capture', 'void'])
+    assert_true(all(result['status'] == 'approved' for result in results))
@@ -0,0 +1,88 @@
+"""test_bulk.py: testing bulk card validation agrees with CreditCard.validate"""
+import random
+
+from datetime import datetime
+
+from paython.exceptions import DataValidationError
+from paython.lib import bulk
+from paython.lib.bulk import validate_cards, VALID, INVALID_TYPE, INVALID_NUMBER, EXPIRED, INVALID_CVV, INVALID_EXP, MESSAGES
+from paython.lib.cc import CreditCard
+
+from nose.tools import assert_equals, raises
+
+NEXT_YEAR = str(datetime.now().year + 1)
+LAST_YEAR = str(datetime.now().year - 1)
+
+ROWS = [
+    ('4111111111111111', '12', NEXT_YEAR, '123', VALID),
+    ('378282246310005', '01', NEXT_YEAR, '1234', VALID),
+    ('5555555555554444', '%02d' % datetime.now().month, str(datetime.now().year), '123', VALID),
+    ('6011111111111117', 12, int(NEXT_YEAR), '123', VALID),
+    ('30569309025904', '12', NEXT_YEAR, '123', VALID),
+    ('2223000048400011', '12', NEXT_YEAR, '123', VALID),
+    ('3530111333300000', '12', NEXT_YEAR, '123', VALID),
+    ('3530111333300001', '12', NEXT_YEAR, '123', INVALID_NUMBER),
+    ('9111111111111111', '12', NEXT_YEAR, '123', INVALID_TYPE),
+    ('411111111111111a', '12', NEXT_YEAR, '123', INVALID_TYPE),
+    ('', '12', NEXT_YEAR, '123', INVALID_TYPE),
+    ('4111111111111112', '12', NEXT_YEAR, '123', INVALID_NUMBER),
+    ('60111111111111171', '12', NEXT_YEAR, '123', INVALID_NUMBER),
+    ('4111111111111111', '12', LAST_YEAR, '123', EXPIRED),
+    ('4111111111111111', '13', NEXT_YEAR, '123', INVALID_EXP),
+    ('4111111111111111', 'xx', NEXT_YEAR, '123', INVALID_EXP),
+    ('4111111111111111', '12', NEXT_YEAR, '1234', INVALID_CVV),
+    ('378282246310005', '12', NEXT_YEAR, '123', INVALID_CVV),
+    ('4111111111111111', '12', NEXT_YEAR, None, INVALID_CVV),
+    ('4111111111111111', '12', NEXT_YEAR, '', INVALID_CVV),
+]
+
+
+def validate_code(number, month, year, cvv):
+    """the code of the error CreditCard.validate() raises"""
+    try:
+        CreditCard(number, month, year, first_name='John', last_name='Doe', cvv=cvv, strict=True).validate()
+    except DataValidationError, e:
+        for code, message in MESSAGES.items():
+            if message == str(e):
+                return code
+    except ValueError:
+        return INVALID_EXP
+    return VALID
+
+
+def columns(rows):
+    return [list(column) for column in zip(*rows)]
+
+
+def test_codes():
+    """testing each row gets the first check it fails"""
+    numbers, months, years, cvvs, expected = columns(ROWS)
+    assert_equals(validate_cards(numbers, months, years, cvvs, strict=True, vectorized=False), expected)
+    assert_equals([validate_code(*row[:4]) for row in ROWS], expected)
+    assert_equals(validate_cards(numbers, months, years, vectorized=False),
+                  [code if code != INVALID_CVV else VALID for code in expected])
+
+
+def test_random_cards():
+    """testing random rows, in chunks, agree with CreditCard.validate()"""
+    generator = random.Random(42)
+    rows = []
+    for i in range(2000):
+        number = generator.choice(['4', '37', '51', '55', '2221', '6011', '65', '30', '36', '3528', '62', '6759', '9']) + ''.join(
+            generator.choice('0123456789') for n in range(generator.choice([11, 12, 13, 14, 15])))
+        rows.append((number, str(generator.randint(0, 13)), str(datetime.now().year + generator.randint(-2, 2)),
+                     str(generator.randint(0, 9999))))
+    expected = [validate_code(*row) for row in rows]
+
+    numbers, months, years, cvvs = columns(rows)
+    assert_equals(validate_cards(numbers, months, years, cvvs, strict=True, vectorized=False, chunksize=300), expected)
+    assert_equals(validate_cards(iter(numbers), iter(months), iter(years), iter(cvvs), strict=True, vectorized=False), expected)
+    if bulk.numpy is not None:
+        assert_equals(list(validate_cards(numbers, months, years, cvvs, strict=True, vectorized=True, chunksize=300)), expected)
+        assert_equals(list(validate_cards(*columns(ROWS)[:4], strict=True, vectorized=True)), columns(ROWS)[4])
+
+
+@raises(ValueError)
+def test_column_lengths():
+    """testing columns of different lengths are refused"""
+    validate_cards(['4111111111111111', '4111111111111111'], ['12'], [NEXT_YEAR], vectorized=False)
@@ -0,0 +1,87 @@
+"""test_cassette.py: testing recorded gateway traffic is sanitized & replayed"""
+import os
+import shutil
+import tempfile
+
+from paython.exceptions import RequestError, GatewayError
+from paython.lib.api import LoopbackTransport
+from paython.lib.cassette import RecordingTransport, ReplayTransport, load_cassette, sanitize
+from paython.lib.cc import CreditCard
+from paython.gateways import AuthorizeNet, FirstDataLegacy
+
+from nose.tools import assert_equals, assert_true, assert_false, raises, with_setup
+
+TMP_DIR = None
+APPROVED = '1;1;1;This transaction has been approved.;IL2UW7;Y;2156729380'
+
+
+def make_tmp_dir():
+    """making a directory for cassettes"""
+    global TMP_DIR
+    TMP_DIR = tempfile.mkdtemp()
+
+
+def remove_tmp_dir():
+    """removing the cassettes"""
+    shutil.rmtree(TMP_DIR)
+
+
+def credit_card():
+    return CreditCard(number='4111111111111111', exp_mo='12', exp_yr='2030', first_name='John', last_name='Doe', cvv='123')
+
+
+def test_sanitize():
+    """testing card data & credentials are masked, keeping their length"""
+    assert_equals(sanitize('x_login=test&x_card_num=4111111111111111&x_card_code=123&x_amount=1.00'),
+                  'x_login=XXXX&x_card_num=XXXXXXXXXXXXXXXX&x_card_code=XXX&x_amount=1.00')
+    assert_equals(sanitize('<order><creditcard><cardnumber>4111111111111111</cardnumber><cvmvalue>123</cvmvalue></creditcard>'
+                           '<oid>1234567890123</oid></order>'),
+                  '<order><creditcard><cardnumber>XXXXXXXXXXXXXXXX</cardnumber><cvmvalue>XXX</cvmvalue></creditcard>'
+                  '<oid>1234567890123</oid></order>')
+    assert_equals(sanitize('1;Approved;account 5555555555554444;2156729380'), '1;Approved;account XXXXXXXXXXXX4444;2156729380')
+
+
+@with_setup(make_tmp_dir, remove_tmp_dir)
+def test_record_and_replay():
+    """testing a recorded transaction replays without the original transport"""
+    path = os.path.join(TMP_DIR, 'authorize_net.jsonl')
+    api = AuthorizeNet(username='test', password='testpassword')
+    api.transport = RecordingTransport(path, LoopbackTransport(APPROVED))
+    recorded = api.auth('1.00', credit_card())
+
+    interaction, = load_cassette(path)
+    assert_false('4111111111111111' in interaction['url'])
+    assert_false('testpassword' in interaction['url'])
+    assert_equals(interaction['response'], APPROVED)
+
+    api.transport = ReplayTransport(path)
+    replayed = api.auth('2.00', credit_card())
+    assert_equals(dict(replayed), dict(recorded, response_time=replayed['response_time']))
+    assert_equals(api.transport.last_response, (200, APPROVED))
+
+
+@with_setup(make_tmp_dir, remove_tmp_dir)
+def test_replay_errors():
+    """testing failed requests replay as failures & unrecorded ones fail"""
+    def unreachable(method, url, body, headers):
+        raise RequestError('Connection refused')
+
+    path = os.path.join(TMP_DIR, 'errors.jsonl')
+    api = AuthorizeNet(username='test', password='testpassword')
+    api.transport = RecordingTransport(path, LoopbackTransport(unreachable))
+    try:
+        api.settle('1.00', '2156729380')
+    except GatewayError:
+        pass
+
+    api.transport = ReplayTransport(path)
+    try:
+        api.settle('1.00', '2156729380')
+    except GatewayError, e:
+        assert_true('Connection refused' in str(e))
+    else:
+        assert False, 'the recorded error should be raised'
+
+    firstdata = FirstDataLegacy(username='1329411')
+    firstdata.transport = ReplayTransport(path)
+    raises(RequestError)(firstdata.void)('42')
@@ -97,6 +97,24 @@ def test_invalid_cvv():
     # checking if the exception fires
     credit_card.validate()
 
+@with_setup(setup, teardown)
+@raises(DataValidationError)
+def test_missing_cvv():
+    """test if a credit card without a cvv fails strict validation"""
+    credit_card = CreditCard(
+            number = "4111111111111111",
+            exp_mo = NEXT_YEAR.strftime('%m'),
+            exp_yr = NEXT_YEAR.strftime('%Y'),
+            first_name = "John",
+            last_name = "Doe",
+            cvv = "",
+            strict = True
+    )
+
+    assert_false(credit_card.is_valid())
+
+    credit_card.validate()
+
 @with_setup(setup, teardown)
 def test_valid():
     """test if a credit card number is luhn valid"""
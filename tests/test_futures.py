@@ -0,0 +1,119 @@
+"""test_futures.py: testing gateway calls running in the background"""
+import time
+import itertools
+import threading
+
+from paython.exceptions import MissingDataError, TimeoutError, CancelledError
+from paython.lib.api import LoopbackTransport
+from paython.lib.futures import Future, WorkerPool, as_completed
+from paython.gateways import AuthorizeNet
+
+from nose.tools import assert_equals, assert_true, assert_false, raises
+
+
+def test_async_transactions():
+    """testing *_async methods return futures of the standard responses"""
+    api = AuthorizeNet(username='test', password='testpassword')
+    api.transport = LoopbackTransport(lambda method, url, body, headers: '1;1;1;Approved;AUTH;Y;%s' % url.split('x_trans_id=')[1].split('&')[0])
+
+    futures = [api.void_async(str(i)) for i in range(20)]
+
+    assert_equals([future.result(timeout=5)['trans_id'] for future in futures], [str(i) for i in range(20)])
+    assert_true(all(future.done() for future in futures))
+
+
+@raises(MissingDataError)
+def test_async_exception():
+    """testing errors are raised when reading the result"""
+    api = AuthorizeNet(username='test', password='testpassword')
+    future = api.auth_async('1.00', credit_card=None)
+
+    assert_true(isinstance(future.exception(timeout=5), MissingDataError))
+    future.result()
+
+
+def test_as_completed():
+    """testing futures come back in the order they finish"""
+    pool = WorkerPool(max_workers=2)
+    slow = pool.submit(time.sleep, 0.2)
+    fast = pool.submit(lambda: 'fast')
+
+    assert_equals(list(as_completed([slow, fast], timeout=5)), [fast, slow])
+    pool.shutdown()
+
+
+def test_done_callback():
+    """testing callbacks run once the future is finished"""
+    future = Future()
+    called = threading.Event()
+    future.add_done_callback(lambda f: called.set())
+
+    assert_false(called.is_set())
+    future.set_result('done')
+    assert_true(called.is_set())
+    assert_equals(future.result(), 'done')
+
+
+@raises(TimeoutError)
+def test_result_timeout():
+    """testing waiting on a pending future times out"""
+    Future().result(timeout=0.01)
+
+
+def test_batch():
+    """testing a batch keeps going past failed operations"""
+    api = AuthorizeNet(username='test', password='testpassword')
+    api.transport = LoopbackTransport(lambda method, url, body, headers: '1;1;1;Approved;AUTH;Y;%s' % url.split('x_trans_id=')[1].split('&')[0])
+
+    operations = (('settle', {'amount': '1.00', 'trans_id': str(i)}) for i in range(100))
+    operations = itertools.chain(operations, [('auth', {'amount': '1.00'}), ('refund', {}), 'settle'])
+    results = list(api.batch(operations, workers=4))
+
+    assert_equals(sorted(result.index for result in results), range(103))
+    for result in results:
+        if result.index < 100:
+            assert_true(result.ok)
+            assert_equals(result.response['trans_id'], str(result.index))
+
+    errors = dict((result.index, result.error) for result in results if not result.ok)
+    assert_true(isinstance(errors[100], MissingDataError))
+    assert_true(isinstance(errors[101], AttributeError))
+    assert_true(isinstance(errors[102], ValueError))
+
+
+def test_batch_closed_early():
+    """testing closing a batch cancels the operations that haven't started"""
+    started = []
+    release = threading.Event()
+
+    def respond(method, url, body, headers):
+        trans_id = url.split('x_trans_id=')[1].split('&')[0]
+        started.append(trans_id)
+        if trans_id != '0':
+            release.wait(1)
+        return '1;1;1;Approved;AUTH;Y;%s' % trans_id
+
+    api = AuthorizeNet(username='test', password='testpassword')
+    api.transport = LoopbackTransport(respond)
+
+    batch = api.batch((('settle', {'amount': '1.00', 'trans_id': str(i)}) for i in range(100)), workers=2)
+    assert_equals(next(batch).index, 0)  # 4 in flight: #0 done, #1 & maybe #2 running, the others queued
+    batch.close()
+    release.set()
+    time.sleep(0.1)
+    assert_true(set(started) <= set(['0', '1', '2']))
+
+
+def test_cancel():
+    """testing futures can be cancelled until they start running"""
+    pool = WorkerPool(max_workers=1)
+    running = pool.submit(time.sleep, 0.1)
+    queued = pool.submit(lambda: 'ran')
+    time.sleep(0.02)
+
+    assert_true(queued.cancel())
+    assert_false(running.cancel())
+    assert_true(queued.cancelled())
+    assert_true(isinstance(queued.exception(timeout=1), CancelledError))
+    assert_equals(running.result(timeout=1), None)
+    pool.shutdown()
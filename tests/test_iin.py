@@ -0,0 +1,91 @@
+"""test_iin.py: testing card brands are detected from the IIN ranges"""
+import os
+import shutil
+import tempfile
+
+from paython.lib.iin import IINTable, DEFAULT_RANGES
+from paython.lib.utils import get_card_type, is_valid_cvv
+
+from nose.tools import assert_equals, assert_true, raises, with_setup
+
+TMP_DIR = None
+
+
+def make_tmp_dir():
+    """making a directory for data files"""
+    global TMP_DIR
+    TMP_DIR = tempfile.mkdtemp()
+
+
+def remove_tmp_dir():
+    """removing the data files"""
+    shutil.rmtree(TMP_DIR)
+
+
+def test_brands():
+    """testing numbers get the brand of their range & length"""
+    brands = {
+        '4111111111111111': 'visa',
+        '4222222222222': 'visa',
+        '378282246310005': 'amex',
+        '5555555555554444': 'mc',
+        '2223000048400011': 'mc',
+        '6011111111111117': 'discover',
+        '6445644564456445': 'discover',
+        '6511111111111111': 'discover',
+        '30569309025904': 'diners',
+        '3530111333300000': 'jcb',
+        '6200000000000005': 'unionpay',
+        '6759649826438453': 'maestro',
+        '411111111111111': None,  # visa, but 15 digits
+        '2720990000000000': 'mc',
+        '2721000000000000': None,
+        '9111111111111111': None,
+        '411111111111111a': None,
+        '': None,
+    }
+    for number, brand in brands.items():
+        assert_equals(get_card_type(number), brand)
+
+
+def test_new_brands_cvv():
+    """testing brands added with the ranges have a cvv format"""
+    assert_true(is_valid_cvv('123', 'jcb'))
+    assert_true(is_valid_cvv('123', 'unionpay'))
+    assert_true(is_valid_cvv('123', 'maestro'))
+
+
+def test_longest_prefix():
+    """testing overlapping ranges resolve to the longest prefix"""
+    table = IINTable()
+    table.add('wide', '4', lengths=[16])
+    table.add('narrow', '411111', '411112', lengths=[16])
+    assert_equals(table.brand('4111111111111111'), 'narrow')
+    assert_equals(table.brand('4111121111111111'), 'narrow')
+    assert_equals(table.brand('4111131111111111'), 'wide')
+    assert_equals(table.brand('4000000000000000'), 'wide')
+
+
+@with_setup(make_tmp_dir, remove_tmp_dir)
+def test_load_data_file():
+    """testing ranges from a data file extend the default ones"""
+    path = os.path.join(TMP_DIR, 'ranges.txt')
+    with open(path, 'w') as data:
+        data.write('# brand  lengths  prefixes\n'
+                   'private  16       88881234-88881299  # store cards\n'
+                   'visa     16       411111\n')
+
+    table = IINTable(DEFAULT_RANGES)
+    table.load(path)
+    assert_equals(table.brand('8888125000000000'), 'private')
+    assert_equals(table.brand('8888130000000000'), None)
+    assert_equals(table.brand('4111111111111111'), 'visa')
+    assert_equals(table.brand('4222222222222'), 'visa')
+    assert_equals(table.brand('5555555555554444'), 'mc')
+    assert_true(is_valid_cvv('1234', 'private'))
+
+
+@raises(ValueError)
+def test_invalid_range():
+    """testing ranges with prefixes of different lengths are refused"""
+    IINTable().add('visa', '4', '49')
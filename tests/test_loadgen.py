@@ -0,0 +1,61 @@
+"""test_loadgen.py: testing the closed-loop load generator against a simulator"""
+from paython.loadgen import LoadGenerator, parse_mix, format_report
+from paython.simulators import start_simulator, RedirectTransport
+from paython.gateways import AuthorizeNet, PlugnPay, InnovativeGW
+
+from nose.tools import assert_equals, assert_true, raises
+
+
+def run_load(gateway, simulator=None, **options):
+    server = start_simulator(gateway, **(simulator or {}))
+    try:
+        api = gateway()
+        api.transport = RedirectTransport(server.url)
+        return LoadGenerator(api, **options).run(), server.simulator.counts
+    finally:
+        server.stop()
+
+
+def test_scenario_mix():
+    """testing scenarios run their operations & are reported per operation"""
+    report, counts = run_load(AuthorizeNet, clients=3, transactions=30, mix='auth_settle:1,void:1', seed=1)
+
+    operations = report['operations']
+    assert_equals(operations['auth']['count'], operations['settle']['count'])
+    assert_equals(operations['void']['count'], operations['capture']['count'])
+    assert_equals(operations['auth']['count'] + operations['void']['count'], 30)
+    assert_equals(report['count'], 60)
+    assert_equals(operations['settle']['error_rate'], 0.0)
+    assert_true(0 < operations['settle']['p50'] <= operations['settle']['p999'])
+    assert_true('settle' in format_report(report))
+
+
+def test_gateway_signatures():
+    """testing operations get the ids their gateway's signature asks for"""
+    report, counts = run_load(InnovativeGW, clients=1, transactions=4, mix='credit')
+    assert_equals(report['operations']['credit']['count'], 4)
+    assert_equals(report['operations']['credit']['decline_rate'], 0.0)
+
+
+def check_rates(gateway):
+    simulator = dict(decline_rate=0.1, error_rate=0.05, errors=['status', 'garbage'], seed=7)
+    report, counts = run_load(gateway, simulator, clients=4, transactions=600, mix='capture')
+
+    capture = report['operations']['capture']
+    assert_equals(capture['count'], 600)
+    assert_equals(int(round(capture['error_rate'] * 600)), counts['error'])
+    assert_equals(int(round(capture['decline_rate'] * 600)), counts['declined'])
+    assert_true(0.02 < capture['error_rate'] < 0.08)
+    assert_true(0.06 < capture['decline_rate'] < 0.13)
+
+
+def test_error_and_decline_rates():
+    """testing injected errors are reported as errors, not declines"""
+    for gateway in (AuthorizeNet, PlugnPay):
+        yield check_rates, gateway
+
+
+@raises(ValueError)
+def test_unknown_scenario():
+    """testing unknown scenarios are refused"""
+    parse_mix('auth_settle:50,refund:50')
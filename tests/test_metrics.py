@@ -0,0 +1,56 @@
+"""test_metrics.py: testing latency histograms & the metrics exporters"""
+from paython.exceptions import RequestError
+from paython.lib.api import LoopbackTransport
+from paython.lib.metrics import LatencyHistogram, GatewayMetrics
+from paython.gateways import AuthorizeNet
+
+from nose.tools import assert_equals, assert_true, assert_raises
+
+
+def test_histogram_percentiles():
+    """testing percentiles stay within the histogram's precision"""
+    histogram = LatencyHistogram()
+    for millis in range(1, 1001):
+        histogram.record(millis / 1000.0)
+
+    assert_equals(histogram.count, 1000)
+    assert_equals(histogram.min, 0.001)
+    assert_equals(histogram.max, 1.0)
+    for quantile, expected in ((0.5, 0.5), (0.99, 0.99), (0.999, 0.999)):
+        assert_true(abs(histogram.percentile(quantile) - expected) <= expected / 64, quantile)
+    assert_true(len(histogram.buckets) < 600)
+
+
+def test_gateway_metrics():
+    """testing transactions are counted per gateway, operation & outcome"""
+    responses = ['1;1;1;This transaction has been approved.;IL2UW7;Y;2156729380',
+                 '2;1;2;This transaction has been declined.;;Y;2156729381']
+
+    def responder(method, url, body, headers):
+        if not responses:
+            raise RequestError('unreachable')
+        return responses.pop(0)
+
+    metrics = GatewayMetrics()
+    api = AuthorizeNet(username='test', password='testpassword')
+    api.transport = LoopbackTransport(responder)
+    metrics.install()
+    try:
+        api.settle('1.00', '2156729380')
+        api.settle('1.00', '2156729381')
+        assert_raises(Exception, api.void, '2156729382')
+    finally:
+        metrics.uninstall()
+
+    series = dict(((s['operation'], s['outcome']), s['count']) for s in metrics.snapshot())
+    assert_equals(series, {('settle', 'approved'): 1, ('settle', 'declined'): 1, ('void', 'error'): 1})
+    assert_equals(metrics.histogram(gateway='AuthorizeNet', operation='settle').count, 2)
+
+    text = metrics.prometheus()
+    assert_true('# TYPE paython_gateway_latency_seconds summary' in text)
+    assert_true('paython_gateway_transactions_total{gateway="AuthorizeNet",operation="void",outcome="error"} 1\n' in text)
+    assert_true('paython_gateway_latency_seconds{gateway="AuthorizeNet",operation="settle",outcome="approved",quantile="0.99"}' in text)
+
+    exported = []
+    metrics.export(exported.append)
+    assert_equals(len(exported[0]), 3)
@@ -0,0 +1,155 @@
+"""test_pool.py: testing keep-alive connection pooling against a local HTTP/1.1 server"""
+import time
+import socket
+import struct
+import threading
+import BaseHTTPServer
+import SocketServer
+
+from paython.exceptions import RequestError
+from paython.lib.pool import ConnectionPool, PoolManager
+
+from nose.tools import assert_equals, assert_true, assert_false, assert_raises, with_setup, raises
+
+SERVER = None
+HITS = []
+
+
+class KeepAliveHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.getheader('content-length', 0)))
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.startswith('/slow'):
+            time.sleep(0.5)
+        if self.path == '/reset':  # resets the connection after reading the request
+            HITS.append(self.path)
+            self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+            self.rfile.close()
+            self.wfile.close()
+            self.connection.close()
+            return
+        if self.path == '/close-once':  # closes without answering the first time
+            HITS.append(self.path)
+            if len(HITS) == 1:
+                self.close_connection = 1
+                return
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(self.path)))
+        self.end_headers()
+        self.wfile.write(self.path)
+
+    def log_message(self, *args):
+        pass
+
+
+class Server(SocketServer.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass  # clients hanging up on the slow handler
+
+
+def start_server():
+    """starting a local server"""
+    global SERVER
+    del HITS[:]
+    SERVER = Server(('127.0.0.1', 0), KeepAliveHandler)
+    thread = threading.Thread(target=SERVER.serve_forever)
+    thread.daemon = True
+    thread.start()
+
+
+def stop_server():
+    """stopping the local server"""
+    SERVER.shutdown()
+    SERVER.server_close()
+
+
+@with_setup(start_server, stop_server)
+def test_connection_reuse():
+    """testing back to back requests reuse the same socket"""
+    pool = ConnectionPool('127.0.0.1', SERVER.server_address[1], scheme='http')
+
+    assert_equals(pool.urlopen('POST', '/', 'first'), (200, 'first'))
+    connection = pool._idle[-1][0]
+
+    assert_equals(pool.urlopen('POST', '/', 'second'), (200, 'second'))
+    assert_true(pool._idle[-1][0] is connection)
+    assert_equals(len(pool._idle), 1)
+
+
+@with_setup(start_server, stop_server)
+def test_idle_eviction():
+    """testing connections idle for too long are not reused"""
+    pool = ConnectionPool('127.0.0.1', SERVER.server_address[1], scheme='http', idle_timeout=-1)
+    pool.urlopen('POST', '/', 'first')
+    connection = pool._idle[-1][0]
+
+    pool.urlopen('POST', '/', 'second')
+    assert_false(pool._idle[-1][0] is connection)
+
+
+@with_setup(start_server, stop_server)
+def test_dropped_connection():
+    """testing a connection closed under us is replaced"""
+    pool = ConnectionPool('127.0.0.1', SERVER.server_address[1], scheme='http')
+    pool.urlopen('POST', '/', 'first')
+    pool._idle[-1][0].sock.close()
+
+    assert_equals(pool.urlopen('POST', '/', 'second'), (200, 'second'))
+
+
+@with_setup(start_server, stop_server)
+def test_closed_without_status():
+    """testing a reused connection closed before any status line is retried"""
+    pool = ConnectionPool('127.0.0.1', SERVER.server_address[1], scheme='http')
+    pool.urlopen('POST', '/', 'first')
+
+    assert_equals(pool.urlopen('GET', '/close-once'), (200, '/close-once'))
+    assert_equals(len(HITS), 2)
+
+
+@with_setup(start_server, stop_server)
+def test_reset_after_send():
+    """testing a reused connection reset once the request was sent isn't retried"""
+    pool = ConnectionPool('127.0.0.1', SERVER.server_address[1], scheme='http')
+    pool.urlopen('POST', '/', 'first')
+
+    assert_raises(RequestError, pool.urlopen, 'GET', '/reset')
+    assert_equals(HITS, ['/reset'])
+
+
+def test_pool_per_host():
+    """testing the manager hands out one pool per host"""
+    manager = PoolManager(maxsize=2)
+    pool = manager.connection_pool('example.com', 443)
+
+    assert_true(manager.connection_pool('example.com', '443') is pool)
+    assert_false(manager.connection_pool('example.org', 443) is pool)
+    assert_equals(pool.maxsize, 2)
+
+
+@with_setup(start_server, stop_server)
+def test_manager_urlopen():
+    """testing requests by absolute url go through the host's pool"""
+    manager = PoolManager()
+    url = 'http://127.0.0.1:%s/gate?x_amount=1.00' % SERVER.server_address[1]
+
+    assert_equals(manager.urlopen('GET', url), (200, '/gate?x_amount=1.00'))
+    assert_equals(manager.urlopen('GET', url), (200, '/gate?x_amount=1.00'))
+    assert_equals(len(manager.pools), 1)
+
+
+@with_setup(start_server, stop_server)
+@raises(RequestError)
+def test_read_timeout():
+    """testing a slow gateway hits the read timeout"""
+    manager = PoolManager(read_timeout=0.1)
+    manager.urlopen('GET', 'http://127.0.0.1:%s/slow' % SERVER.server_address[1])
@@ -0,0 +1,46 @@
+"""test_profiling.py: testing the sampled profiling of transactions"""
+from StringIO import StringIO
+
+from paython.lib import profiling
+from paython.lib.api import LoopbackTransport
+from paython.gateways import AuthorizeNet
+
+from nose.tools import assert_equals, assert_true, with_setup
+
+
+def reset_profiling():
+    """turning profiling off"""
+    profiling.disable_profiling()
+    profiling.reset_profile()
+
+
+@with_setup(reset_profiling, reset_profiling)
+def test_profiled_transactions():
+    """testing sampled transactions are profiled & aggregated"""
+    api = AuthorizeNet(username='test', password='testpassword')
+    api.transport = LoopbackTransport('1;1;1;This transaction has been approved.;IL2UW7;Y;2156729380')
+
+    api.settle('1.00', '2156729380')
+    assert_equals(profiling.profile_stats(), (None, 0))
+
+    profiling.enable_profiling(1.0)
+    for i in range(3):
+        api.settle('1.00', '2156729380')
+
+    stats, transactions = profiling.profile_stats()
+    assert_equals(transactions, 3)
+
+    report = StringIO()
+    profiling.dump_profile(report)
+    assert_true('Paython profile of 3 transactions' in report.getvalue())
+    assert_true('(settle)' in report.getvalue())
+
+
+@with_setup(reset_profiling, reset_profiling)
+def test_profiling_environment():
+    """testing PAYTHON_PROFILE switches profiling on"""
+    profiling.configure_from_environment({'PAYTHON_PROFILE': '0.25'})
+    assert_equals(profiling._settings['fraction'], 0.25)
+
+    profiling.configure_from_environment({'PAYTHON_PROFILE': 'often'})
+    assert_equals(profiling._settings['fraction'], 0.25)
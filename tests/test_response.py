@@ -0,0 +1,111 @@
+"""test_response.py: testing the standardized gateway response"""
+import json
+import pickle
+
+from paython.exceptions import GatewayError
+from paython.lib.response import GatewayResponse
+from paython.lib.api import LoopbackTransport
+from paython.gateways import AuthorizeNet, PlugnPay
+
+from nose.tools import assert_equals, assert_true, assert_false, raises
+
+
+def test_fields_and_dict_view():
+    """testing a response reads as attributes & as the old dict"""
+    response = GatewayResponse(approved=True, trans_id='123', response_time=0.5512, cvc_check='pass')
+
+    assert_equals(response.trans_id, '123')
+    assert_equals(response.avs_response, None)
+    assert_equals(response.cvc_check, 'pass')
+    assert_equals(response.response_time, 0.5512)
+    assert_equals(response['response_time'], '0.55')
+    assert_equals(response.get('avs_response', 'none'), 'none')
+    assert_false('avs_response' in response)
+    assert_equals(dict(response), {'approved': True, 'trans_id': '123', 'response_time': '0.55', 'cvc_check': 'pass'})
+    assert_equals(json.loads(json.dumps(response.to_dict()))['trans_id'], '123')
+
+
+@raises(KeyError)
+def test_missing_key():
+    """testing missing fields raise KeyError like a dict"""
+    GatewayResponse(approved=False)['trans_id']
+
+
+def test_pickle():
+    """testing responses can be stored"""
+    response = GatewayResponse(approved=True, trans_id='1', response_time=1.23456, extra='x')
+
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        copy = pickle.loads(pickle.dumps(response, protocol))
+        assert_equals(copy, response)
+        assert_equals(copy.response_time, 1.23456)
+
+
+def test_standardized_responses():
+    """testing every transaction returns its own response object"""
+    api = AuthorizeNet(username='test', password='testpassword')
+    api.transport = LoopbackTransport('1;1;1;This transaction has been approved.;IL2UW7;Y;2156729380')
+
+    first = api.settle('1.00', '2156729380')
+    second = api.settle('1.00', '2156729380')
+    first['trans_id'] = 'changed'
+
+    assert_true(isinstance(first, GatewayResponse))
+    assert_equals(second.trans_id, '2156729380')
+    assert_true(first.approved)
+    assert_true(isinstance(first.response_time, float))
+
+
+def test_lazy_columns():
+    """testing delimited responses decode the columns read only"""
+    api = AuthorizeNet(username='test', password='testpassword')
+    raw = '1;1;1;This transaction has been approved.;IL2UW7;Y;2156729380;;;0.05;CC;auth_only'
+    response = api.parse(raw, 0.5)
+
+    assert_equals(response._extra, None)
+    assert_equals(response.trans_id, '2156729380')
+    assert_equals(response['avs_response'], 'Y')
+    assert_equals(response._extra, None)
+    assert_false('ship_to_zip_code' in response)
+
+    expected = api.standardize(raw.split(';'), api.RESPONSE_KEYS, 0.5, True)
+    assert_equals(dict(response), dict(expected))
+
+
+def test_lazy_urlencoded():
+    """testing PlugnPay's messages are worked out when read"""
+    api = PlugnPay()
+    response = api.parse('FinalStatus=success&success=yes&sresp=A&resp-code=00&avs-code=Y&card-type=VISA'
+                         '&orderID=123&auth-code=TSTAUT|', 0.5)
+
+    assert_true(response.approved)
+    assert_equals(response['trans_id'], '123')
+    assert_equals(response.auth_code, 'TSTAUT')
+    assert_equals(response['response_text'], PlugnPay.SIMPLE_STATUS_RESPONSE_KEYS['A'])
+    assert_equals(response['avs_response_text'], PlugnPay.AVS_RESPONSE_KEYS['VISA']['Y'])
+    assert_false('fraud_level' in response)
+    assert_equals(len(dict(response)), 10)
+    assert_equals(response._source, None)
+
+
+@raises(KeyError)
+def test_urlencoded_without_status():
+    """testing a PlugnPay response without a transaction status fails when parsed"""
+    PlugnPay().parse('<html>Internal Server Error</html>', 0.5)
+
+
+@raises(GatewayError)
+def test_urlencoded_unknown_code():
+    """testing unknown AVS codes aren't taken for missing fields"""
+    response = PlugnPay().parse('FinalStatus=success&success=yes&avs-code=?&card-type=VISA|', 0.5)
+    assert_true('avs_response_text' in response)
+    dict(response)
+
+
+def test_repr_unknown_code():
+    """testing repr() of a response with a value it can't decode shows the fields decoded so far"""
+    response = PlugnPay().parse('FinalStatus=success&success=yes&avs-code=Q&card-type=VISA&orderID=123|', 0.5)
+    assert_true(repr(response).startswith('<GatewayResponse -- {'))
+    assert_true('undecoded>>' in repr(response))
+    assert_equals(response.trans_id, '123')
+    assert_true("'trans_id': '123'" in repr(response).replace("u'", "'"))
@@ -0,0 +1,86 @@
+"""test_simulators.py: testing gateways against the local gateway simulators"""
+from paython.exceptions import GatewayError
+from paython.lib.cc import CreditCard
+from paython.simulators import start_simulator, simulator_for, parse_latency, RedirectTransport
+from paython.gateways import AuthorizeNet, PlugnPay, PaypalWPP, InnovativeGW, FirstDataLegacy
+from paython.gateways.usaepay import USAePay
+
+from nose.tools import assert_equals, assert_true, assert_false, raises
+
+GATEWAYS = (AuthorizeNet, PlugnPay, PaypalWPP, USAePay, InnovativeGW, FirstDataLegacy)
+
+
+def credit_card():
+    return CreditCard(number='4111111111111111', exp_mo='12', exp_yr='2030', first_name='John', last_name='Doe', cvv='123')
+
+
+def check_gateway(gateway, decline_rate):
+    server = start_simulator(gateway, decline_rate=decline_rate)
+    try:
+        api = gateway()
+        api.transport = RedirectTransport(server.url)
+        response = api.auth('1.00', credit_card(), {'address': '1 Main St', 'zipcode': '33432'})
+    finally:
+        server.stop()
+
+    assert_equals(response.approved, not decline_rate)
+    if response.approved:
+        assert_true(response.trans_id)
+    assert_equals(server.simulator.counts['declined'], 1 if decline_rate else 0)
+
+
+def test_gateway_simulators():
+    """testing every simulated gateway approves & declines in its own wire format"""
+    for gateway in GATEWAYS:
+        for decline_rate in (0.0, 1.0):
+            yield check_gateway, gateway, decline_rate
+
+
+@raises(GatewayError)
+def test_dropped_connection():
+    """testing injected errors reach the gateway"""
+    server = start_simulator('AuthorizeNet', error_rate=1.0, errors=['disconnect'])
+    try:
+        api = AuthorizeNet()
+        api.transport = RedirectTransport(server.url)
+        api.settle('1.00', '1234')
+    finally:
+        server.stop()
+
+
+def check_injected_error(gateway, error):
+    server = start_simulator(gateway, error_rate=1.0, errors=[error])
+    try:
+        api = gateway()
+        api.transport = RedirectTransport(server.url)
+        api.auth('1.00', credit_card(), {'address': '1 Main St', 'zipcode': '33432'})
+    except Exception:
+        pass
+    else:
+        assert False, '%s should fail on an injected %s error, not answer it as a decline' % (gateway.__name__, error)
+    finally:
+        server.stop()
+
+
+def test_injected_errors():
+    """testing 500 answers & unparseable bodies fail the transaction"""
+    for gateway in GATEWAYS:
+        for error in ('status', 'garbage'):
+            yield check_injected_error, gateway, error
+
+
+def test_outcome_rates():
+    """testing decline & error rates are honoured"""
+    simulator = simulator_for(PlugnPay, decline_rate=0.2, error_rate=0.1, seed=1)
+    outcomes = [simulator.roll() for i in range(10000)]
+
+    assert_true(850 < simulator.counts['error'] < 1150)
+    assert_true(1600 < outcomes.count('declined') < 2000)
+    assert_false(set(outcomes) - set(['approved', 'declined', 'status', 'garbage', 'disconnect', 'stall']))
+
+
+def test_parse_latency():
+    """testing latency distributions are read from strings"""
+    assert_equals(parse_latency('0.25')(), 0.25)
+    assert_true(0.1 <= parse_latency('uniform:0.1,0.2')() <= 0.2)
+    assert_true(parse_latency('lognormal:0.08,0.5')() > 0)
@@ -0,0 +1,94 @@
+"""test_timing.py: testing the per-phase timings of gateway transactions"""
+import sys
+import time
+
+from paython.exceptions import RequestError, GatewayError
+from paython.lib.api import LoopbackTransport
+from paython.lib.pool import ConnectionPool
+from paython.lib.timing import Timings, start_timings, stop_timings, add_timing_hook, remove_timing_hook
+from paython.gateways import AuthorizeNet
+
+from nose.tools import assert_equals, assert_true, raises
+
+import test_pool
+
+
+def test_response_timings():
+    """testing every response carries its timings & hooks see them"""
+    def responder(method, url, body, headers):
+        time.sleep(0.05)
+        return '1;1;1;This transaction has been approved.;IL2UW7;Y;2156729380'
+
+    calls = []
+
+    def hook(gateway, operation, timings, response, error):
+        calls.append((gateway, operation, timings, response, error))
+
+    api = AuthorizeNet(username='test', password='testpassword')
+    api.transport = LoopbackTransport(responder)
+    add_timing_hook(hook)
+    try:
+        response = api.settle('1.00', '2156729380')
+    finally:
+        remove_timing_hook(hook)
+
+    timings = response.timings
+    assert_true(isinstance(timings, Timings))
+    assert_true(timings.wait >= 0.05)
+    assert_equals(timings.connect, 0.0)  # loopback doesn't report its phases
+    assert_true(abs(sum(timings.as_dict().values()) - timings.total) < 1e-6)
+    assert_equals(calls, [(api, 'settle', timings, response, None)])
+
+
+@raises(GatewayError)
+def test_failed_transaction_timings():
+    """testing hooks get the error of a failed transaction & a failing hook doesn't break it"""
+    errors = []
+
+    def hook(gateway, operation, timings, response, error):
+        errors.append(error)
+
+    def broken_hook(*args):
+        raise ValueError('broken')
+
+    def responder(method, url, body, headers):
+        raise RequestError('unreachable')
+
+    api = AuthorizeNet(username='test', password='testpassword')
+    api.transport = LoopbackTransport(responder)
+    add_timing_hook(broken_hook)
+    add_timing_hook(hook)
+    try:
+        api.settle('1.00', '2156729380')
+    finally:
+        remove_timing_hook(broken_hook)
+        remove_timing_hook(hook)
+        assert_true(isinstance(errors[0], GatewayError))
+
+
+def test_pool_phases():
+    """testing pooled requests report connect, send, wait & read"""
+    test_pool.start_server()
+    try:
+        pool = ConnectionPool('127.0.0.1', test_pool.SERVER.server_address[1], scheme='http')
+        timings = start_timings()
+        try:
+            pool.urlopen('GET', '/slow')
+        finally:
+            stop_timings()
+    finally:
+        test_pool.stop_server()
+
+    assert_true(timings.connect > 0)
+    assert_true(timings.wait >= 0.5)
+    assert_equals(timings.build, 0.0)
+
+
+def test_monotonic_clock():
+    """testing phases are timed with a monotonic clock where the platform has one"""
+    from paython.lib import timing
+    if sys.platform.startswith('linux'):
+        assert_true(timing.clock is not time.time)
+    first = timing.clock()
+    time.sleep(0.01)
+    assert_true(0.005 < timing.clock() - first < 1)
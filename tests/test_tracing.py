@@ -0,0 +1,69 @@
+"""test_tracing.py: testing tracers see the stages of a transaction"""
+from paython.exceptions import RequestError
+from paython.lib.api import LoopbackTransport
+from paython.lib.cc import CreditCard
+from paython.lib.tracing import add_tracer, remove_tracer
+from paython.gateways import PlugnPay
+
+from nose.tools import assert_equals, assert_true, assert_raises
+
+
+class Recorder(object):
+    def __init__(self):
+        self.events = []
+
+    def start(self, gateway, stage, name):
+        self.events.append(('start', stage, name))
+        return name
+
+    def finish(self, span, error):
+        self.events.append(('finish', span, error))
+
+
+def test_transaction_spans():
+    """testing spans nest around translation, request, send & parse"""
+    credit_card = CreditCard(number='4111111111111111', exp_mo='12', exp_yr='2030', first_name='John', last_name='Doe', cvv='123')
+    api = PlugnPay(username='pnpdemo')
+    api.transport = LoopbackTransport('success=yes&sresp=A&orderID=1234&card-amount=1.00')
+
+    recorder = Recorder()
+    add_tracer(recorder.start, recorder.finish)
+    try:
+        api.capture('1.00', credit_card, billing_info={'address': '123 Main St'})
+    finally:
+        remove_tracer(recorder.start, recorder.finish)
+
+    starts = [(stage, name) for event, stage, name in recorder.events if event == 'start']
+    assert_equals(starts[0], ('transaction', 'capture'))
+    for span in (('translate', 'use_credit_card'), ('translate', 'set_billing_info'), ('request', 'request'),
+                 ('send', 'send_request'), ('parse', 'parse')):
+        assert_true(span in starts, span)
+    assert_equals(recorder.events[-1], ('finish', 'capture', None))
+
+    # spans finish in the reverse order they start
+    open_spans = []
+    for event, stage, name in recorder.events:
+        if event == 'start':
+            open_spans.append(name)
+        else:
+            assert_equals(open_spans.pop(), stage)
+
+
+def test_failed_span():
+    """testing a span gets the error its stage raised"""
+    def responder(method, url, body, headers):
+        raise RequestError('unreachable')
+
+    api = PlugnPay(username='pnpdemo')
+    api.transport = LoopbackTransport(responder)
+
+    recorder = Recorder()
+    add_tracer(recorder.start, recorder.finish)
+    try:
+        assert_raises(Exception, api.settle, '1.00', '1234')
+    finally:
+        remove_tracer(recorder.start, recorder.finish)
+
+    finished = dict((span, error) for event, span, error in recorder.events if event == 'finish')
+    assert_true(isinstance(finished['send_request'], RequestError))
+    assert_true(finished['settle'] is not None)
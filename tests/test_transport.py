@@ -0,0 +1,114 @@
+"""test_transport.py: testing gateways sending through pluggable transports"""
+import json
+
+import stripe
+
+from paython.lib.api import LoopbackTransport
+from paython.lib.cc import CreditCard
+from paython.gateways import AuthorizeNet, FirstDataLegacy, PlugnPay, Stripe
+
+from nose.tools import assert_equals, assert_true
+
+
+def credit_card():
+    return CreditCard(number='4111111111111111', exp_mo='12', exp_yr='2030', first_name='John', last_name='Doe', cvv='123')
+
+
+def test_loopback_get_gateway():
+    """testing a GET gateway answered in process"""
+    api = AuthorizeNet(username='test', password='testpassword', test=True)
+    api.transport = LoopbackTransport('1;1;1;This transaction has been approved.;IL2UW7;Y;2156729380')
+
+    response = api.void('2156729380')
+    method, url, body, headers, connection_kwargs = api.transport.last_request
+
+    assert_equals(method, 'GET')
+    assert_true(url.startswith(AuthorizeNet.API_URI['test']))
+    assert_true('x_trans_id=2156729380' in url)
+    assert_true(response['approved'])
+    assert_equals(response['trans_id'], '2156729380')
+
+
+def test_loopback_post_gateway():
+    """testing a POST gateway answered by a callable"""
+    def responder(method, url, body, headers):
+        assert_true('orderID=1234' in body)
+        return 200, 'success=yes&sresp=A&orderID=1234&card-amount=1.00'
+
+    api = PlugnPay(username='pnpdemo')
+    api.transport = LoopbackTransport(responder)
+
+    response = api.settle('1.00', '1234')
+    assert_true(response['approved'])
+    assert_equals(response['amount'], '1.00')
+
+
+def test_loopback_xml_gateway():
+    """testing an XML gateway keeps its port and certificate settings"""
+    api = FirstDataLegacy(username='1329411', key_file='key.pem', cert_file='cert.pem')
+    api.transport = LoopbackTransport('<r_approved>APPROVED</r_approved><r_ordernum>42</r_ordernum>')
+
+    response = api.void('42')
+    method, url, body, headers, connection_kwargs = api.transport.last_request
+
+    assert_equals(url, 'https://secure.linkpt.net:1129/LSGSXML')
+    assert_equals(connection_kwargs, {'key_file': 'key.pem', 'cert_file': 'cert.pem'})
+    assert_true('<oid>42</oid>' in body)
+    assert_true(response['approved'])
+    assert_equals(response['trans_id'], '42')
+
+
+def test_loopback_stripe():
+    """testing the stripe library sends through our transport"""
+    charge = {'id': 'ch_1', 'object': 'charge', 'amount': 500, 'failure_message': None, 'amount_refunded': 0}
+
+    api = Stripe(username='sk_test')
+    api.transport = LoopbackTransport(json.dumps(charge))
+
+    response = api.capture('5.00', credit_card(), billing_info={})
+    method, url, body, headers, connection_kwargs = api.transport.last_request
+
+    assert_equals(method, 'POST')
+    assert_equals(url, 'https://api.stripe.com/v1/charges')
+    assert_true(response['approved'])
+    assert_equals(response['trans_id'], 'ch_1')
+    assert_equals(response['amount'], '5.00')
+
+
+def test_stripe_transport_per_gateway():
+    """testing each Stripe gateway sends through its own transport"""
+    charge = {'id': 'ch_1', 'object': 'charge', 'amount': 500, 'failure_message': None, 'amount_refunded': 0}
+
+    first = Stripe(username='sk_test')
+    first.transport = LoopbackTransport(json.dumps(charge))
+    second = Stripe(username='sk_test')
+    second.transport = LoopbackTransport(json.dumps(dict(charge, id='ch_2')))
+
+    assert_equals(first.capture('5.00', credit_card(), billing_info={})['trans_id'], 'ch_1')
+    assert_equals(second.capture('5.00', credit_card(), billing_info={})['trans_id'], 'ch_2')
+
+
+def test_stripe_calls_outside_gateways():
+    """testing stripe calls made outside of a Stripe gateway keep going to stripe's own client"""
+    charge = {'id': 'ch_1', 'object': 'charge', 'amount': 500, 'failure_message': None, 'amount_refunded': 0}
+    sent = []
+
+    class RecordingClient(stripe.http_client.HTTPClient):
+        name = 'recording'
+
+        def request(self, method, url, headers, post_data=None):
+            sent.append(url)
+            return json.dumps(dict(charge, id='ch_native')), 200, {}
+
+    previous = stripe.default_http_client
+    stripe.default_http_client = RecordingClient()
+    try:
+        api = Stripe(username='sk_test')
+        api.transport = LoopbackTransport(json.dumps(charge))
+        assert_equals(api.capture('5.00', credit_card(), billing_info={})['trans_id'], 'ch_1')
+        assert_equals(sent, [])
+
+        assert_equals(stripe.Charge.retrieve('ch_native', api_key='sk_test').id, 'ch_native')
+        assert_equals(sent, ['https://api.stripe.com/v1/charges/ch_native'])
+    finally:
+        stripe.default_http_client = previous
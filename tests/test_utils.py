@@ -1,5 +1,8 @@
 from paython.exceptions import GatewayError
-from paython.lib.utils import parse_xml, is_valid_email
+import urlparse
+import xml.dom.minidom
+
+from paython.lib.utils import parse_xml, parse_dom, parse_fields, parse_urlencoded, is_valid_email
 
 from nose.tools import assert_equals, raises
 
@@ -36,6 +39,39 @@ def test_append_to_root():
 
     assert_equals(result, expected)
 
+def test_interleaved_repeats():
+    """testing repeated elements separated by other elements"""
+    result = parse_xml("<lol><a>1</a><b>2</b><a>3</a><b>4</b><a>5</a></lol>")
+    expected = {u'lol': {u'a': [u'1', u'3', u'5'], u'b': [u'2', u'4']}}
+
+    assert_equals(result, expected)
+
+def test_streaming_matches_dom():
+    """testing the streaming parser gives the same dicts as the minidom one"""
+    response = ("<?xml version=\"1.0\"?><r xmlns:s=\"urn:s\"><!--c--><s:a x=\"\"><![CDATA[<b>]]></s:a>"
+                "<c>  </c><d> t &amp; u <e/> v </d><f><![CDATA[1]]><![CDATA[2]]>3</f><g y=\"1\"><h>2</h></g></r>")
+
+    assert_equals(parse_xml(response), parse_dom(response))
+    assert_equals(parse_xml(xml.dom.minidom.parseString(response)), parse_dom(response))
+
+def test_parse_fields():
+    """testing reading only some elements of a response"""
+    fragment = "<r_avs>YYY</r_avs><r_ordernum> 12 </r_ordernum><r_ref></r_ref><r_ordernum>13</r_ordernum><big><x>1</x></big>"
+
+    assert_equals(parse_fields(fragment, ['r_ordernum', 'r_ref', 'r_missing']), {u'r_ordernum': u'12', u'r_ref': None})
+    assert_equals(parse_fields('<?xml version="1.0"?><doc><a>1</a><b>2</b></doc>', ['b']), {u'b': u'2'})
+
+def test_parse_urlencoded():
+    """testing the urlencoded response decoder"""
+    response = b"UMresult=A&UMerror=Approved+ok&UMrefNum=123&UMempty=&UMtoken=a%3Db%3Dc&broken&UMresult=D"
+
+    assert_equals(parse_urlencoded(response, blank=False), dict(urlparse.parse_qsl(response)))
+    assert_equals(parse_urlencoded(response, keys=['UMresult', 'UMtoken']), {'UMresult': 'D', 'UMtoken': 'a=b=c'})
+    assert_equals(parse_urlencoded(b"ACK=Success&L_LONGMESSAGE0=A+B%20C&TOKEN=EC-1=", lower=True, plus=False),
+                  {'ack': 'Success', 'l_longmessage0': 'A+B C', 'token': 'EC-1='})
+    assert_equals(parse_urlencoded(b"FinalStatus=success&auth-code=|ABC123 |", strip='| '),
+                  {'FinalStatus': 'success', 'auth-code': 'ABC123'})
+
 def test_valid_email():
     """testing our email validation"""
     assert_equals(is_valid_email("lol@lol.com") is None, False)
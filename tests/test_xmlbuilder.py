@@ -0,0 +1,89 @@
+"""test_xmlbuilder.py: testing the XML request builder"""
+import xml.dom.minidom
+
+from paython.lib.xmlbuilder import XMLBuilder
+from paython.lib.api import LoopbackTransport
+from paython.lib.cc import CreditCard
+from paython.gateways import FirstDataLegacy
+
+from nose.tools import assert_equals, assert_true
+
+CALLS = [
+    ('order/merchantinfo/configfile', '1329411', False),
+    ('order/orderoptions/result', 'Good', False),
+    ('order/billing/name', 'John Doe', False),
+    ('order/billing/address1', '123 Main & 1st <St> "A"', False),
+    ('order/billing/zip', 33432, False),
+    ('order/payment/chargetotal', '1.00', 'currency:USD|type:sale'),
+    ('order/items', (('item', 'pen', 'sku:1'), ('item', 'ink'), ('empty',)), False),
+    ('order/notes', None, False),
+]
+
+
+def minidom_xml(calls):
+    """the request the gateway built with minidom"""
+    doc = xml.dom.minidom.Document()
+    for path, child, attribute in calls:
+        xml_path = path.split('/')
+        envelope = doc
+        for element_name in xml_path:
+            element = envelope.getElementsByTagName(element_name)
+            if element:
+                element = element[0]
+            if not element or element_name == xml_path[-1]:
+                element = doc.createElement(element_name)
+                envelope.appendChild(element)
+            envelope = element
+        if child:
+            if isinstance(child, tuple):
+                for obj in child:
+                    node = doc.createElement(obj[0])
+                    if len(obj) >= 2:
+                        node.appendChild(doc.createTextNode(str(obj[1])))
+                    if len(obj) == 3:
+                        a = obj[2].split(':')
+                        node.setAttribute(a[0], a[1])
+                    envelope.appendChild(node)
+            else:
+                envelope.appendChild(doc.createTextNode(str(child)))
+        if attribute:
+            for a in attribute.split('|'):
+                a = a.split(':')
+                envelope.setAttribute(a[0], a[1])
+    return doc.toxml('utf-8')
+
+
+def test_same_bytes_as_minidom():
+    """testing the builder serializes requests exactly like minidom did"""
+    builder = XMLBuilder()
+    for path, child, attribute in CALLS:
+        builder.add(path, child, attribute)
+
+    assert_equals(builder.toxml('utf-8'), minidom_xml(CALLS))
+
+
+def test_utf8_text():
+    """testing unicode & utf-8 encoded text end up utf-8 encoded"""
+    builder = XMLBuilder()
+    builder.add('order/billing/name', u'Jos\xe9')
+    builder.add('order/billing/city', u'M\xe9rida'.encode('utf-8'))
+
+    body = builder.toxml('utf-8')
+    assert_true(isinstance(body, bytes))
+    assert_true('<name>Jos\xc3\xa9</name><city>M\xc3\xa9rida</city>' in body)
+
+
+def test_firstdata_request():
+    """testing a full FirstDataLegacy auth request body"""
+    api = FirstDataLegacy(username='1329411', test=True)
+    api.transport = LoopbackTransport('<r_approved>APPROVED</r_approved><r_ordernum>1</r_ordernum>')
+    card = CreditCard(number='4111111111111111', exp_mo='02', exp_yr='2012', first_name='John', last_name='Doe', cvv='911')
+
+    api.auth('1.22', card, {'address': '1 Main St', 'zipcode': '33432'})
+    body = api.transport.last_request[2]
+
+    assert_true(body.startswith('<?xml version="1.0" encoding="utf-8"?><order><merchantinfo><configfile>1329411</configfile></merchantinfo>'))
+    assert_equals(body.count('<order>'), 1)
+    assert_equals(body.count('<billing>'), 1)
+    assert_true('<creditcard><cvmindicator>provided</cvmindicator>' in body)
+    assert_true('<addrnum>1</addrnum>' in body)